@@ -32,6 +32,14 @@ class handler(BaseHTTPRequestHandler):
                 'message': 'Server is running. Use /mcp endpoint for MCP protocol.'
             }
             self.wfile.write(json.dumps(response).encode())
+        elif parsed_path.path == '/metrics':
+            # Prometheus scrape endpoint; the metrics module has no heavy imports
+            from metrics import registry
+
+            self.send_response(200)
+            self.send_header('Content-type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.end_headers()
+            self.wfile.write(registry.render().encode('utf-8'))
         else:
             # 404 for other paths
             self.send_response(404)
@@ -43,20 +51,26 @@ class handler(BaseHTTPRequestHandler):
         """Handle POST requests."""
         parsed_path = urlparse(self.path)
         
-        if parsed_path.path == '/mcp':
-            # MCP endpoint placeholder
+        if parsed_path.path in ('/mcp', '/api/mcp'):
+            # Imported on first use; the module and its caches stay loaded while warm
+            from mcp_jsonrpc import handle_request
+
+            length = int(self.headers.get('Content-Length') or 0)
+            response = handle_request(self.rfile.read(length))
+            if response is None:
+                # Only notifications: nothing to answer
+                self.send_response(202)
+                self.send_header('Access-Control-Allow-Origin', '*')
+                self.end_headers()
+                return
             self.send_response(200)
             self.send_header('Content-type', 'application/json')
+            self.send_header('Content-Length', str(len(response)))
             self.send_header('Access-Control-Allow-Origin', '*')
             self.send_header('Access-Control-Allow-Methods', 'POST, OPTIONS')
             self.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization')
             self.end_headers()
-            
-            response = {
-                'message': 'MCP endpoint ready',
-                'note': 'Full MCP protocol implementation coming soon'
-            }
-            self.wfile.write(json.dumps(response).encode())
+            self.wfile.write(response)
         else:
             # 404 for other paths
             self.send_response(404)
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark OAuth token validation.
+
+Issues --tokens tokens into a SQLite token store, then times
+SimpleOAuthProvider.verify_token, which FastMCP calls for every authenticated
+request, for valid tokens going straight to SQLite (no cache), valid tokens on
+a warm cache, and unknown tokens with negative caching, and prints
+microseconds per validation.
+
+Usage: python benchmarks/bench_auth.py [--tokens 10000] [--lookups 100000]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from oauth_provider import SimpleOAuthProvider
+from token_store import SQLiteTokenBackend, TokenCache, TokenInfo
+
+async def validate(provider, tokens, lookups):
+    """Return seconds per verify_token call over `lookups` random picks."""
+    rng = random.Random(7)
+    picks = [rng.choice(tokens) for _ in range(lookups)]
+    started = time.perf_counter()
+    for token in picks:
+        await provider.verify_token(token)
+    return (time.perf_counter() - started) / lookups
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tokens", type=int, default=10_000)
+    parser.add_argument("--lookups", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        backend = SQLiteTokenBackend(os.path.join(directory, "oauth.db"))
+        expires_at = int(time.time()) + 3600
+        tokens = [f"token-{i:08d}" for i in range(args.tokens)]
+        for token in tokens:
+            backend.save_token(token, TokenInfo("client", ["transcript:read"], expires_at))
+        unknown = [f"bogus-{i:08d}" for i in range(1000)]
+
+        def provider(tokens):
+            return SimpleOAuthProvider(
+                "http://localhost:8000", "client", "secret",
+                ["http://localhost:9000/callback"], tokens,
+            )
+
+        # max_entries=0 keeps nothing in memory: every call queries SQLite
+        uncached = provider(TokenCache(backend, max_entries=0, negative_ttl=0))
+        cached = provider(TokenCache(backend, max_entries=args.tokens))
+
+        async def run():
+            await validate(cached, tokens, args.tokens * 2)  # warm the cache
+            await validate(cached, unknown, len(unknown) * 2)
+            return (
+                await validate(uncached, tokens, args.lookups),
+                await validate(cached, tokens, args.lookups),
+                await validate(cached, unknown, args.lookups),
+            )
+
+        store_s, warm_s, negative_s = asyncio.run(run())
+        backend.close()
+
+    print(f"{args.tokens} issued tokens, {args.lookups} validations each")
+    print(f"{'path':<28} {'us/validation':>14}")
+    print("-" * 43)
+    print(f"{'SQLite on every call':<28} {store_s * 1e6:>14.2f}")
+    print(f"{'warm cache':<28} {warm_s * 1e6:>14.2f}")
+    print(f"{'unknown token (negative)':<28} {negative_s * 1e6:>14.2f}")
+    print(f"speedup: {store_s / warm_s:.0f}x")
+
+if __name__ == "__main__":
+    main()
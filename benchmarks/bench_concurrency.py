@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark tool-call throughput under N concurrent clients.
+
+Drives get_youtube_transcript against a local stub upstream with a fixed
+round-trip latency, once with the tool's upstream work offloaded (the current
+async path) and once run inline on the event loop (how a plain `def` tool
+behaves), and prints requests/second for each.
+
+Usage: python benchmarks/bench_concurrency.py [--clients 32] [--requests 256] [--latency 0.05]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault("TRANSCRIPT_CACHE_PATH", "")
+os.environ.setdefault("TRANSCRIPT_INDEX_PATH", "")
+# Measure the server, not the upstream rate limit
+os.environ.setdefault("UPSTREAM_RATE", "0")
+
+import server
+import transcript_service
+from transcript_cache import TranscriptCache, TranscriptMetadataCache
+from upstream_stub import StubApi, StubTranscript, make_segments
+
+def reset_upstream(latency: float) -> None:
+    """Point the service at a fresh stub and empty caches so every call misses."""
+    track = StubTranscript(segments=make_segments(500), latency=latency)
+    transcript_service._api = StubApi([track], latency=latency)
+    transcript_service.transcript_cache = TranscriptCache(max_entries=100000)
+    transcript_service.metadata_cache = TranscriptMetadataCache(max_entries=100000)
+
+async def inline_tool(video_id: str) -> str:
+    """The pre-async behaviour: blocking upstream I/O on the event loop."""
+    return server.transcript_response(video_id)
+
+async def drive(tool, clients: int, requests: int) -> float:
+    """Run `requests` calls spread over `clients` concurrent workers; return req/s."""
+    queue = [f"{i:011d}" for i in range(requests)]
+
+    async def client():
+        while queue:
+            await tool(queue.pop())
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    return requests / (time.perf_counter() - started)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=256)
+    parser.add_argument("--latency", type=float, default=0.05,
+                        help="stub upstream latency per round trip, in seconds")
+    args = parser.parse_args()
+
+    print(f"{args.requests} requests, {args.clients} clients, "
+          f"{args.latency * 1000:.0f} ms per upstream round trip")
+    print("-" * 50)
+    for name, tool in (("inline (blocking)", inline_tool),
+                       ("offloaded (async)", server.get_youtube_transcript)):
+        reset_upstream(args.latency)
+        rate = asyncio.run(drive(tool, args.clients, args.requests))
+        print(f"{name:<20} {rate:8.1f} req/s")
+
+if __name__ == "__main__":
+    main()
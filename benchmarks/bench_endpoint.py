@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark cold-start and warm latency of the serverless MCP endpoint.
+
+Cold start: fresh interpreters time importing api/mcp.py, the first
+initialize and the first tools/call (which loads tools.py and the YouTube
+client), next to importing the FastMCP server.py for comparison.
+Warm: api/mcp.py is served over local HTTP and timed on repeated tools/call
+requests for a cached video against the offline stub upstream.
+
+Usage: python benchmarks/bench_endpoint.py [--cold-runs 5] [--requests 500]
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from http.server import HTTPServer
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+os.environ.setdefault("TRANSCRIPT_CACHE_PATH", "")
+os.environ.setdefault("TRANSCRIPT_INDEX_PATH", "")
+os.environ.setdefault("UPSTREAM_RATE", "0")
+
+CALL = {'jsonrpc': '2.0', 'id': 1, 'method': 'tools/call', 'params': {
+    'name': 'get_youtube_transcript', 'arguments': {'video_url': 'dQw4w9WgXcQ'}}}
+
+# Run in a fresh interpreter; prints seconds for each step as JSON
+COLD_SCRIPT = """
+import importlib.util, json, sys, time
+sys.path.insert(0, {root!r})
+started = time.perf_counter()
+spec = importlib.util.spec_from_file_location('vercel_mcp', {root!r} + '/api/mcp.py')
+spec.loader.exec_module(importlib.util.module_from_spec(spec))
+from mcp_jsonrpc import handle_request
+imported = time.perf_counter()
+handle_request(json.dumps({{'jsonrpc': '2.0', 'id': 0, 'method': 'initialize', 'params': {{}}}}).encode())
+initialized = time.perf_counter()
+import transcript_service
+from upstream_stub import StubApi
+transcript_service._api = StubApi()
+handle_request({call!r}.encode())
+called = time.perf_counter()
+print(json.dumps([imported - started, initialized - imported, called - initialized]))
+"""
+
+def cold_start(runs):
+    script = COLD_SCRIPT.format(root=ROOT, call=json.dumps(CALL))
+    samples = [
+        json.loads(subprocess.run(
+            [sys.executable, '-c', script], capture_output=True, text=True, check=True
+        ).stdout)
+        for _ in range(runs)
+    ]
+    server_import = [
+        float(subprocess.run(
+            [sys.executable, '-c',
+             f"import sys, time; sys.path.insert(0, {ROOT!r}); t = time.perf_counter(); "
+             f"import server; print(time.perf_counter() - t)"],
+            capture_output=True, text=True, check=True,
+        ).stdout)
+        for _ in range(runs)
+    ]
+    return [statistics.median(column) for column in zip(*samples)], statistics.median(server_import)
+
+def warm_latency(requests):
+    import transcript_service
+    from upstream_stub import StubApi, StubTranscript, make_segments
+
+    transcript_service._api = StubApi([StubTranscript(segments=make_segments(500))])
+    spec = importlib.util.spec_from_file_location('vercel_mcp', os.path.join(ROOT, 'api', 'mcp.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    class QuietHandler(module.handler):
+        def log_message(self, *args):
+            pass
+
+    httpd = HTTPServer(('127.0.0.1', 0), QuietHandler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    url = f'http://127.0.0.1:{httpd.server_port}/mcp'
+
+    def post(payload):
+        request = urllib.request.Request(url, json.dumps(payload).encode(),
+                                         {'Content-Type': 'application/json'})
+        started = time.perf_counter()
+        with urllib.request.urlopen(request) as response:
+            response.read()
+        return time.perf_counter() - started
+
+    post(CALL)  # fill the caches
+    single = sorted(post(CALL) for _ in range(requests))
+    batch = sorted(post([dict(CALL, id=i) for i in range(10)]) for _ in range(max(1, requests // 10)))
+    httpd.shutdown()
+    return single, batch
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cold-runs", type=int, default=5)
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    (imported, initialized, called), server_import = cold_start(args.cold_runs)
+    print(f"Cold start (median of {args.cold_runs} fresh interpreters):")
+    print(f"  import api/mcp.py          {imported * 1000:8.1f} ms")
+    print(f"  first initialize           {initialized * 1000:8.1f} ms")
+    print(f"  first tools/call           {called * 1000:8.1f} ms")
+    print(f"  (import server.py/fastmcp  {server_import * 1000:8.1f} ms)")
+
+    single, batch = warm_latency(args.requests)
+    print(f"Warm tools/call over HTTP ({args.requests} requests, cached video):")
+    for name, samples in (("single", single), ("batch of 10", batch)):
+        print(f"  {name:<12} p50 {samples[len(samples) // 2] * 1000:7.2f} ms"
+              f"   p95 {samples[int(len(samples) * 0.95)] * 1000:7.2f} ms")
+
+if __name__ == "__main__":
+    main()
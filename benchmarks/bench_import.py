@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark import time of the server entry points against a budget.
+
+Each target is imported in fresh interpreters under `python -X importtime`;
+the median cumulative time of its top-level import is compared with
+IMPORT_BUDGET_MS and the heaviest modules it pulled in are listed. Exits
+non-zero when a target is over budget, so it can run in CI.
+
+Usage: python benchmarks/bench_import.py [--runs 5] [--top 5]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Budgets for a cold import, in milliseconds; raise one only with a reason
+IMPORT_BUDGET_MS = {
+    # dotenv and video_ids only; fastmcp and the transcript client load on first use
+    'server_with_auth': 40,
+    # What api/mcp.py imports before the first tools/call (mostly asyncio)
+    'mcp_jsonrpc': 75,
+}
+# Measured for comparison, without a budget
+REFERENCE = ('tools', 'server')
+
+def import_times(module):
+    """Return (cumulative_us, {direct import: cumulative_us}) from one fresh interpreter."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+        env=dict(os.environ, OAUTH_CLIENT_ID=''),
+    )
+    # Modules are printed after their own imports, indented one level per depth,
+    # so the target's direct imports are the depth-1 lines just before it
+    children = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        name = name.strip()
+        if depth == 0 and name == module:
+            return int(cumulative_us), children
+        if depth == 0:
+            children = {}
+        elif depth == 1:
+            children[name] = int(cumulative_us)
+    raise RuntimeError(f"{module} not found in -X importtime output")
+
+def measure(module, runs):
+    samples = [import_times(module) for _ in range(runs)]
+    total_ms = statistics.median(total for total, _ in samples) / 1000
+    # Heaviest direct imports, from the last run
+    children = samples[-1][1]
+    heaviest = sorted(children, key=children.get, reverse=True)
+    return total_ms, [(name, children[name] / 1000) for name in heaviest]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=5)
+    args = parser.parse_args()
+
+    over = []
+    print(f"{'module':<18} {'median ms':>10} {'budget ms':>10}  heaviest imports")
+    print("-" * 78)
+    for module in list(IMPORT_BUDGET_MS) + list(REFERENCE):
+        total_ms, heaviest = measure(module, args.runs)
+        budget = IMPORT_BUDGET_MS.get(module)
+        if budget is not None and total_ms > budget:
+            over.append(module)
+        top = ", ".join(f"{name} {ms:.0f}" for name, ms in heaviest[:args.top])
+        print(f"{module:<18} {total_ms:>10.1f} {budget if budget is not None else '-':>10}  {top}")
+
+    if over:
+        print(f"\nOver budget: {', '.join(over)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
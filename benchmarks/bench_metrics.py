@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark the cost of request instrumentation.
+
+Times the individual metric operations (a histogram observation, a timed block,
+a counter increment), then a warm-cache transcript_response with the metrics
+live and with them replaced by no-ops, and reports the per-request overhead.
+
+Usage: python benchmarks/bench_metrics.py [--iterations 200000] [--requests 20000]
+"""
+
+import argparse
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault("TRANSCRIPT_CACHE_PATH", "")
+os.environ.setdefault("TRANSCRIPT_INDEX_PATH", "")
+os.environ.setdefault("UPSTREAM_RATE", "0")
+
+import metrics
+import tools
+import transcript_service
+from upstream_stub import StubApi, StubTranscript, make_segments
+
+class NullMetric:
+    """Stands in for a Counter or Histogram when measuring the baseline."""
+
+    def inc(self, *labels, amount=1):
+        pass
+
+    def observe(self, value, *labels):
+        pass
+
+    @contextmanager
+    def time(self, *labels):
+        yield
+
+def per_call(func, iterations):
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - started) / iterations
+
+def timed_block():
+    with metrics.stage_seconds.time('bench'):
+        pass
+
+def request_cost(requests):
+    return per_call(lambda: tools.transcript_response('dQw4w9WgXcQ'), requests)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200_000)
+    parser.add_argument("--requests", type=int, default=20_000)
+    args = parser.parse_args()
+
+    print(f"{'operation':<28} {'ns/op':>9}")
+    print("-" * 38)
+    for name, func in (
+        ("histogram observe", lambda: metrics.stage_seconds.observe(0.001, 'bench')),
+        ("timed block", timed_block),
+        ("counter inc", lambda: metrics.outcomes.inc('bench')),
+    ):
+        print(f"{name:<28} {per_call(func, args.iterations) * 1e9:>9.0f}")
+
+    transcript_service._api = StubApi([StubTranscript(segments=make_segments(50))])
+    tools.transcript_response('dQw4w9WgXcQ')  # warm the caches
+    instrumented = request_cost(args.requests)
+
+    live = (metrics.stage_seconds, metrics.outcomes)
+    for module in (tools, transcript_service):
+        module.stage_seconds = NullMetric()
+    tools.outcomes = NullMetric()
+    baseline = request_cost(args.requests)
+    for module in (tools, transcript_service):
+        module.stage_seconds = live[0]
+    tools.outcomes = live[1]
+
+    print()
+    print(f"warm transcript_response: {baseline * 1e6:.1f} us without metrics, "
+          f"{instrumented * 1e6:.1f} us with ({(instrumented - baseline) * 1e6:+.1f} us, "
+          f"{(instrumented / baseline - 1) * 100:+.1f}%)")
+
+if __name__ == "__main__":
+    main()
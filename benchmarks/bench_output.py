@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmark the transcript output formats.
+
+For 1k-, 10k- and 100k-segment transcripts, compares producing and consuming
+each format: the text response parsed back into segments with a regex (what
+clients had to do), the json response with one object per segment, and the
+compact segments response with [start, duration, text] rows. Prints response
+size and milliseconds to encode and to decode.
+
+Usage: python benchmarks/bench_output.py [--repeat 5]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import tools
+import transcript_json
+from transcript_cache import CachedTranscript
+from upstream_stub import make_segments
+
+LINE = re.compile(r'^\[(?:(\d+):)?(\d+):(\d+)\] (.*)$', re.MULTILINE)
+
+def parse_text(response):
+    """Recover (seconds, text) pairs from a text response, as a client would."""
+    body = response.split('=' * 50 + '\n\n', 1)[1]
+    return [
+        (int(h or 0) * 3600 + int(m) * 60 + int(s), text)
+        for h, m, s, text in LINE.findall(body)
+    ]
+
+def best_of(repeat, func):
+    """Fastest of `repeat` calls, in milliseconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"encoder: {transcript_json.JSON_ENCODER}")
+    print(f"{'segments':>9} {'format':>9} {'KiB':>9} {'encode':>9} {'decode':>9}   (ms per call)")
+    print("-" * 52)
+    for count in (1000, 10000, 100000):
+        entry = CachedTranscript('dQw4w9WgXcQ', 'English', 'en', False, make_segments(count))
+        tools.fetch_transcript = lambda video_id, language=None, window=None: entry
+        for output_format, decode in (
+            ('text', parse_text), ('json', json.loads), ('segments', json.loads)
+        ):
+            def encode():
+                # Clear rendered text so every text call formats from scratch
+                tools.render_cache.clear()
+                return tools.transcript_response('dQw4w9WgXcQ', output_format=output_format)
+            response = encode()
+            print(
+                f"{count:>9} {output_format:>9} {len(response.encode()) / 1024:>9.0f} "
+                f"{best_of(args.repeat, encode):>9.2f} "
+                f"{best_of(args.repeat, lambda: decode(response)):>9.2f}"
+            )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark playlist expansion feeding the batch transcript fetch.
+
+Against a stub 5,000-video channel with a fixed latency per Data API page and
+per transcript round trip, compares expanding the whole channel before fetching
+(what a caller enumerating videos up front would do) with get_playlist_transcripts,
+which requests pages lazily and fetches each page's videos while the next page
+is requested. Prints wall time and pages requested for several max_videos.
+
+Usage: python benchmarks/bench_playlist.py [--videos 5000] [--page-latency 0.05] [--latency 0.02]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault("TRANSCRIPT_CACHE_PATH", "")
+os.environ.setdefault("TRANSCRIPT_INDEX_PATH", "")
+# Measure the server, not the upstream rate limit
+os.environ.setdefault("UPSTREAM_RATE", "0")
+
+import server
+import transcript_service
+from playlists import PlaylistExpander
+from transcript_cache import TranscriptCache, TranscriptMetadataCache
+from upstream_stub import StubApi, StubDataApi, StubTranscript
+
+PLAYLIST = 'UU' + 'x' * 22
+
+def reset(videos: int, page_latency: float, latency: float) -> StubDataApi:
+    """Fresh stubs and empty caches so every page and transcript misses."""
+    track = StubTranscript(latency=latency)
+    transcript_service._api = StubApi([track], latency=latency)
+    transcript_service.transcript_cache = TranscriptCache(max_entries=100000)
+    transcript_service.metadata_cache = TranscriptMetadataCache(max_entries=100000)
+    data_api = StubDataApi.generated(PLAYLIST, videos, latency=page_latency)
+    transcript_service.playlist_expander = PlaylistExpander(data_api)
+    return data_api
+
+async def eager(max_videos: int) -> str:
+    """Expand every page, then fetch the first max_videos videos."""
+    pages = transcript_service.playlist_pages(PLAYLIST)
+    video_ids = []
+    for page in pages:
+        video_ids.extend(page.video_ids)
+    return await server.get_youtube_transcripts(video_ids[:max_videos])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--videos", type=int, default=5000)
+    parser.add_argument("--page-latency", type=float, default=0.05,
+                        help="stub Data API latency per page, in seconds")
+    parser.add_argument("--latency", type=float, default=0.02,
+                        help="stub transcript latency per round trip, in seconds")
+    args = parser.parse_args()
+
+    print(f"{args.videos}-video channel, {args.page_latency * 1000:.0f} ms per page, "
+          f"{args.latency * 1000:.0f} ms per transcript round trip")
+    print(f"{'max_videos':>10} {'mode':>6} {'seconds':>9} {'pages':>7}")
+    print("-" * 36)
+    for max_videos in (50, 250, 1000):
+        for mode in ("eager", "lazy"):
+            data_api = reset(args.videos, args.page_latency, args.latency)
+            started = time.perf_counter()
+            if mode == "eager":
+                asyncio.run(eager(max_videos))
+            else:
+                asyncio.run(server.get_playlist_transcripts(PLAYLIST, max_videos=max_videos))
+            elapsed = time.perf_counter() - started
+            print(f"{max_videos:>10} {mode:>6} {elapsed:>9.2f} {data_api.requests:>7}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-call transcript rendering latency.
+
+For 1k-, 10k- and 100k-segment transcripts, times the original per-segment
+format loop over dicts against the rendering engine: a first (cold) render, a
+repeat (cached) render, and a 100-segment page of a cached render.
+
+Usage: python benchmarks/bench_render.py [--repeat 5]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import transcript_render
+from transcript_cache import CachedTranscript
+from transcript_render import RenderCache, render_transcript
+from upstream_stub import make_segments
+
+def legacy_format(transcript, include_timestamps=True):
+    """The format_transcript loop this engine replaced."""
+    formatted_lines = []
+    for entry in transcript:
+        if hasattr(entry, 'start') and hasattr(entry, 'text'):
+            start = entry.start
+            text = entry.text
+        else:
+            start = entry.get('start', 0)
+            text = entry.get('text', '')
+        if include_timestamps:
+            seconds = int(start)
+            minutes = seconds // 60
+            seconds = seconds % 60
+            timestamp = f"[{minutes:02d}:{seconds:02d}]"
+            formatted_lines.append(f"{timestamp} {text}")
+        else:
+            formatted_lines.append(text)
+    return '\n'.join(formatted_lines)
+
+def best_of(repeat, func):
+    """Fastest of `repeat` calls, in milliseconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'segments':>9} {'legacy':>10} {'cold':>10} {'cached':>10} {'page':>10}   (ms per call)")
+    print("-" * 56)
+    for count in (1000, 10000, 100000):
+        segments = make_segments(count)
+        entry = CachedTranscript('aaaaaaaaaaa', 'English', 'en', False, segments)
+
+        def cold():
+            # A fresh cache each time so the full render actually runs
+            transcript_render.render_cache = RenderCache()
+            render_transcript(entry)
+
+        legacy = best_of(args.repeat, lambda: legacy_format(segments))
+        cold_ms = best_of(args.repeat, cold)
+        transcript_render.render_cache = RenderCache()
+        render_transcript(entry)
+        cached = best_of(args.repeat, lambda: render_transcript(entry))
+        page = best_of(args.repeat, lambda: render_transcript(entry, True, count // 2, count // 2 + 100))
+        print(f"{count:>9} {legacy:>10.3f} {cold_ms:>10.3f} {cached:>10.3f} {page:>10.3f}")
+
+if __name__ == "__main__":
+    main()
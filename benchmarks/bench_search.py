@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmark search_transcripts query latency on a large index.
+
+Indexes synthetic transcripts for --videos videos into a temporary FTS5 index,
+then times queries for rare, medium and common words and a two-word query,
+reporting median and 95th percentile latency.
+
+Usage: python benchmarks/bench_search.py [--videos 100000] [--segments 60]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from transcript_cache import CachedTranscript
+from transcript_search import TranscriptIndex
+from transcript_segments import SegmentTable
+
+# Zipf-like vocabulary: early words are common, later ones rare
+VOCABULARY = [f"w{rank}" for rank in range(20000)]
+WEIGHTS = [1.0 / (rank + 1) for rank in range(len(VOCABULARY))]
+
+def make_transcript(rng, video_number, segments):
+    words = rng.choices(VOCABULARY, WEIGHTS, k=segments * 8)
+    texts = [" ".join(words[i * 8:(i + 1) * 8]) for i in range(segments)]
+    table = SegmentTable.from_columns(
+        [i * 5.0 for i in range(segments)], [5.0] * segments, texts
+    )
+    return CachedTranscript(f"{video_number:011d}", 'English', 'en', False, table)
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--videos", type=int, default=100000)
+    parser.add_argument("--segments", type=int, default=60, help="segments per video (5s each)")
+    parser.add_argument("--queries", type=int, default=50, help="timed runs per query")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as directory:
+        index = TranscriptIndex(os.path.join(directory, "search.db"))
+        started = time.perf_counter()
+        for number in range(args.videos):
+            index.add(make_transcript(rng, number, args.segments))
+        build_s = time.perf_counter() - started
+        size_mb = os.path.getsize(index.path) / 1e6
+        print(f"Indexed {args.videos} videos in {build_s:.1f}s "
+              f"({args.videos / build_s:.0f} videos/s, {size_mb:.0f} MB)")
+
+        print(f"{'query':<16} {'hits':>6} {'p50 ms':>9} {'p95 ms':>9}")
+        print("-" * 43)
+        for query in ("w19000", "w2000", "w200", "w20", "w2 w3000"):
+            samples = []
+            for _ in range(args.queries):
+                started = time.perf_counter()
+                hits = index.search(query, 10)
+                samples.append((time.perf_counter() - started) * 1000)
+            print(f"{query:<16} {len(hits):>6} {statistics.median(samples):>9.2f} "
+                  f"{percentile(samples, 0.95):>9.2f}")
+        index.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Compare memory per transcript segment across in-memory representations.
+
+Measures, with tracemalloc, the bytes allocated to hold one transcript as
+a list of dicts, a list of FetchedTranscriptSnippet objects (what
+youtube_transcript_api returns) and a SegmentTable.
+
+Usage: python benchmarks/bench_segments.py [--segments 10000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from transcript_segments import SegmentTable
+
+WORDS = ("the of and to a in that is was he for it with as his on be at by "
+         "transcript video caption lecture minute second example people").split()
+
+def make_columns(count: int):
+    rng = random.Random(42)
+    starts = [i * 2.5 for i in range(count)]
+    durations = [round(rng.uniform(1.0, 4.0), 2) for _ in range(count)]
+    # Build each text from fresh strings so nothing is shared with the source
+    texts = [" ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 10))) for _ in range(count)]
+    return starts, durations, texts
+
+def measure(build) -> int:
+    """Bytes still allocated after build() returns its result."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return after - before
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--segments", type=int, default=10000)
+    args = parser.parse_args()
+    starts, durations, texts = make_columns(args.segments)
+
+    def copied(text):
+        # Fresh copies, as if decoded from an upstream response
+        return (text + ".")[:-1]
+
+    builders = {
+        "list of dicts": lambda: [
+            {'text': copied(t), 'start': float(s), 'duration': float(d)}
+            for s, d, t in zip(starts, durations, texts)
+        ],
+        "SegmentTable": lambda: SegmentTable.from_columns(starts, durations, texts),
+    }
+    try:
+        from youtube_transcript_api._transcripts import FetchedTranscriptSnippet
+        builders["FetchedTranscriptSnippet"] = lambda: [
+            FetchedTranscriptSnippet(text=copied(t), start=float(s), duration=float(d))
+            for s, d, t in zip(starts, durations, texts)
+        ]
+    except ImportError:
+        pass
+
+    print(f"{args.segments} segments, {sum(map(len, texts)) / len(texts):.1f} chars of text on average")
+    print("-" * 50)
+    baseline = None
+    for name, build in builders.items():
+        per_segment = measure(build) / args.segments
+        baseline = baseline or per_segment
+        print(f"{name:<26} {per_segment:8.1f} bytes/segment  ({per_segment / baseline:.2f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark the on-disk transcript encodings.
+
+For 1k-, 10k- and 100k-segment transcripts with varied text and millisecond
+times, compares the formatted text (what storing format_transcript output
+would keep), per-segment JSON objects, the store's previous zlib-compressed
+JSON columns and the block-compressed encoding of transcript_codec. Prints
+size, compression ratio against the JSON objects, time to decode the whole
+transcript and time to read one 60-second window (for the block encoding,
+from bytes and from an mmap'ed file).
+
+Usage: python benchmarks/bench_storage.py [--repeat 5] [--codec zlib|zstd]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import zlib
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from transcript_codec import DEFAULT_CODEC, SegmentReader, decode_segments, encode_segments, open_file
+from transcript_render import render_segments
+from transcript_segments import SegmentTable
+
+WORDS = ("the of and to a in that is was he for it with as his on be at by "
+         "transcript video caption lecture minute second example people "
+         "[Music] so we're going to look at this today really").split()
+
+def make_table(count: int) -> SegmentTable:
+    rng = random.Random(42)
+    starts, durations, texts = [], [], []
+    position = 0.0
+    for _ in range(count):
+        starts.append(round(position, 3))
+        durations.append(round(rng.uniform(1.0, 6.0), 3))
+        texts.append(" ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 12))))
+        position += rng.uniform(1.0, 4.0)
+    return SegmentTable.from_columns(starts, durations, texts)
+
+def best_of(repeat, func):
+    """Fastest of `repeat` calls, in milliseconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--codec", default=DEFAULT_CODEC)
+    args = parser.parse_args()
+
+    print(f"codec: {args.codec}; window: 60 s in the middle of the transcript")
+    print(f"{'segments':>9} {'format':>14} {'KiB':>9} {'ratio':>7} {'decode ms':>10} {'window ms':>10}")
+    print("-" * 64)
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in (1000, 10000, 100000):
+            table = make_table(count)
+            middle = table.starts[count // 2]
+
+            def json_window(data):
+                segments = json.loads(data)
+                return [s for s in segments if middle <= s['start'] < middle + 60]
+
+            def columns_window(data):
+                restored = SegmentTable.from_column_dict(json.loads(zlib.decompress(data)))
+                return restored.window(middle, middle + 60)
+
+            text = render_segments(table).encode('utf-8')
+            objects = json.dumps(table.to_dicts(), ensure_ascii=False).encode('utf-8')
+            columns = zlib.compress(json.dumps(table.to_columns(), separators=(',', ':')).encode('utf-8'))
+            encoded = encode_segments(table, args.codec)
+            path = os.path.join(tmp, f'{count}.seg')
+            with open(path, 'wb') as f:
+                f.write(encoded)
+
+            rows = [
+                ('text', text, None, None),
+                ('json objects', objects, lambda: json.loads(objects), lambda: json_window(objects)),
+                ('zlib columns', columns,
+                 lambda: SegmentTable.from_column_dict(json.loads(zlib.decompress(columns))),
+                 lambda: columns_window(columns)),
+                ('blocks', encoded, lambda: decode_segments(encoded),
+                 lambda: SegmentReader(encoded).window(middle, middle + 60)),
+            ]
+            for name, data, decode, window in rows:
+                decode_ms = f"{best_of(args.repeat, decode):.2f}" if decode else '-'
+                window_ms = f"{best_of(args.repeat, window):.3f}" if window else '-'
+                print(f"{count:>9} {name:>14} {len(data) / 1024:>9.0f} {len(objects) / len(data):>6.1f}x "
+                      f"{decode_ms:>10} {window_ms:>10}")
+
+            def mmap_window():
+                with open_file(path) as reader:
+                    reader.window(middle, middle + 60)
+            print(f"{count:>9} {'blocks (mmap)':>14} {'':>9} {'':>7} {'':>10} "
+                  f"{best_of(args.repeat, mmap_window):>10.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark video ID extraction throughput.
+
+Runs the original urlparse-based extract_video_id and the precompiled
+extractor over the same mix of bare IDs, watch, youtu.be, embed, shorts and
+non-YouTube URLs, and times extract_video_ids on the whole batch.
+
+Usage: python benchmarks/bench_video_ids.py [--urls 1000000]
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+from urllib.parse import urlparse, parse_qs
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from video_ids import extract_video_id, extract_video_ids
+
+ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_-"
+TEMPLATES = (
+    "{id}",
+    "https://www.youtube.com/watch?v={id}",
+    "https://www.youtube.com/watch?v={id}&list=PL0123456789&index=4",
+    "https://youtu.be/{id}",
+    "https://www.youtube.com/embed/{id}",
+    "https://m.youtube.com/watch?v={id}&t=42s",
+    "https://example.com/articles/{id}",
+)
+
+def legacy_extract_video_id(url_or_id):
+    """The extract_video_id server.py shipped before video_ids.py."""
+    if re.match(r'^[a-zA-Z0-9_-]{11}$', url_or_id):
+        return url_or_id
+    try:
+        parsed = urlparse(url_or_id)
+        if parsed.netloc == 'youtu.be':
+            video_id = parsed.path.lstrip('/')
+            if re.match(r'^[a-zA-Z0-9_-]{11}$', video_id):
+                return video_id
+        if parsed.netloc in ['www.youtube.com', 'youtube.com', 'm.youtube.com']:
+            if parsed.path == '/watch':
+                query = parse_qs(parsed.query)
+                video_id = query.get('v', [None])[0]
+                if video_id and re.match(r'^[a-zA-Z0-9_-]{11}$', video_id):
+                    return video_id
+            elif parsed.path.startswith('/embed/'):
+                video_id = parsed.path.split('/')[2]
+                if re.match(r'^[a-zA-Z0-9_-]{11}$', video_id):
+                    return video_id
+            elif parsed.path.startswith('/v/'):
+                video_id = parsed.path.split('/')[2]
+                if re.match(r'^[a-zA-Z0-9_-]{11}$', video_id):
+                    return video_id
+    except:
+        pass
+    return None
+
+def make_urls(count):
+    rng = random.Random(42)
+    # Plenty of repeats, as in request logs
+    ids = ["".join(rng.choice(ALPHABET) for _ in range(11)) for _ in range(max(1, count // 10))]
+    return [rng.choice(TEMPLATES).format(id=rng.choice(ids)) for _ in range(count)]
+
+def timed(func):
+    started = time.perf_counter()
+    result = func()
+    return time.perf_counter() - started, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--urls", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    urls = make_urls(args.urls)
+    legacy_s, legacy = timed(lambda: {i for i in map(legacy_extract_video_id, urls) if i})
+    single_s, single = timed(lambda: {i for i in map(extract_video_id, urls) if i})
+    bulk_s, bulk = timed(lambda: extract_video_ids(urls))
+    assert legacy == single == bulk
+
+    print(f"{args.urls} URLs, {len(bulk)} distinct IDs")
+    print(f"{'extractor':<22} {'total s':>9} {'ns/URL':>9} {'speedup':>8}")
+    print("-" * 51)
+    for name, seconds in (
+        ("legacy (urlparse)", legacy_s),
+        ("extract_video_id", single_s),
+        ("extract_video_ids", bulk_s),
+    ):
+        print(f"{name:<22} {seconds:>9.3f} {seconds / args.urls * 1e9:>9.0f} {legacy_s / seconds:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Benchmark how serve.py throughput scales with worker processes.
+
+Fills a temporary transcript store with large synthetic transcripts, then for
+each worker count starts serve.py on it and drives get_youtube_transcript over
+HTTP from several client processes with keep-alive connections. Every request
+is a cache hit (from the shared store the first time a worker sees a video,
+from its own memory after that), so the run measures the CPU-bound formatting
+and serving the workers split between them. A warm-up pass is not counted.
+
+The clients share the machine with the server, so on N cores expect the curve
+to flatten before N workers.
+
+Usage: python benchmarks/bench_workers.py [--workers 1,2,4] [--requests 600]
+           [--connections 32] [--videos 20] [--segments 5000]
+"""
+
+import argparse
+import http.client
+import json
+import math
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from transcript_cache import CachedTranscript, TranscriptStore
+from upstream_stub import make_segments
+
+def video_ids(count):
+    return [f"{index:011d}" for index in range(count)]
+
+def fill_store(path, videos, segments):
+    """Write one English transcript per video straight into the store."""
+    store = TranscriptStore(path)
+    for video_id in video_ids(videos):
+        store.put(CachedTranscript(video_id, 'English', 'en', False, make_segments(segments)))
+    store.close()
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def call(conn, video_id):
+    """POST one get_youtube_transcript call on a keep-alive connection; return its size."""
+    body = json.dumps({'jsonrpc': '2.0', 'id': 1, 'method': 'tools/call', 'params': {
+        'name': 'get_youtube_transcript', 'arguments': {'video_url': video_id}}})
+    conn.request('POST', '/mcp', body, {
+        'Content-Type': 'application/json', 'Accept': 'application/json, text/event-stream'
+    })
+    response = conn.getresponse()
+    payload = response.read()
+    if response.status != 200 or b'"isError":true' in payload:
+        raise RuntimeError(f"{video_id}: HTTP {response.status} {payload[:200]!r}")
+    return len(payload)
+
+def client_process(port, sequence, connections):
+    """Send sequence over `connections` threads; return each request's latency."""
+    latencies = []
+    lock = threading.Lock()
+    queue = list(reversed(sequence))
+
+    def worker():
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=120)
+        while True:
+            with lock:
+                if not queue:
+                    break
+                video_id = queue.pop()
+            started = time.perf_counter()
+            call(conn, video_id)
+            elapsed = time.perf_counter() - started
+            with lock:
+                latencies.append(elapsed)
+        conn.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(connections)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies
+
+def wait_until_ready(port, process, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("serve.py exited during startup")
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+            call(conn, video_ids(1)[0])
+            conn.close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("serve.py did not start in time")
+
+def run(pool, port, sequence, client_processes, connections):
+    """Split sequence over the client processes; return (elapsed, latencies)."""
+    shares = [sequence[i::client_processes] for i in range(client_processes)]
+    per_process = max(1, connections // client_processes)
+    started = time.perf_counter()
+    futures = [pool.submit(client_process, port, share, per_process) for share in shares]
+    latencies = sorted(latency for future in futures for latency in future.result())
+    return time.perf_counter() - started, latencies
+
+def percentile(samples, pct):
+    return samples[min(len(samples) - 1, max(0, math.ceil(pct / 100 * len(samples)) - 1))]
+
+def main():
+    cores = os.cpu_count() or 1
+    default_workers = sorted({1, *(2 ** i for i in range(1, 8) if 2 ** i <= cores), cores})
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", default=",".join(map(str, default_workers)))
+    parser.add_argument("--requests", type=int, default=600)
+    parser.add_argument("--connections", type=int, default=32,
+                        help="keep-alive connections, split over the client processes")
+    parser.add_argument("--client-processes", type=int, default=max(1, cores // 2))
+    parser.add_argument("--videos", type=int, default=20)
+    parser.add_argument("--segments", type=int, default=5000,
+                        help="segments per transcript")
+    args = parser.parse_args()
+
+    levels = [int(level) for level in args.workers.split(',')]
+    sequence = [video_ids(args.videos)[i % args.videos] for i in range(args.requests)]
+    print(f"{cores} cores, {args.client_processes} client processes, {args.connections} connections, "
+          f"{args.videos} videos of {args.segments} segments")
+    print(f"{'workers':>7} {'req/s':>9} {'speedup':>8} {'p50 ms':>9} {'p99 ms':>9}")
+    print("-" * 46)
+
+    with tempfile.TemporaryDirectory() as tmp, \
+            ProcessPoolExecutor(max_workers=args.client_processes) as pool:
+        store_path = os.path.join(tmp, 'transcripts.db')
+        fill_store(store_path, args.videos, args.segments)
+        env = dict(os.environ, TRANSCRIPT_CACHE_PATH=store_path, TRANSCRIPT_INDEX_PATH='')
+        single = None
+        for workers in levels:
+            port = free_port()
+            process = subprocess.Popen(
+                [sys.executable, os.path.join(ROOT, 'serve.py'), '--workers', str(workers),
+                 '--port', str(port), '--log-level', 'warning'],
+                cwd=ROOT, env=env,
+            )
+            try:
+                wait_until_ready(port, process)
+                # Every worker loads the videos from the store into memory
+                run(pool, port, sequence[:args.videos] * workers * 2, args.client_processes,
+                    args.connections)
+                elapsed, latencies = run(pool, port, sequence, args.client_processes, args.connections)
+            finally:
+                process.terminate()
+                process.wait()
+            throughput = len(latencies) / elapsed
+            single = single or throughput
+            print(f"{workers:>7} {throughput:>9.1f} {throughput / single:>7.2f}x "
+                  f"{percentile(latencies, 50) * 1000:>9.1f} {percentile(latencies, 99) * 1000:>9.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+End-to-end load test against a replayed upstream.
+
+Drives get_youtube_transcript, list_available_transcripts and the HTTP
+endpoint (api/mcp.py served locally, calling get_youtube_transcript) at each
+requested concurrency against upstream_stub.ReplayApi, which replays a
+cassette (recorded with record_upstream.py, or generated) with injected
+latency, errors and throttling. Requests cycle over the cassette's videos in
+a shuffled order, so the first pass misses the caches and later ones hit.
+
+Each scenario and concurrency runs in a fresh interpreter, so caches start
+cold and peak RSS is its own. Prints p50/p95/p99 latency, throughput, error
+responses and peak RSS, saves the run as JSON under --results and compares it
+with the latest run there made with the same workload options (or with
+--baseline, if its workload matches).
+
+Usage: python benchmarks/loadtest.py [--scenarios transcript,listing,http]
+           [--concurrency 1,8,32] [--requests 400] [--videos 100]
+           [--latency 0.05] [--jitter 0.02] [--error-rate 0] [--throttle-rate 0]
+           [--cassette PATH] [--results benchmarks/results] [--baseline PATH]
+"""
+
+import argparse
+import asyncio
+import glob
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+os.environ.setdefault("TRANSCRIPT_CACHE_PATH", "")
+os.environ.setdefault("TRANSCRIPT_INDEX_PATH", "")
+# Measure the server, not the upstream rate limit; throttling comes from --throttle-rate
+os.environ.setdefault("UPSTREAM_RATE", "0")
+
+SCENARIOS = ('transcript', 'listing', 'http')
+# Compared with the baseline; higher is worse for latencies, lower for throughput
+COMPARED = (('p95_ms', 1), ('p99_ms', 1), ('throughput_rps', -1))
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of already sorted samples."""
+    if not samples:
+        return 0.0
+    return samples[min(len(samples) - 1, max(0, math.ceil(pct / 100 * len(samples)) - 1))]
+
+def peak_rss_mb():
+    """This process's peak resident set size in MiB, or None where unavailable."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, KiB elsewhere
+    return peak / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+def _tool_calls(tool, video_ids, concurrency):
+    """Call an async tool once per video ID from `concurrency` clients; return (latencies, errors)."""
+    queue = list(reversed(video_ids))
+    latencies = []
+    errors = 0
+
+    async def client():
+        nonlocal errors
+        while queue:
+            video_id = queue.pop()
+            started = time.perf_counter()
+            result = await tool(video_id)
+            latencies.append(time.perf_counter() - started)
+            errors += result.startswith("Error:")
+
+    async def run():
+        await asyncio.gather(*(client() for _ in range(concurrency)))
+
+    asyncio.run(run())
+    return latencies, errors
+
+def _http_calls(video_ids, concurrency):
+    """POST one tools/call per video ID to a local api/mcp.py server."""
+    import importlib.util
+    from http.server import ThreadingHTTPServer
+
+    spec = importlib.util.spec_from_file_location('vercel_mcp', os.path.join(ROOT, 'api', 'mcp.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    class QuietHandler(module.handler):
+        def log_message(self, *args):
+            pass
+
+    class Server(ThreadingHTTPServer):
+        # The default backlog of 5 makes bursts of connections wait on SYN retries
+        request_queue_size = 256
+        daemon_threads = True
+
+    httpd = Server(('127.0.0.1', 0), QuietHandler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    url = f'http://127.0.0.1:{httpd.server_port}/mcp'
+
+    def post(video_id):
+        payload = {'jsonrpc': '2.0', 'id': 1, 'method': 'tools/call', 'params': {
+            'name': 'get_youtube_transcript', 'arguments': {'video_url': video_id}}}
+        request = urllib.request.Request(url, json.dumps(payload).encode(),
+                                         {'Content-Type': 'application/json'})
+        started = time.perf_counter()
+        with urllib.request.urlopen(request) as response:
+            body = json.loads(response.read())
+        return time.perf_counter() - started, 'error' in body or body['result']['isError']
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        outcomes = list(pool.map(post, video_ids))
+    httpd.shutdown()
+    return [latency for latency, _ in outcomes], sum(failed for _, failed in outcomes)
+
+def run_one(args, scenario, concurrency):
+    """Run one scenario in this process and return its measurements."""
+    import tools
+    import transcript_service
+    from upstream_stub import Cassette, ReplayApi
+
+    if args.cassette:
+        cassette = Cassette.load(args.cassette)
+    else:
+        cassette = Cassette.synthetic(args.videos, args.segments, disabled_every=args.disabled_every)
+    replay = ReplayApi(
+        cassette, args.latency, args.jitter, args.error_rate, args.throttle_rate, seed=1
+    )
+    transcript_service._api = replay
+
+    video_ids = list(cassette.videos)
+    random.Random(0).shuffle(video_ids)
+    sequence = [video_ids[i % len(video_ids)] for i in range(args.requests)]
+
+    started = time.perf_counter()
+    if scenario == 'transcript':
+        latencies, errors = _tool_calls(tools.get_youtube_transcript, sequence, concurrency)
+    elif scenario == 'listing':
+        latencies, errors = _tool_calls(tools.list_available_transcripts, sequence, concurrency)
+    else:
+        latencies, errors = _http_calls(sequence, concurrency)
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'scenario': scenario,
+        'concurrency': concurrency,
+        'requests': len(latencies),
+        'errors': errors,
+        'throughput_rps': round(len(latencies) / elapsed, 2),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 3),
+        'peak_rss_mb': peak_rss_mb(),
+        'upstream': replay.stats(),
+    }
+
+def workload(config):
+    """The options that change what a run measures; runs are only compared when these match."""
+    return {name: value for name, value in config.items()
+            if name not in ('scenarios', 'concurrency', 'tolerance')}
+
+def find_baseline(results_dir, config):
+    """Return (path, run) of the latest saved run with the same workload, or (None, None)."""
+    for path in sorted(glob.glob(os.path.join(results_dir, 'loadtest-*.json')), reverse=True):
+        with open(path) as f:
+            run = json.load(f)
+        if workload(run.get('config', {})) == workload(config):
+            return path, run
+    return None, None
+
+def compare(results, baseline, tolerance):
+    """Print changes against a previous run; return how many got worse than tolerance."""
+    previous = {(r['scenario'], r['concurrency']): r for r in baseline['results']}
+    regressions = 0
+    print(f"\nCompared with {baseline['started_at']} (tolerance {tolerance:.0%}):")
+    for result in results:
+        before = previous.get((result['scenario'], result['concurrency']))
+        if before is None:
+            continue
+        changes = []
+        for name, direction in COMPARED:
+            if not before[name]:
+                continue
+            change = (result[name] - before[name]) / before[name]
+            worse = change * direction > tolerance
+            regressions += worse
+            changes.append(f"{name} {change:+.0%}{' REGRESSION' if worse else ''}")
+        print(f"  {result['scenario']:<10} x{result['concurrency']:<4} " + ", ".join(changes))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--concurrency", default="1,8,32")
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--videos", type=int, default=100,
+                        help="videos in the generated cassette")
+    parser.add_argument("--segments", type=int, default=500,
+                        help="average segments per generated transcript")
+    parser.add_argument("--disabled-every", type=int, default=20,
+                        help="every Nth generated video has transcripts disabled (0: none)")
+    parser.add_argument("--cassette", help="replay this recorded cassette instead")
+    parser.add_argument("--latency", type=float, default=0.05,
+                        help="upstream latency per round trip, in seconds")
+    parser.add_argument("--jitter", type=float, default=0.02,
+                        help="extra random latency per round trip, up to this many seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="fraction of round trips failing with a transient error")
+    parser.add_argument("--throttle-rate", type=float, default=0.0,
+                        help="round trips per second above which upstream answers 429")
+    parser.add_argument("--results", default=os.path.join(ROOT, 'benchmarks', 'results'))
+    parser.add_argument("--baseline", help="run to compare with (default: latest in --results)")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument("--fail-on-regression", action="store_true")
+    parser.add_argument("--run-one", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_one:
+        scenario, concurrency = args.run_one.split(':')
+        print(json.dumps(run_one(args, scenario, int(concurrency))))
+        return
+
+    scenarios = [name for name in args.scenarios.split(',') if name]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    levels = [int(level) for level in args.concurrency.split(',')]
+    started_at = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+    print(f"{args.requests} requests per run, {args.latency * 1000:.0f}+{args.jitter * 1000:.0f} ms "
+          f"upstream latency, error rate {args.error_rate:g}, throttle {args.throttle_rate:g}/s")
+    print(f"{'scenario':<10} {'conc':>5} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} "
+          f"{'p99 ms':>9} {'errors':>7} {'RSS MiB':>8}")
+    print("-" * 72)
+    results = []
+    for scenario in scenarios:
+        for concurrency in levels:
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), *sys.argv[1:],
+                 '--run-one', f'{scenario}:{concurrency}'],
+                capture_output=True, text=True, check=True,
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            results.append(result)
+            rss = f"{result['peak_rss_mb']:.0f}" if result['peak_rss_mb'] is not None else '-'
+            print(f"{scenario:<10} {concurrency:>5} {result['throughput_rps']:>9.1f} "
+                  f"{result['p50_ms']:>9.1f} {result['p95_ms']:>9.1f} {result['p99_ms']:>9.1f} "
+                  f"{result['errors']:>7} {rss:>8}")
+
+    config = {name: value for name, value in vars(args).items()
+              if name not in ('run_one', 'results', 'baseline', 'fail_on_regression')}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if workload(baseline.get('config', {})) != workload(config):
+            print(f"\nNot comparing with {args.baseline}: it was run with different options")
+            baseline = None
+    else:
+        # Looked up before this run is saved, so it never compares with itself
+        _, baseline = find_baseline(args.results, config)
+        if baseline is None:
+            print("\nNo earlier run with the same options to compare with")
+
+    os.makedirs(args.results, exist_ok=True)
+    path = os.path.join(args.results, f'loadtest-{started_at}.json')
+    with open(path, 'w') as f:
+        json.dump({'started_at': started_at, 'config': config, 'results': results}, f, indent=2)
+    print(f"\nSaved {path}")
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions and args.fail_on_regression:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Record live YouTube listings and transcripts into a replay cassette.
+
+Lists each video through the real API (over the shared connection pool) and
+fetches every listed track, saving the results as a cassette that
+upstream_stub.ReplayApi and benchmarks/loadtest.py replay without network
+access. Videos with transcripts disabled or unavailable are recorded as such.
+
+Usage: python benchmarks/record_upstream.py cassette.json VIDEO_OR_URL [VIDEO_OR_URL ...]
+       python benchmarks/record_upstream.py cassette.json - < videos.txt
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from youtube_transcript_api import YouTubeTranscriptApi
+from http_pool import get_session
+from upstream_stub import RECORDED_ERRORS, Cassette, RecordingApi
+from video_ids import extract_video_id
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("output", help="cassette file to write (extended if it exists)")
+    parser.add_argument("videos", nargs="+", help="video IDs or URLs, or - to read them from stdin")
+    args = parser.parse_args()
+
+    inputs = sys.stdin.read().split() if args.videos == ['-'] else args.videos
+    cassette = Cassette.load(args.output) if os.path.exists(args.output) else Cassette()
+    api = RecordingApi(YouTubeTranscriptApi(http_client=get_session()), cassette)
+    for value in inputs:
+        video_id = extract_video_id(value)
+        if not video_id:
+            print(f"skipped {value}: not a video URL or ID", file=sys.stderr)
+            continue
+        try:
+            tracks = api.list(video_id)
+            for track in tracks:
+                track.fetch()
+        except tuple(RECORDED_ERRORS.values()) as e:
+            print(f"{video_id}: {type(e).__name__}")
+            continue
+        except Exception as e:
+            # Not recorded, so a later run can try again
+            print(f"{video_id}: failed ({e})", file=sys.stderr)
+            cassette.videos.pop(video_id, None)
+            continue
+        print(f"{video_id}: {len(tracks)} tracks")
+    cassette.save(args.output)
+    print(f"{len(cassette.videos)} videos in {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""
+Shared pytest fixtures.
+"""
+
+import pytest
+
+import transcript_service
+from singleflight import SingleFlight
+from transcript_cache import TranscriptCache, TranscriptMetadataCache
+from transcript_search import TranscriptIndex
+from upstream import UpstreamScheduler
+from upstream_stub import StubApi
+
+@pytest.fixture
+def use_fakes(monkeypatch):
+    """Point transcript_service at a stub upstream and fresh in-memory caches.
+
+    Call it with the stub's tracks (and optionally error, failures, or an
+    UpstreamScheduler); it returns the StubApi so tests can count round trips.
+    """
+    def install(tracks=None, error=None, failures=None, upstream=None):
+        api = StubApi(tracks, error=error, failures=failures)
+        monkeypatch.setattr(transcript_service, '_api', api)
+        monkeypatch.setattr(transcript_service, 'transcript_cache', TranscriptCache())
+        monkeypatch.setattr(transcript_service, 'metadata_cache', TranscriptMetadataCache())
+        monkeypatch.setattr(transcript_service, 'inflight', SingleFlight())
+        monkeypatch.setattr(transcript_service, 'transcript_index', TranscriptIndex(':memory:'))
+        # Unlimited and without backoff sleeps unless a test passes its own
+        monkeypatch.setattr(
+            transcript_service, 'upstream', upstream or UpstreamScheduler(sleep=lambda seconds: None)
+        )
+        return api
+
+    return install
@@ -0,0 +1,139 @@
+"""
+Shared HTTP connection pool for upstream transcript requests.
+One long-lived requests.Session with a bounded keep-alive pool is injected into
+the transcript client, so steady-state requests reuse connections instead of
+paying for TCP and TLS setup every time.
+"""
+
+import os
+import threading
+import time
+from typing import Optional, Dict, Any
+from requests import Session
+from requests.adapters import HTTPAdapter
+
+class PooledAdapter(HTTPAdapter):
+    """HTTPAdapter that expires idle keep-alive connections and counts reuse."""
+
+    def __init__(self, max_connections: int = 32, keepalive_expiry: float = 60.0):
+        self.max_connections = max_connections
+        self.keepalive_expiry = keepalive_expiry
+        self._stats_lock = threading.Lock()
+        self._last_used = time.monotonic()
+        # Counters folded in from pools that have been discarded
+        self._closed_connections = 0
+        self._closed_requests = 0
+        self.expired = 0
+        super().__init__(
+            pool_connections=4,
+            pool_maxsize=max_connections,
+            pool_block=True,
+        )
+
+    def send(self, request, **kwargs):
+        now = time.monotonic()
+        with self._stats_lock:
+            idle_for = now - self._last_used
+            self._last_used = now
+        if self.keepalive_expiry and idle_for > self.keepalive_expiry:
+            # The server has most likely closed these already; drop them rather
+            # than fail the first request on a dead socket
+            self._discard_pools()
+        return super().send(request, **kwargs)
+
+    def _pools(self):
+        return [self.poolmanager.pools[key] for key in self.poolmanager.pools.keys()]
+
+    def _discard_pools(self) -> None:
+        with self._stats_lock:
+            self.expired += 1
+            for pool in self._pools():
+                self._closed_connections += pool.num_connections
+                self._closed_requests += pool.num_requests
+            self.poolmanager.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Return connections opened and reused, and how many are idle right now."""
+        with self._stats_lock:
+            opened = self._closed_connections
+            requests = self._closed_requests
+            idle = 0
+            for pool in self._pools():
+                opened += pool.num_connections
+                requests += pool.num_requests
+                if pool.pool is not None:
+                    idle += sum(1 for conn in list(pool.pool.queue) if conn is not None)
+            return {
+                'requests': requests,
+                'connections_opened': opened,
+                'connections_reused': max(0, requests - opened),
+                'connections_idle': idle,
+                'pools_expired': self.expired,
+            }
+
+def _enable_http2() -> bool:
+    """
+    Switch urllib3 to HTTP/2 when its experimental support and h2 are installed.
+
+    urllib3 can only do this process-wide: it swaps the HTTPS connection class
+    and the ALPN protocols every pool uses, so every other library's sessions
+    in this process speak HTTP/2 too. That's why it is opt-in only.
+    """
+    try:
+        import h2  # noqa: F401
+        import urllib3.http2
+    except ImportError:
+        return False
+    urllib3.http2.inject_into_urllib3()
+    return True
+
+def create_session(
+    max_connections: Optional[int] = None,
+    keepalive_expiry: Optional[float] = None,
+    http2: Optional[bool] = None
+) -> Session:
+    """
+    Build a pooled session, reading unset options from UPSTREAM_* environment variables.
+
+    Args:
+        max_connections: Connections kept per host (UPSTREAM_MAX_CONNECTIONS)
+        keepalive_expiry: Seconds an idle pool is kept alive (UPSTREAM_KEEPALIVE_EXPIRY)
+        http2: Use HTTP/2 where available (UPSTREAM_HTTP2, off by default);
+            this affects every urllib3 connection in the process
+
+    Returns:
+        A requests.Session with the pooled adapter mounted for http and https
+    """
+    if max_connections is None:
+        max_connections = int(os.getenv("UPSTREAM_MAX_CONNECTIONS", "32"))
+    if keepalive_expiry is None:
+        keepalive_expiry = float(os.getenv("UPSTREAM_KEEPALIVE_EXPIRY", "60"))
+    if http2 is None:
+        http2 = os.getenv("UPSTREAM_HTTP2", "").lower() in ("1", "true", "yes")
+
+    session = Session()
+    adapter = PooledAdapter(max_connections, keepalive_expiry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.http2 = http2 and _enable_http2()
+    return session
+
+_session: Optional[Session] = None
+_session_lock = threading.Lock()
+
+def get_session() -> Session:
+    """Return the process-wide pooled session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_session()
+    return _session
+
+def pool_stats(session: Optional[Session] = None) -> Dict[str, Any]:
+    """Return connection statistics for a session built by create_session."""
+    session = session or get_session()
+    adapter = session.get_adapter("https://")
+    stats: Dict[str, Any] = adapter.stats() if isinstance(adapter, PooledAdapter) else {}
+    stats['http2'] = bool(getattr(session, 'http2', False))
+    return stats
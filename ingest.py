@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Bulk transcript ingest for the YouTube Transcript MCP Server.
+Warms the persistent transcript store (and the search index) from a list of
+video IDs or URLs, using the same track selection and caching as
+get_youtube_transcript. Progress is checkpointed so an interrupted run can be
+resumed without refetching.
+
+Usage:
+    python ingest.py videos.txt --workers 8 --rate 5
+    cat videos.txt | python ingest.py - --checkpoint run.checkpoint
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Optional, List, Dict, Iterable, Iterator, Set, TextIO, Tuple
+from dotenv import load_dotenv
+from youtube_transcript_api._errors import (
+    TranscriptsDisabled,
+    NoTranscriptFound,
+    VideoUnavailable
+)
+
+# Load environment variables before the caches read them
+load_dotenv()
+
+import transcript_service
+from rate_limit import TokenBucket
+from video_ids import extract_video_id
+
+# Outcomes that won't change on a retry and are recorded in the checkpoint
+PERMANENT_ERRORS = (TranscriptsDisabled, NoTranscriptFound, VideoUnavailable)
+
+def read_video_ids(lines: Iterable[str], skip: Set[str]) -> Iterator[str]:
+    """Yield each distinct video ID once, in input order, leaving out skip."""
+    seen = set(skip)
+    for line in lines:
+        video_id = extract_video_id(line)
+        if video_id and video_id not in seen:
+            seen.add(video_id)
+            yield video_id
+
+def load_checkpoint(path: Optional[str]) -> Set[str]:
+    """Return the video IDs a previous run already finished."""
+    if not path or not os.path.exists(path):
+        return set()
+    with open(path, encoding='utf-8') as f:
+        return {line.split('\t', 1)[0] for line in f if line.strip()}
+
+class Progress:
+    """Thread-safe ingest counters with periodic throughput reports (silent without out)."""
+
+    def __init__(self, out: Optional[TextIO] = None, interval: float = 5.0):
+        self.out = out
+        self.interval = interval
+        self.started = time.monotonic()
+        self._last_report = self.started
+        self._lock = threading.Lock()
+        self.counts: Dict[str, int] = {'ok': 0, 'missing': 0, 'failed': 0}
+        self.bytes = 0
+
+    def record(self, outcome: str, size: int = 0) -> None:
+        with self._lock:
+            self.counts[outcome] += 1
+            self.bytes += size
+            now = time.monotonic()
+            if now - self._last_report < self.interval:
+                return
+            self._last_report = now
+        self.report()
+
+    def report(self, final: bool = False) -> None:
+        with self._lock:
+            elapsed = max(time.monotonic() - self.started, 1e-9)
+            done = sum(self.counts.values())
+            line = (
+                f"{'Done' if final else 'Progress'}: {done} videos "
+                f"({self.counts['ok']} ok, {self.counts['missing']} without transcript, "
+                f"{self.counts['failed']} failed) in {elapsed:.1f}s - "
+                f"{done / elapsed:.1f} videos/s, {self.bytes / elapsed / 1024:.1f} KiB/s"
+            )
+        self.write(line)
+
+    def write(self, line: str) -> None:
+        if self.out is not None:
+            print(line, file=self.out, flush=True)
+
+def ingest_one(video_id: str, language: Optional[str], bucket: TokenBucket) -> Tuple[str, int, str]:
+    """Fetch one video into the store; return (outcome, text bytes, detail)."""
+    bucket.acquire()
+    try:
+        transcript = transcript_service.fetch_transcript(video_id, language)
+    except PERMANENT_ERRORS as e:
+        return 'missing', 0, type(e).__name__
+    except Exception as e:
+        # Transient (network, rate limiting): left out of the checkpoint for a retry
+        return 'failed', 0, f"{type(e).__name__}: {e}"
+    if transcript is None:
+        return 'missing', 0, 'NoTranscripts'
+    return 'ok', len(transcript.segments.buffer.encode('utf-8')), transcript.language_code
+
+def ingest(
+    video_ids: Iterable[str],
+    workers: int = 8,
+    rate: float = 0.0,
+    language: Optional[str] = None,
+    checkpoint: Optional[TextIO] = None,
+    progress: Optional[Progress] = None
+) -> Dict[str, int]:
+    """
+    Fetch many videos into the transcript store with a bounded worker pool.
+
+    Args:
+        video_ids: Video IDs to fetch, consumed lazily
+        workers: Videos fetched at once
+        rate: Maximum videos started per second (0 for no limit)
+        language: Preferred language code, as for get_youtube_transcript
+        checkpoint: Open file that finished videos are appended to
+        progress: Progress reporter; a quiet one is used when omitted
+
+    Returns:
+        Counts of ok, missing (no transcript) and failed videos
+    """
+    progress = progress or Progress()
+    bucket = TokenBucket(rate)
+    video_ids = iter(video_ids)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ingest") as pool:
+        pending = {}
+        while True:
+            # Keep the pool busy without materializing the whole input
+            for video_id in video_ids:
+                pending[pool.submit(ingest_one, video_id, language, bucket)] = video_id
+                if len(pending) >= workers * 2:
+                    break
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                video_id = pending.pop(future)
+                outcome, size, detail = future.result()
+                if outcome == 'failed':
+                    progress.write(f"{video_id}: {detail}")
+                elif checkpoint is not None:
+                    checkpoint.write(f"{video_id}\t{outcome}\t{detail}\n")
+                    checkpoint.flush()
+                progress.record(outcome, size)
+    return dict(progress.counts)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Pre-load transcripts into the persistent store from a list of video IDs or URLs."
+    )
+    parser.add_argument("input", help="file with one video ID or URL per line, or - for stdin")
+    parser.add_argument("--workers", type=int, default=8, help="videos fetched at once (default: 8)")
+    parser.add_argument("--rate", type=float, default=0.0,
+                        help="maximum videos started per second (default: no limit)")
+    parser.add_argument("--language", help="preferred language code (default: English first)")
+    parser.add_argument("--checkpoint",
+                        help="file recording finished videos (default: INPUT.checkpoint; none for stdin)")
+    parser.add_argument("--progress-interval", type=float, default=5.0,
+                        help="seconds between progress lines (default: 5)")
+    args = parser.parse_args(argv)
+
+    if transcript_service.transcript_cache.store is None:
+        print("Error: the persistent store is disabled; set TRANSCRIPT_CACHE_PATH to a writable file.",
+              file=sys.stderr)
+        return 2
+
+    checkpoint_path = args.checkpoint
+    if checkpoint_path is None and args.input != '-':
+        checkpoint_path = args.input + '.checkpoint'
+    finished = load_checkpoint(checkpoint_path)
+    if finished:
+        print(f"Resuming: skipping {len(finished)} videos from {checkpoint_path}", file=sys.stderr)
+
+    source = sys.stdin if args.input == '-' else open(args.input, encoding='utf-8')
+    checkpoint = open(checkpoint_path, 'a', encoding='utf-8') if checkpoint_path else None
+    progress = Progress(sys.stderr, args.progress_interval)
+    try:
+        counts = ingest(
+            read_video_ids(source, finished),
+            workers=args.workers,
+            rate=args.rate,
+            language=args.language,
+            checkpoint=checkpoint,
+            progress=progress,
+        )
+    except KeyboardInterrupt:
+        print("Interrupted; rerun the same command to resume.", file=sys.stderr)
+        return 130
+    finally:
+        progress.report(final=True)
+        if checkpoint is not None:
+            checkpoint.close()
+        if source is not sys.stdin:
+            source.close()
+    return 1 if counts['failed'] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+"""
+Stateless MCP over JSON-RPC for the serverless endpoint (api/mcp.py).
+Handles initialize, ping, tools/list, tools/call, resources/list and
+resources/read, single or batched, by calling the functions in tools.py.
+tools.py (and with it the YouTube client and caches) is imported on first use
+and then kept for the life of the process, so warm invocations reuse the
+connection pool and caches and an initialize alone stays cheap.
+"""
+
+import asyncio
+import inspect
+import json
+import typing
+from typing import Optional, List, Dict, Any, Union
+
+PROTOCOL_VERSIONS = ('2025-06-18', '2025-03-26', '2024-11-05')
+SERVER_INFO = {'name': 'YouTube Transcript MCP Server', 'version': '1.0.0'}
+
+# JSON-RPC error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+class RpcError(Exception):
+    """An error reported to the client as a JSON-RPC error object."""
+
+    def __init__(self, code: int, message: str):
+        self.code = code
+        self.message = message
+        super().__init__(message)
+
+def _initialize(params: Dict[str, Any]) -> Dict[str, Any]:
+    requested = params.get('protocolVersion')
+    return {
+        'protocolVersion': requested if requested in PROTOCOL_VERSIONS else PROTOCOL_VERSIONS[0],
+        'capabilities': {'tools': {'listChanged': False}, 'resources': {'listChanged': False}},
+        'serverInfo': SERVER_INFO,
+    }
+
+def _list_tools(params: Dict[str, Any]) -> Dict[str, Any]:
+    import tools
+
+    return {'tools': [tools.tool_definition(name) for name in tools.TOOLS]}
+
+# Tool function -> pydantic model of its arguments, built on first call
+_argument_models: Dict[Any, Any] = {}
+
+def _arguments_model(name: str, tool: Any) -> Any:
+    """A model checking arguments against the signature published in tools/list."""
+    model = _argument_models.get(tool)
+    if model is None:
+        from pydantic import ConfigDict, create_model
+
+        hints = typing.get_type_hints(tool)
+        fields = {
+            param.name: (
+                hints.get(param.name, Any),
+                ... if param.default is inspect.Parameter.empty else param.default,
+            )
+            for param in inspect.signature(tool).parameters.values()
+        }
+        model = create_model(f"{name}_arguments", __config__=ConfigDict(extra='forbid'), **fields)
+        _argument_models[tool] = model
+    return model
+
+async def _call_tool(params: Dict[str, Any]) -> Dict[str, Any]:
+    import tools
+
+    name = params.get('name')
+    arguments = params.get('arguments') or {}
+    if name not in tools.TOOLS:
+        raise RpcError(INVALID_PARAMS, f"Unknown tool: {name}")
+    if not isinstance(arguments, dict):
+        raise RpcError(INVALID_PARAMS, "arguments must be an object")
+    tool = tools.TOOLS[name]
+    from pydantic import ValidationError
+
+    # Only arguments that don't match the signature are the caller's fault;
+    # an exception raised inside the tool is an internal error
+    try:
+        validated = _arguments_model(name, tool).model_validate(arguments)
+    except ValidationError as e:
+        problems = "; ".join(
+            f"{'.'.join(map(str, error['loc'])) or 'arguments'}: {error['msg']}"
+            for error in e.errors()
+        )
+        raise RpcError(INVALID_PARAMS, f"Invalid arguments for {name}: {problems}")
+    text = await tool(**{field: getattr(validated, field) for field in validated.model_fields_set})
+    return {
+        'content': [{'type': 'text', 'text': text}],
+        'isError': tools.is_error_response(text),
+    }
+
+def _list_resources(params: Dict[str, Any]) -> Dict[str, Any]:
+    import tools
+
+    return {'resources': [
+        {'uri': uri, 'name': func.__name__, 'description': func.__doc__, 'mimeType': 'text/plain'}
+        for uri, func in tools.RESOURCES.items()
+    ]}
+
+def _read_resource(params: Dict[str, Any]) -> Dict[str, Any]:
+    import tools
+
+    uri = params.get('uri')
+    if uri not in tools.RESOURCES:
+        raise RpcError(INVALID_PARAMS, f"Unknown resource: {uri}")
+    return {'contents': [{'uri': uri, 'mimeType': 'text/plain', 'text': tools.RESOURCES[uri]()}]}
+
+METHODS = {
+    'initialize': _initialize,
+    'ping': lambda params: {},
+    'tools/list': _list_tools,
+    'tools/call': _call_tool,
+    'resources/list': _list_resources,
+    'resources/read': _read_resource,
+}
+
+def _error(request_id: Any, code: int, message: str) -> Dict[str, Any]:
+    return {'jsonrpc': '2.0', 'id': request_id, 'error': {'code': code, 'message': message}}
+
+async def handle_message(message: Any) -> Optional[Dict[str, Any]]:
+    """Answer one JSON-RPC message; notifications (no id) get None."""
+    if not isinstance(message, dict) or message.get('jsonrpc') != '2.0' \
+            or not isinstance(message.get('method'), str):
+        return _error(message.get('id') if isinstance(message, dict) else None,
+                      INVALID_REQUEST, "Invalid request")
+    request_id = message.get('id')
+    is_notification = 'id' not in message
+    method = METHODS.get(message['method'])
+    params = message.get('params') or {}
+    try:
+        if method is None:
+            raise RpcError(METHOD_NOT_FOUND, f"Method not found: {message['method']}")
+        if not isinstance(params, dict):
+            raise RpcError(INVALID_PARAMS, "params must be an object")
+        result = method(params)
+        if asyncio.iscoroutine(result):
+            result = await result
+    except RpcError as e:
+        return None if is_notification else _error(request_id, e.code, e.message)
+    except Exception as e:
+        return None if is_notification else _error(request_id, INTERNAL_ERROR, str(e))
+    if is_notification:
+        return None
+    return {'jsonrpc': '2.0', 'id': request_id, 'result': result}
+
+async def handle_payload(payload: Union[Dict[str, Any], List[Any]]) -> Optional[Any]:
+    """Answer a message or a batch; a batch's calls run concurrently."""
+    if isinstance(payload, list):
+        if not payload:
+            return _error(None, INVALID_REQUEST, "Empty batch")
+        responses = await asyncio.gather(*(handle_message(message) for message in payload))
+        return [response for response in responses if response is not None] or None
+    return await handle_message(payload)
+
+def handle_request(body: bytes) -> Optional[bytes]:
+    """
+    Answer the body of an HTTP POST.
+
+    Returns:
+        The encoded JSON-RPC response, or None when the body held only notifications
+    """
+    try:
+        payload = json.loads(body)
+    except ValueError as e:
+        response = _error(None, PARSE_ERROR, f"Parse error: {e}")
+    else:
+        response = asyncio.run(handle_payload(payload))
+    if response is None:
+        return None
+    return json.dumps(response, ensure_ascii=False).encode('utf-8')
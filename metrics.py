@@ -0,0 +1,195 @@
+"""
+Prometheus-style metrics for the YouTube Transcript MCP Server.
+Counters and fixed-bucket histograms are plain in-process structures behind a
+lock, cheap enough to stay on in production (an observation is a bisect and a
+few additions). render() produces the Prometheus text exposition format.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from typing import List, Dict, Any, Callable, Sequence, Tuple
+
+# Seconds, from cache hits (sub-millisecond) to slow upstream fetches
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+# Characters of tool output, from one-line errors to multi-hour transcripts
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _labels(names: Sequence[str], values: Tuple[str, ...], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Counter:
+    """A monotonically increasing count per label combination."""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        with self._lock:
+            return self._values.get(labels, 0)
+
+    def collect(self) -> List[str]:
+        with self._lock:
+            values = list(self._values.items())
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(values):
+            lines.append(f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}")
+        return lines
+
+class _Timer:
+    """Context manager observing elapsed seconds; cheaper than a generator-based one."""
+
+    __slots__ = ('histogram', 'labels', 'started')
+
+    def __init__(self, histogram: "Histogram", labels: Tuple[str, ...]):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self) -> "_Timer":
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.histogram.observe(time.perf_counter() - self.started, *self.labels)
+
+class Histogram:
+    """Observations counted into fixed upper-bound buckets, per label combination."""
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        buckets: Sequence[float],
+        labelnames: Sequence[str] = ()
+    ):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(buckets)
+        self.labelnames = tuple(labelnames)
+        # labels -> [per-bucket counts (+Inf last), sum, count]
+        self._series: Dict[Tuple[str, ...], List[Any]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, *labels: str) -> int:
+        with self._lock:
+            series = self._series.get(labels)
+            return series[2] if series else 0
+
+    def time(self, *labels: str) -> _Timer:
+        """Observe the wall-clock seconds spent inside the with block."""
+        return _Timer(self, labels)
+
+    def collect(self) -> List[str]:
+        with self._lock:
+            series = [(labels, list(s[0]), s[1], s[2]) for labels, s in self._series.items()]
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, counts, total, count in sorted(series):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = '+Inf' if bound == float('inf') else _number(bound)
+                bucket_labels = _labels(self.labelnames, labels, 'le="' + le + '"')
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {count}")
+        return lines
+
+class Registry:
+    """Metrics plus stats() callbacks, rendered together on each scrape."""
+
+    def __init__(self, prefix: str = "youtube_transcript"):
+        self.prefix = prefix
+        self._metrics: List[Any] = []
+        self._stats: List[Tuple[str, Callable[[], Dict[str, Any]]]] = []
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        metric = Counter(f"{self.prefix}_{name}", help, labelnames)
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        buckets: Sequence[float],
+        labelnames: Sequence[str] = ()
+    ) -> Histogram:
+        metric = Histogram(f"{self.prefix}_{name}", help, buckets, labelnames)
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def register_stats(self, component: str, stats: Callable[[], Dict[str, Any]]) -> None:
+        """Export a component's numeric stats() values, read at scrape time."""
+        with self._lock:
+            self._stats = [(name, fn) for name, fn in self._stats if name != component]
+            self._stats.append((component, stats))
+
+    def render(self) -> str:
+        """Return every metric in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics)
+            stats = list(self._stats)
+        lines: List[str] = []
+        for metric in metrics:
+            lines += metric.collect()
+        for component, fn in stats:
+            for key, value in fn().items():
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                name = f"{self.prefix}_{component}_{key}"
+                lines.append(f"# TYPE {name} untyped")
+                lines.append(f"{name} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+# Shared by every tool call in this process
+registry = Registry()
+
+stage_seconds = registry.histogram(
+    "stage_seconds",
+    "Time spent in each stage of a transcript request.",
+    LATENCY_BUCKETS,
+    ("stage",),
+)
+outcomes = registry.counter(
+    "requests_total",
+    "Transcript requests by outcome.",
+    ("outcome",),
+)
+response_chars = registry.histogram(
+    "response_chars",
+    "Size of tool responses in characters.",
+    SIZE_BUCKETS,
+    ("tool",),
+)
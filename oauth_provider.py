@@ -0,0 +1,194 @@
+"""
+OAuth authorization server for server_with_auth.py.
+Only imported when OAUTH_CLIENT_ID is set, so servers running without
+authentication never load it.
+"""
+
+import os
+import secrets
+import time
+from typing import Optional, List
+from fastmcp.server.auth import AccessToken, OAuthProvider
+from mcp.server.auth.provider import (
+    AuthorizationCode,
+    AuthorizationParams,
+    AuthorizeError,
+    RefreshToken,
+    TokenError,
+    construct_redirect_uri,
+)
+from mcp.server.auth.settings import ClientRegistrationOptions, RevocationOptions
+from mcp.shared.auth import OAuthClientInformationFull, OAuthToken
+from token_store import TokenCache, TokenInfo
+
+SCOPES = ["transcript:read"]
+
+# Where Claude sends the user back after authorizing a connector
+DEFAULT_REDIRECT_URIS = "https://claude.ai/api/mcp/auth_callback"
+
+class SimpleOAuthProvider(OAuthProvider):
+    """
+    Authorization server for a single configured client, with a cached token store.
+
+    Authorization requests from the configured client are approved at once; its
+    secret, a registered redirect URI and PKCE guard the code exchange. Codes
+    are pending authorizations in the token backend and are single-use; access
+    tokens are checked through TokenCache on every authenticated request. No
+    refresh tokens are issued, so a client authorizes again once its access
+    token expires.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        client_id: str,
+        client_secret: Optional[str],
+        redirect_uris: List[str],
+        tokens: Optional[TokenCache] = None,
+        token_lifetime: int = 3600,
+        code_lifetime: int = 300,
+        purge_interval: float = 3600.0
+    ):
+        super().__init__(
+            base_url=base_url,
+            # Clients can't register themselves: every authorization is approved,
+            # so open registration would hand tokens to anyone
+            client_registration_options=ClientRegistrationOptions(
+                enabled=False,
+                valid_scopes=SCOPES,
+                default_scopes=SCOPES,
+            ),
+            revocation_options=RevocationOptions(enabled=True),
+            required_scopes=SCOPES,
+        )
+        self.client = OAuthClientInformationFull(
+            client_id=client_id,
+            client_secret=client_secret or None,
+            redirect_uris=redirect_uris,
+            grant_types=["authorization_code"],
+            token_endpoint_auth_method="client_secret_post" if client_secret else "none",
+            scope=" ".join(SCOPES),
+        )
+        # Checked on every authenticated call; warm lookups never reach the backend
+        self.tokens = tokens or TokenCache.from_env()
+        self.token_lifetime = token_lifetime
+        self.code_lifetime = code_lifetime
+        # Expired tokens and abandoned codes are deleted at most this often
+        self.purge_interval = purge_interval
+        self._next_purge = 0.0
+
+    @classmethod
+    def from_env(cls) -> "SimpleOAuthProvider":
+        """Build a provider from OAUTH_* environment variables.
+
+        OAUTH_REDIRECT_URIS is a comma-separated list of the client's redirect URIs;
+        OAUTH_PURGE_INTERVAL is how often, in seconds, expired records are deleted.
+        """
+        redirect_uris = os.getenv("OAUTH_REDIRECT_URIS", DEFAULT_REDIRECT_URIS)
+        return cls(
+            base_url=os.getenv("OAUTH_ISSUER_URL", "https://your-server-url.vercel.app"),
+            client_id=os.environ["OAUTH_CLIENT_ID"],
+            client_secret=os.getenv("OAUTH_CLIENT_SECRET"),
+            redirect_uris=[uri.strip() for uri in redirect_uris.split(",") if uri.strip()],
+            token_lifetime=int(os.getenv("OAUTH_TOKEN_LIFETIME", "3600")),
+            purge_interval=float(os.getenv("OAUTH_PURGE_INTERVAL", "3600")),
+        )
+
+    def _purge_expired(self) -> None:
+        """Delete expired records from the backend, once per purge_interval."""
+        now = time.time()
+        if now < self._next_purge:
+            return
+        self._next_purge = now + self.purge_interval
+        # Optional for other backends
+        purge = getattr(self.tokens.backend, "purge_expired", None)
+        if purge is not None:
+            purge(now)
+
+    async def get_client(self, client_id: str) -> Optional[OAuthClientInformationFull]:
+        """Return the configured client, or None for any other ID."""
+        return self.client if client_id == self.client.client_id else None
+
+    async def register_client(self, client_info: OAuthClientInformationFull) -> None:
+        raise NotImplementedError("client registration is disabled")
+
+    async def authorize(self, client: OAuthClientInformationFull, params: AuthorizationParams) -> str:
+        """Approve the request and redirect back with a new authorization code."""
+        if client.client_id != self.client.client_id:
+            raise AuthorizeError(error="unauthorized_client", error_description="Unknown client.")
+        scopes = [scope for scope in (params.scopes or SCOPES) if scope in SCOPES]
+        self._purge_expired()
+        code = secrets.token_urlsafe(32)
+        self.tokens.backend.save_authorization(code, {
+            "client_id": client.client_id,
+            "scopes": scopes,
+            "expires_at": time.time() + self.code_lifetime,
+            "code_challenge": params.code_challenge,
+            "redirect_uri": str(params.redirect_uri),
+            "redirect_uri_provided_explicitly": params.redirect_uri_provided_explicitly,
+            "resource": params.resource,
+        })
+        return construct_redirect_uri(str(params.redirect_uri), code=code, state=params.state)
+
+    async def load_authorization_code(
+        self,
+        client: OAuthClientInformationFull,
+        authorization_code: str
+    ) -> Optional[AuthorizationCode]:
+        """Return a pending code issued to this client, or None if unknown or expired."""
+        data = self.tokens.backend.get_authorization(authorization_code)
+        if data is None or data["client_id"] != client.client_id:
+            return None
+        if data["expires_at"] < time.time():
+            self.tokens.backend.delete_authorization(authorization_code)
+            return None
+        return AuthorizationCode(code=authorization_code, **data)
+
+    async def exchange_authorization_code(
+        self,
+        client: OAuthClientInformationFull,
+        authorization_code: AuthorizationCode
+    ) -> OAuthToken:
+        """Consume the code and issue an access token."""
+        # Deleting is the claim, so two racing exchanges can't both succeed
+        if not self.tokens.backend.delete_authorization(authorization_code.code):
+            raise TokenError("invalid_grant", "Authorization code not found or already used.")
+        token = secrets.token_urlsafe(32)
+        self.tokens.save(token, TokenInfo(
+            client.client_id, list(authorization_code.scopes),
+            int(time.time()) + self.token_lifetime,
+        ))
+        return OAuthToken(
+            access_token=token,
+            expires_in=self.token_lifetime,
+            scope=" ".join(authorization_code.scopes),
+        )
+
+    async def load_refresh_token(
+        self,
+        client: OAuthClientInformationFull,
+        refresh_token: str
+    ) -> Optional[RefreshToken]:
+        return None
+
+    async def exchange_refresh_token(
+        self,
+        client: OAuthClientInformationFull,
+        refresh_token: RefreshToken,
+        scopes: List[str]
+    ) -> OAuthToken:
+        raise TokenError("invalid_grant", "Refresh tokens are not issued; authorize again.")
+
+    async def load_access_token(self, token: str) -> Optional[AccessToken]:
+        """Return the token's grant, or None if it is unknown, revoked or expired."""
+        info = self.tokens.get(token)
+        if info is None:
+            return None
+        return AccessToken(
+            token=token, client_id=info.client_id, scopes=list(info.scopes),
+            expires_at=info.expires_at,
+        )
+
+    async def revoke_token(self, token: AccessToken) -> None:
+        """Revoke a token, dropping it from the cache as well as the store."""
+        self.tokens.revoke(token.token)
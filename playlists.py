@@ -0,0 +1,289 @@
+"""
+Playlist and channel expansion for the YouTube Transcript MCP Server.
+Playlist and channel URLs are expanded into video IDs through the YouTube Data
+API one page (up to 50 videos) at a time, and only as far as the caller reads,
+so a 5,000-video channel is never listed in one go. Pages and channel lookups
+are cached with a TTL, so re-expanding a playlist costs no API quota.
+"""
+
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Callable, Iterator, NamedTuple, Tuple
+
+API_URL = "https://www.googleapis.com/youtube/v3/"
+# The Data API's largest page
+PAGE_SIZE = 50
+# Partial responses: only the fields expansion reads
+PAGE_FIELDS = "nextPageToken,pageInfo/totalResults,items/contentDetails/videoId"
+CHANNEL_FIELDS = "items/contentDetails/relatedPlaylists/uploads"
+
+class PlaylistError(Exception):
+    """A URL that can't be expanded: not a playlist or channel, missing, or no API key."""
+
+class Collection(NamedTuple):
+    """What a playlist or channel URL points at."""
+    # 'playlist', 'channel', 'handle' or 'user'
+    kind: str
+    value: str
+
+class PlaylistPage(NamedTuple):
+    """One page of a playlist's video IDs and the token for the next page."""
+    video_ids: Tuple[str, ...]
+    next_page_token: Optional[str]
+    total: Optional[int]
+
+_PLAYLIST_ID_RE = re.compile(r'(?:PL|UU|LL|FL|OL)[A-Za-z0-9_-]{10,}')
+_CHANNEL_ID_RE = re.compile(r'UC[A-Za-z0-9_-]{22}')
+
+# Accepted forms, with or without scheme and www./m./music. prefixes:
+#   youtube.com/playlist?list=ID, youtube.com/watch?v=...&list=ID
+#   youtube.com/channel/UC..., youtube.com/@handle, youtube.com/user/name
+# optionally followed by a tab such as /videos
+_URL_RE = re.compile(
+    r'(?i:(?:https?:)?(?://)?(?:www\.|m\.|music\.)?youtube\.com/)'
+    r'(?:'
+    r'(?:playlist|watch)/?\?(?:[^#]*?&)??list=(?P<playlist>[A-Za-z0-9_-]+)'
+    r'|channel/(?P<channel>UC[A-Za-z0-9_-]{22})'
+    r'|(?P<handle>@[A-Za-z0-9_.-]+)'
+    r'|user/(?P<user>[A-Za-z0-9_.-]+)'
+    r')'
+    r'(?![A-Za-z0-9_-])'
+)
+
+def parse_collection_url(url: str) -> Optional[Collection]:
+    """Recognise a playlist or channel URL, or a bare playlist ID, channel ID or @handle."""
+    url = url.strip()
+    if _PLAYLIST_ID_RE.fullmatch(url):
+        return Collection('playlist', url)
+    if _CHANNEL_ID_RE.fullmatch(url):
+        return Collection('channel', url)
+    if url.startswith('@') and len(url) > 1:
+        return Collection('handle', url)
+    match = _URL_RE.match(url)
+    if not match:
+        return None
+    kind = match.lastgroup
+    return Collection(kind, match.group(kind))
+
+class DataApiClient:
+    """Minimal YouTube Data API v3 client on the shared pooled session."""
+
+    def __init__(self, api_key: str, session: Any = None, timeout: float = 10.0):
+        self.api_key = api_key
+        self.session = session
+        self.timeout = timeout
+        self.requests = 0
+
+    @classmethod
+    def from_env(cls, session: Any = None) -> "DataApiClient":
+        """Build a client for the key in YOUTUBE_API_KEY."""
+        return cls(os.getenv("YOUTUBE_API_KEY", ""), session)
+
+    def get_json(self, resource: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """GET one API resource and return the decoded response."""
+        if not self.api_key:
+            raise PlaylistError(
+                "Playlist and channel expansion needs a YouTube Data API key; set YOUTUBE_API_KEY"
+            )
+        if self.session is None:
+            from http_pool import get_session
+            self.session = get_session()
+        self.requests += 1
+        response = self.session.get(
+            API_URL + resource, params={**params, 'key': self.api_key}, timeout=self.timeout
+        )
+        if response.status_code == 404:
+            noun = {'playlistItems': 'Playlist', 'channels': 'Channel'}.get(resource, resource)
+            name = next(
+                (params[key] for key in ('playlistId', 'forHandle', 'forUsername', 'id') if params.get(key)),
+                None,
+            )
+            raise PlaylistError(f"{noun} {name} not found" if name else f"{noun} not found")
+        if response.status_code in (400, 403):
+            try:
+                message = response.json()['error']['message']
+            except (ValueError, KeyError, TypeError):
+                message = response.reason
+            raise PlaylistError(f"YouTube Data API refused the request: {message}")
+        response.raise_for_status()
+        return response.json()
+
+class ExpansionCache:
+    """In-memory LRU of playlist pages and channel lookups with a TTL."""
+
+    def __init__(self, max_entries: int = 4096, ttl: float = 900.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # key -> (value, expires_at)
+        self._entries: "OrderedDict[Tuple[str, ...], Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_env(cls) -> "ExpansionCache":
+        """Build a cache configured from PLAYLIST_CACHE_* environment variables."""
+        return cls(
+            max_entries=int(os.getenv("PLAYLIST_CACHE_SIZE", "4096")),
+            ttl=float(os.getenv("PLAYLIST_CACHE_TTL", "900")),
+        )
+
+    def get(self, key: Tuple[str, ...]) -> Any:
+        """Return the cached value, or None on a miss or once it has expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.time() >= entry[1]:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Tuple[str, ...], value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (value, time.time() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss/eviction counters and the current size."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+            }
+
+class PlaylistExpander:
+    """
+    Expands playlists and channels into video IDs, one cached page at a time.
+
+    Args:
+        client: Anything with DataApiClient.get_json, e.g. the offline stub
+        cache: Where pages and channel lookups are kept
+        call: Runs each API request, e.g. UpstreamScheduler.call for the shared
+              rate limit and retries
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        cache: Optional[ExpansionCache] = None,
+        call: Callable[..., Any] = lambda func, *args: func(*args)
+    ):
+        self.client = client
+        self.cache = cache if cache is not None else ExpansionCache()
+        self._call = call
+
+    def playlist_id(self, collection: Collection) -> str:
+        """The playlist to page through: the playlist itself or a channel's uploads."""
+        if collection.kind == 'playlist':
+            return collection.value
+        if collection.kind == 'channel':
+            # Every channel's uploads playlist is its ID with UC swapped for UU
+            return 'UU' + collection.value[2:]
+
+        key = ('uploads', collection.kind, collection.value.lower())
+        uploads = self.cache.get(key)
+        if uploads is None:
+            param = 'forHandle' if collection.kind == 'handle' else 'forUsername'
+            response = self._call(self.client.get_json, 'channels', {
+                'part': 'contentDetails', param: collection.value, 'fields': CHANNEL_FIELDS,
+            })
+            items = response.get('items') or []
+            if not items:
+                raise PlaylistError(f"Channel {collection.value} not found")
+            uploads = items[0]['contentDetails']['relatedPlaylists']['uploads']
+            self.cache.put(key, uploads)
+        return uploads
+
+    def page(self, playlist_id: str, page_token: Optional[str] = None) -> PlaylistPage:
+        """Return one page of a playlist, from the cache when possible."""
+        key = ('page', playlist_id, page_token or '')
+        page = self.cache.get(key)
+        if page is None:
+            params = {
+                'part': 'contentDetails', 'playlistId': playlist_id,
+                'maxResults': PAGE_SIZE, 'fields': PAGE_FIELDS,
+            }
+            if page_token:
+                params['pageToken'] = page_token
+            response = self._call(self.client.get_json, 'playlistItems', params)
+            page = PlaylistPage(
+                tuple(item['contentDetails']['videoId'] for item in response.get('items') or ()),
+                response.get('nextPageToken'),
+                (response.get('pageInfo') or {}).get('totalResults'),
+            )
+            self.cache.put(key, page)
+        return page
+
+    def iter_pages(self, url: str) -> Iterator[PlaylistPage]:
+        """
+        Lazily page through a playlist or channel.
+
+        The URL is checked at once; each page is requested only when the
+        previous one has been consumed.
+
+        Raises:
+            PlaylistError: url is not a playlist or channel URL
+        """
+        collection = parse_collection_url(url)
+        if collection is None:
+            raise PlaylistError("Not a YouTube playlist or channel URL")
+        return self._pages(collection)
+
+    def _pages(self, collection: Collection) -> Iterator[PlaylistPage]:
+        playlist_id = self.playlist_id(collection)
+        page_token = None
+        while True:
+            page = self.page(playlist_id, page_token)
+            yield page
+            page_token = page.next_page_token
+            if not page_token:
+                return
+
+    def iter_video_ids(self, url: str, max_videos: Optional[int] = None) -> Iterator[str]:
+        """
+        Lazily yield a playlist's or channel's video IDs, stopping after max_videos.
+
+        The URL is checked at once, and the page after the max_videos-th ID is
+        never requested.
+
+        Raises:
+            PlaylistError: url is not a playlist or channel URL
+        """
+        pages = self.iter_pages(url)
+        return self._video_ids(pages, max_videos)
+
+    def total(self, url: str) -> Optional[int]:
+        """How many videos a playlist or channel holds, as its (cached) first page reports."""
+        collection = parse_collection_url(url)
+        if collection is None:
+            raise PlaylistError("Not a YouTube playlist or channel URL")
+        return self.page(self.playlist_id(collection)).total
+
+    @staticmethod
+    def _video_ids(pages: Iterator[PlaylistPage], max_videos: Optional[int]) -> Iterator[str]:
+        if max_videos is not None and max_videos <= 0:
+            return
+        count = 0
+        for page in pages:
+            for video_id in page.video_ids:
+                yield video_id
+                count += 1
+                # Return before asking for another page
+                if count == max_videos:
+                    return
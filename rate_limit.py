@@ -0,0 +1,50 @@
+"""
+Token-bucket rate limiting for calls to YouTube.
+Tokens refill continuously at `rate` per second up to `burst`; a caller that
+finds the bucket empty reserves the next token and sleeps until it is due, so
+concurrent callers are spaced out rather than released together.
+"""
+
+import threading
+import time
+from typing import Callable, Optional
+
+class TokenBucket:
+    """Thread-safe token bucket; a rate of 0 or less means unlimited."""
+
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        self.rate = rate
+        self.burst = max(1.0, rate if burst is None else burst)
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = self.burst
+        self._updated = clock()
+        self.waits = 0
+
+    def _reserve(self, tokens: float) -> float:
+        """Take tokens, going into debt if needed; return seconds until they are due."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            self.waits += 1
+            return -self._tokens / self.rate
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Block until tokens are available; return how long the caller waited."""
+        if self.rate <= 0:
+            return 0.0
+        wait = self._reserve(tokens)
+        if wait > 0:
+            self._sleep(wait)
+        return wait
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Multi-worker HTTP serving mode for the YouTube Transcript MCP Server.
+Runs the streamable-HTTP transport under several uvicorn worker processes, so
+formatting large transcripts is spread over every core instead of one. Each
+worker keeps its own in-process caches; transcripts are shared through the
+SQLite store at TRANSCRIPT_CACHE_PATH, so a transcript one worker fetched is a
+disk hit for all the others. UPSTREAM_RATE and UPSTREAM_BURST are totals
+for the server and are split evenly between the workers.
+
+Usage:
+    python serve.py --workers 4 --port 8000
+    MCP_WORKERS=4 python serve.py
+"""
+
+import argparse
+import os
+import sys
+from typing import Optional, Dict, List, NamedTuple, TYPE_CHECKING
+from dotenv import load_dotenv
+
+if TYPE_CHECKING:
+    from starlette.applications import Starlette
+
+# Load environment variables before the defaults below read them
+load_dotenv()
+
+class ServeConfig(NamedTuple):
+    """Where to listen and how many worker processes to run."""
+    host: str = "127.0.0.1"
+    port: int = 8000
+    workers: int = 1
+    path: str = "/mcp"
+    log_level: str = "info"
+
+    @classmethod
+    def from_env(cls) -> "ServeConfig":
+        """Read MCP_HOST, MCP_PORT, MCP_WORKERS (default: one per core) and MCP_HTTP_PATH."""
+        return cls(
+            host=os.getenv("MCP_HOST", "127.0.0.1"),
+            port=int(os.getenv("MCP_PORT", "8000")),
+            workers=int(os.getenv("MCP_WORKERS", "0")) or os.cpu_count() or 1,
+            path=os.getenv("MCP_HTTP_PATH", "/mcp"),
+            log_level=os.getenv("MCP_LOG_LEVEL", "info"),
+        )
+
+def create_app() -> "Starlette":
+    """Build one worker's ASGI app; uvicorn calls this in every worker process.
+
+    Sessions are stateless because consecutive requests from one client can
+    land on different workers, and responses are plain JSON since every tool
+    call answers with a single message.
+    """
+    from server import mcp
+
+    return mcp.http_app(
+        path=os.getenv("MCP_HTTP_PATH", "/mcp"), stateless_http=True, json_response=True
+    )
+
+def shared_store_warning() -> Optional[str]:
+    """Explain why workers won't share transcripts, or None if they will."""
+    if not os.getenv("TRANSCRIPT_CACHE_PATH", "x"):
+        return ("TRANSCRIPT_CACHE_PATH is empty, so each worker caches transcripts "
+                "in memory only and fetches them from YouTube separately.")
+    return None
+
+def worker_rate_limit(workers: int) -> Dict[str, str]:
+    """Split UPSTREAM_RATE and UPSTREAM_BURST evenly between workers.
+
+    Every worker has its own token bucket, so without this the total rate
+    to YouTube would grow with the worker count. A rate of 0 (unlimited)
+    is left as it is.
+    """
+    rate = float(os.getenv("UPSTREAM_RATE", "20"))
+    burst = float(os.getenv("UPSTREAM_BURST", str(rate * 2)))
+    if rate <= 0:
+        return {}
+    return {"UPSTREAM_RATE": repr(rate / workers), "UPSTREAM_BURST": repr(burst / workers)}
+
+def main(argv: Optional[List[str]] = None) -> int:
+    defaults = ServeConfig.from_env()
+    parser = argparse.ArgumentParser(
+        description="Serve the MCP server over streamable HTTP with several worker processes."
+    )
+    parser.add_argument("--host", default=defaults.host, help=f"(default: {defaults.host})")
+    parser.add_argument("--port", type=int, default=defaults.port, help=f"(default: {defaults.port})")
+    parser.add_argument("--workers", type=int, default=defaults.workers,
+                        help=f"worker processes (default: {defaults.workers})")
+    parser.add_argument("--path", default=defaults.path, help=f"endpoint path (default: {defaults.path})")
+    parser.add_argument("--log-level", default=defaults.log_level)
+    args = parser.parse_args(argv)
+
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    warning = shared_store_warning()
+    if warning and args.workers > 1:
+        print(f"Warning: {warning}", file=sys.stderr)
+
+    import uvicorn
+
+    # Workers are fresh interpreters that build the app from the environment
+    os.environ["MCP_HTTP_PATH"] = args.path
+    os.environ.update(worker_rate_limit(args.workers))
+    uvicorn.run(
+        "serve:create_app",
+        factory=True,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        log_level=args.log_level,
+    )
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+"""
+Request coalescing for upstream transcript fetches.
+Concurrent calls with the same key share one execution: the first caller does
+the work and every caller that arrives while it is in flight waits for, and
+receives, that same result or exception.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+class _Call:
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+
+class SingleFlight:
+    """Collapse concurrent calls for the same key into a single execution."""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, func: Callable[..., Any], *args: Any) -> Any:
+        """Run func(*args) unless a call for key is already running; then wait for it."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func(*args)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> Dict[str, int]:
+        """Return how many calls ran upstream and how many were saved by sharing."""
+        with self._lock:
+            return {
+                'upstream_calls': self.executions,
+                'coalesced': self.coalesced,
+                'in_flight': len(self._calls),
+            }
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Test the pooled upstream session against a local keep-alive HTTP server.
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from http_pool import create_session, pool_stats
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b"ok"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def local_url():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}/"
+    httpd.shutdown()
+    httpd.server_close()
+
+def test_connections_are_reused(local_url):
+    """Sequential requests share one connection at steady state."""
+    session = create_session(max_connections=4, keepalive_expiry=60, http2=False)
+    for _ in range(5):
+        assert session.get(local_url).text == "ok"
+
+    stats = pool_stats(session)
+    assert stats['requests'] == 5
+    assert stats['connections_opened'] == 1
+    assert stats['connections_reused'] == 4
+    assert stats['connections_idle'] == 1
+
+def test_idle_pool_expires(local_url):
+    """A pool idle for longer than the keep-alive expiry is replaced."""
+    session = create_session(max_connections=4, keepalive_expiry=0.01, http2=False)
+    session.get(local_url)
+    threading.Event().wait(0.05)
+    session.get(local_url)
+
+    stats = pool_stats(session)
+    assert stats['connections_opened'] == 2
+    assert stats['pools_expired'] == 1
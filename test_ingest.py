@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Test the bulk ingest CLI and its rate limiter against a fake upstream.
+"""
+
+import os
+import tempfile
+
+import pytest
+from youtube_transcript_api._errors import TranscriptsDisabled
+
+import ingest
+import transcript_service
+from rate_limit import TokenBucket
+from transcript_cache import TranscriptCache, TranscriptStore
+from upstream_stub import StubTranscript
+
+@pytest.fixture
+def workdir():
+    with tempfile.TemporaryDirectory() as directory:
+        store = TranscriptStore(os.path.join(directory, 'transcripts.db'))
+        yield directory, store
+        store.close()
+
+def _write_input(directory, lines):
+    path = os.path.join(directory, 'videos.txt')
+    with open(path, 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+    return path
+
+def test_ingest_writes_store_and_resumes(monkeypatch, use_fakes, workdir):
+    """A rerun skips every video recorded in the checkpoint."""
+    directory, store = workdir
+    api = use_fakes([StubTranscript('en')])
+    monkeypatch.setattr(transcript_service, 'transcript_cache', TranscriptCache(store=store))
+    path = _write_input(directory, [
+        'aaaaaaaaaaa',
+        'https://youtu.be/bbbbbbbbbbb',
+        'https://www.youtube.com/watch?v=aaaaaaaaaaa',
+        'not a video',
+    ])
+
+    assert ingest.main([path, '--workers', '2']) == 0
+    assert api.listings == 2
+    assert store.get(('bbbbbbbbbbb', 'en', False), max_age=60) is not None
+    with open(path + '.checkpoint') as f:
+        assert sorted(line.split('\t')[0] for line in f) == ['aaaaaaaaaaa', 'bbbbbbbbbbb']
+
+    assert ingest.main([path]) == 0
+    assert api.listings == 2
+
+def test_transient_failures_are_retried_on_resume(monkeypatch, use_fakes, workdir):
+    """Permanent errors are checkpointed; other errors are left for the next run."""
+    directory, store = workdir
+    use_fakes(error=TranscriptsDisabled('aaaaaaaaaaa'))
+    monkeypatch.setattr(transcript_service, 'transcript_cache', TranscriptCache(store=store))
+    counts = ingest.ingest(['aaaaaaaaaaa'])
+    assert counts == {'ok': 0, 'missing': 1, 'failed': 0}
+
+    use_fakes(error=ConnectionError('reset'))
+    monkeypatch.setattr(transcript_service, 'transcript_cache', TranscriptCache(store=store))
+    path = _write_input(directory, ['bbbbbbbbbbb'])
+    assert ingest.main([path]) == 1
+    assert ingest.load_checkpoint(path + '.checkpoint') == set()
+
+def test_disabled_store_is_refused(use_fakes):
+    use_fakes()
+    assert ingest.main(['-']) == 2
+
+def test_token_bucket_spaces_calls():
+    """After the burst, each call waits 1/rate seconds for its token."""
+    now = [0.0]
+    slept = []
+
+    def sleep(seconds):
+        slept.append(seconds)
+        now[0] += seconds
+
+    bucket = TokenBucket(rate=4, burst=2, clock=lambda: now[0], sleep=sleep)
+    waits = [bucket.acquire() for _ in range(4)]
+    assert waits[:2] == [0.0, 0.0]
+    assert waits[2:] == [pytest.approx(0.25), pytest.approx(0.25)]
+    assert bucket.waits == 2
+    assert TokenBucket(rate=0).acquire() == 0.0
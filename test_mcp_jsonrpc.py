@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Test the serverless JSON-RPC MCP endpoint against a fake upstream.
+"""
+
+import importlib.util
+import json
+import os
+import threading
+import urllib.request
+from http.server import HTTPServer
+
+from mcp_jsonrpc import (
+    INTERNAL_ERROR,
+    INVALID_PARAMS,
+    INVALID_REQUEST,
+    METHOD_NOT_FOUND,
+    PARSE_ERROR,
+    handle_request
+)
+from upstream_stub import StubTranscript
+
+def _rpc(payload):
+    response = handle_request(json.dumps(payload).encode())
+    return None if response is None else json.loads(response)
+
+def test_initialize_and_list_tools():
+    """initialize negotiates a version; tools/list matches the FastMCP server's tools."""
+    result = _rpc({'jsonrpc': '2.0', 'id': 1, 'method': 'initialize',
+                   'params': {'protocolVersion': '2025-03-26'}})['result']
+    assert result['protocolVersion'] == '2025-03-26'
+    assert 'tools' in result['capabilities']
+
+    tools = _rpc({'jsonrpc': '2.0', 'id': 2, 'method': 'tools/list'})['result']['tools']
+    by_name = {tool['name']: tool for tool in tools}
+    assert list(by_name) == [
+        'get_youtube_transcript', 'get_youtube_transcripts',
+        'list_available_transcripts', 'search_transcripts',
+        'expand_playlist', 'get_playlist_transcripts',
+    ]
+    schema = by_name['get_youtube_transcript']['inputSchema']
+    assert schema['required'] == ['video_url']
+    assert schema['properties']['include_timestamps'] == {'type': 'boolean', 'default': True}
+    assert schema['properties']['language']['type'] == ['string', 'null']
+    assert by_name['get_youtube_transcripts']['inputSchema']['properties']['video_urls']['items'] == {'type': 'string'}
+
+def test_batch_calls_tools(use_fakes):
+    """A batch is answered in one response; notifications get no entry."""
+    use_fakes([StubTranscript('en')])
+    responses = _rpc([
+        {'jsonrpc': '2.0', 'method': 'notifications/initialized'},
+        {'jsonrpc': '2.0', 'id': 'a', 'method': 'tools/call',
+         'params': {'name': 'get_youtube_transcript', 'arguments': {'video_url': 'dQw4w9WgXcQ'}}},
+        {'jsonrpc': '2.0', 'id': 'b', 'method': 'tools/call',
+         'params': {'name': 'get_youtube_transcript', 'arguments': {'video_url': 'not a url'}}},
+        {'jsonrpc': '2.0', 'id': 'd', 'method': 'tools/call',
+         'params': {'name': 'get_youtube_transcript',
+                    'arguments': {'video_url': 'not a url', 'output_format': 'json'}}},
+        {'jsonrpc': '2.0', 'id': 'c', 'method': 'resources/read',
+         'params': {'uri': 'youtube://server/info'}},
+    ])
+    by_id = {response['id']: response for response in responses}
+    assert sorted(by_id) == ['a', 'b', 'c', 'd']
+    ok = by_id['a']['result']
+    assert ok['isError'] is False
+    assert ok['content'][0]['text'].startswith('Video ID: dQw4w9WgXcQ')
+    assert by_id['b']['result']['isError'] is True
+    assert by_id['d']['result']['isError'] is True
+    assert 'search_transcripts' in by_id['c']['result']['contents'][0]['text']
+
+def test_errors():
+    """Protocol errors are reported with JSON-RPC error codes."""
+    assert json.loads(handle_request(b'{not json'))['error']['code'] == PARSE_ERROR
+    assert _rpc([])['error']['code'] == INVALID_REQUEST
+    assert _rpc({'id': 1, 'method': 'ping'})['error']['code'] == INVALID_REQUEST
+    assert _rpc({'jsonrpc': '2.0', 'id': 1, 'method': 'nope'})['error']['code'] == METHOD_NOT_FOUND
+    unknown = _rpc({'jsonrpc': '2.0', 'id': 1, 'method': 'tools/call', 'params': {'name': 'nope'}})
+    assert unknown['error']['code'] == INVALID_PARAMS
+    bad_args = _rpc({'jsonrpc': '2.0', 'id': 1, 'method': 'tools/call',
+                     'params': {'name': 'search_transcripts', 'arguments': {'q': 'x'}}})
+    assert bad_args['error']['code'] == INVALID_PARAMS
+    assert _rpc({'jsonrpc': '2.0', 'method': 'notifications/initialized'}) is None
+
+def test_arguments_are_checked_against_the_schema(use_fakes):
+    """Arguments of the wrong type are invalid params, not errors inside the tool."""
+    api = use_fakes([StubTranscript('en')])
+
+    def call(name, arguments):
+        return _rpc({'jsonrpc': '2.0', 'id': 1, 'method': 'tools/call',
+                     'params': {'name': name, 'arguments': arguments}})
+
+    for name, arguments, field in (
+        ('get_youtube_transcript', {'video_url': 'dQw4w9WgXcQ', 'limit': 'abc'}, 'limit'),
+        ('get_youtube_transcript', {'video_url': 123}, 'video_url'),
+        ('get_youtube_transcripts', {'video_urls': 'dQw4w9WgXcQ'}, 'video_urls'),
+    ):
+        error = call(name, arguments)['error']
+        assert error['code'] == INVALID_PARAMS
+        assert f"{field}:" in error['message']
+    assert api.listings == 0
+
+    # Values JSON can't tell apart are still accepted
+    result = call('get_youtube_transcript', {'video_url': 'dQw4w9WgXcQ', 'limit': 2.0})['result']
+    assert result['isError'] is False
+
+def test_tool_type_errors_are_internal(monkeypatch):
+    """A TypeError raised inside a tool isn't blamed on the caller's arguments."""
+    import tools
+
+    async def broken(query: str) -> str:
+        return len(query) + query
+
+    monkeypatch.setitem(tools.TOOLS, 'search_transcripts', broken)
+    response = _rpc({'jsonrpc': '2.0', 'id': 1, 'method': 'tools/call',
+                     'params': {'name': 'search_transcripts', 'arguments': {'query': 'x'}}})
+    assert response['error']['code'] == INTERNAL_ERROR
+
+def test_vercel_handler_over_http(use_fakes):
+    """api/mcp.py answers POST /mcp with JSON-RPC, notifications with 202 and GET /metrics."""
+    use_fakes([StubTranscript('en')])
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'api', 'mcp.py')
+    spec = importlib.util.spec_from_file_location('vercel_mcp', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    httpd = HTTPServer(('127.0.0.1', 0), module.handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    url = f'http://127.0.0.1:{httpd.server_port}/mcp'
+    try:
+        def post(payload):
+            request = urllib.request.Request(
+                url, json.dumps(payload).encode(), {'Content-Type': 'application/json'}
+            )
+            with urllib.request.urlopen(request) as response:
+                return response.status, response.read()
+
+        status, body = post({'jsonrpc': '2.0', 'id': 1, 'method': 'tools/call', 'params': {
+            'name': 'list_available_transcripts', 'arguments': {'video_url': 'dQw4w9WgXcQ'}}})
+        assert status == 200
+        assert 'Available transcripts' in json.loads(body)['result']['content'][0]['text']
+
+        status, body = post({'jsonrpc': '2.0', 'method': 'notifications/initialized'})
+        assert status == 202 and body == b''
+
+        with urllib.request.urlopen(url[:-len('/mcp')] + '/metrics') as response:
+            assert response.headers['Content-Type'].startswith('text/plain')
+            assert b'youtube_transcript_' in response.read()
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+def test_vercel_routes_metrics_to_the_function():
+    """Every path the handler serves is rewritten to it on Vercel."""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'vercel.json')
+    with open(path) as f:
+        rewrites = {rule['source']: rule['destination'] for rule in json.load(f)['rewrites']}
+    for source in ('/', '/mcp', '/metrics'):
+        assert rewrites[source] == '/api/mcp'
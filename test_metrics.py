@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Test the Prometheus metrics registry and the instrumentation of tool calls.
+"""
+
+import asyncio
+
+from youtube_transcript_api._errors import TranscriptsDisabled
+
+import metrics
+import server
+from metrics import Registry
+from upstream_stub import StubTranscript
+
+def test_histogram_buckets_are_cumulative():
+    """Each bucket counts observations at or below its bound; +Inf counts all."""
+    registry = Registry(prefix="test")
+    histogram = registry.histogram("latency_seconds", "Latency.", (0.1, 1.0), ("stage",))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, 'fetch')
+
+    text = registry.render()
+    assert '# TYPE test_latency_seconds histogram' in text
+    assert 'test_latency_seconds_bucket{stage="fetch",le="0.1"} 2' in text
+    assert 'test_latency_seconds_bucket{stage="fetch",le="1.0"} 3' in text
+    assert 'test_latency_seconds_bucket{stage="fetch",le="+Inf"} 4' in text
+    assert 'test_latency_seconds_sum{stage="fetch"} 3.65' in text
+    assert 'test_latency_seconds_count{stage="fetch"} 4' in text
+    assert histogram.count('fetch') == 4
+
+def test_counter_labels_and_stats():
+    """Counters render per label set; registered stats export only numbers."""
+    registry = Registry(prefix="test")
+    counter = registry.counter("requests_total", "Requests.", ("outcome",))
+    counter.inc('ok')
+    counter.inc('ok')
+    counter.inc('say "hi"')
+    registry.register_stats('cache', lambda: {'hits': 3, 'state': 'closed', 'enabled': True})
+
+    text = registry.render()
+    assert 'test_requests_total{outcome="ok"} 2' in text
+    assert 'test_requests_total{outcome="say \\"hi\\""} 1' in text
+    assert 'test_cache_hits 3' in text
+    assert 'state' not in text and 'enabled' not in text
+    assert text.endswith('\n')
+
+def test_tool_call_records_stages_and_outcome(use_fakes):
+    """A transcript request times each stage and counts its outcome and size."""
+    use_fakes([StubTranscript('en')])
+    stages = ('extract', 'listing', 'resolve', 'cache', 'fetch', 'format', 'total')
+    before = {stage: metrics.stage_seconds.count(stage) for stage in stages}
+    ok = metrics.outcomes.value('ok')
+    sizes = metrics.response_chars.count('get_youtube_transcript')
+
+    result = asyncio.run(server.get_youtube_transcript('dQw4w9WgXcQ'))
+    assert result.startswith('Video ID:')
+    for stage in stages:
+        assert metrics.stage_seconds.count(stage) == before[stage] + 1, stage
+    assert metrics.outcomes.value('ok') == ok + 1
+    assert metrics.response_chars.count('get_youtube_transcript') == sizes + 1
+
+    text = server.get_metrics()
+    assert 'youtube_transcript_stage_seconds_count{stage="fetch"}' in text
+    assert 'youtube_transcript_transcript_cache_misses' in text
+
+def test_error_outcomes_are_counted(use_fakes):
+    """Failures are counted under their own outcome."""
+    use_fakes(error=TranscriptsDisabled('dQw4w9WgXcQ'))
+    disabled = metrics.outcomes.value('transcripts_disabled')
+    invalid = metrics.outcomes.value('invalid_id')
+
+    asyncio.run(server.get_youtube_transcript('dQw4w9WgXcQ'))
+    asyncio.run(server.get_youtube_transcript('not a url'))
+    assert metrics.outcomes.value('transcripts_disabled') == disabled + 1
+    assert metrics.outcomes.value('invalid_id') == invalid + 1
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Test playlist and channel expansion against recorded Data API pages.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+import server
+import transcript_service
+from playlists import (
+    Collection,
+    DataApiClient,
+    ExpansionCache,
+    PlaylistError,
+    PlaylistExpander,
+    parse_collection_url
+)
+from upstream_stub import StubDataApi, StubTranscript
+
+PLAYLIST = 'PL8xMz0HF_T1BNQjA7sB0hS17prPXQSzP2'
+PLAYLIST_URL = f'https://www.youtube.com/playlist?list={PLAYLIST}'
+CHANNEL = 'UC1OB0DAfCcHO1oQDE7UrzV_'
+
+def _use_fixture(monkeypatch, api=None):
+    api = api or StubDataApi.from_fixture()
+    monkeypatch.setattr(transcript_service, 'playlist_expander', PlaylistExpander(api))
+    return api
+
+def test_parse_collection_urls():
+    """Playlist, channel, handle and user URLs are recognised; video URLs aren't."""
+    assert parse_collection_url(PLAYLIST_URL) == Collection('playlist', PLAYLIST)
+    assert parse_collection_url(f'https://m.youtube.com/watch?v=dQw4w9WgXcQ&list={PLAYLIST}') \
+        == Collection('playlist', PLAYLIST)
+    assert parse_collection_url(f'https://www.youtube.com/channel/{CHANNEL}/videos') \
+        == Collection('channel', CHANNEL)
+    assert parse_collection_url('https://www.youtube.com/@fixturechannel') \
+        == Collection('handle', '@fixturechannel')
+    assert parse_collection_url('youtube.com/user/fixtureuser') == Collection('user', 'fixtureuser')
+    assert parse_collection_url('dQw4w9WgXcQ') is None
+    assert parse_collection_url('https://www.youtube.com/watch?v=dQw4w9WgXcQ') is None
+
+def test_pages_are_requested_lazily():
+    """Only the pages needed for max_videos are requested."""
+    api = StubDataApi.from_fixture()
+    expander = PlaylistExpander(api)
+
+    ids = expander.iter_video_ids(PLAYLIST_URL, max_videos=50)
+    assert api.requests == 0
+    assert len(list(ids)) == 50
+    assert api.requests == 1
+
+    everything = list(expander.iter_video_ids(PLAYLIST_URL))
+    assert len(everything) == len(set(everything)) == 120
+    # The first page came from the cache
+    assert api.requests == 3
+
+def test_channels_resolve_to_uploads():
+    """Handles cost one channel lookup; channel IDs map to their uploads playlist directly."""
+    api = StubDataApi.from_fixture()
+    expander = PlaylistExpander(api)
+
+    by_handle = list(expander.iter_video_ids('@fixturechannel'))
+    assert len(by_handle) == 60
+    assert api.requests == 3
+    assert list(expander.iter_video_ids(f'https://www.youtube.com/channel/{CHANNEL}')) == by_handle
+    assert list(expander.iter_video_ids('https://www.youtube.com/user/fixtureuser')) == by_handle
+    assert api.requests == 4
+
+    with pytest.raises(PlaylistError):
+        list(expander.iter_video_ids('@missingchannel'))
+    with pytest.raises(PlaylistError):
+        expander.iter_video_ids('https://www.youtube.com/watch?v=dQw4w9WgXcQ')
+
+def test_not_found_names_what_was_missing():
+    """A 404 from the Data API names the playlist or channel that was asked for."""
+    class NotFoundSession:
+        def get(self, url, params, timeout):
+            return type('Response', (), {'status_code': 404})()
+
+    client = DataApiClient('key', NotFoundSession())
+    with pytest.raises(PlaylistError, match=f'^Playlist {PLAYLIST} not found$'):
+        client.get_json('playlistItems', {'playlistId': PLAYLIST})
+    with pytest.raises(PlaylistError, match='^Channel @fixturechannel not found$'):
+        client.get_json('channels', {'part': 'contentDetails', 'forHandle': '@fixturechannel'})
+
+def test_expansion_cache_ttl():
+    """Cached pages expire after the TTL and are requested again."""
+    api = StubDataApi.from_fixture()
+    expander = PlaylistExpander(api, ExpansionCache(ttl=0))
+    list(expander.iter_video_ids(PLAYLIST_URL, max_videos=10))
+    list(expander.iter_video_ids(PLAYLIST_URL, max_videos=10))
+    assert api.requests == 2
+    assert expander.cache.stats()['hits'] == 0
+
+def test_expand_playlist_tool(monkeypatch):
+    """expand_playlist lists IDs in order and says whether it stopped early."""
+    _use_fixture(monkeypatch)
+    text = asyncio.run(server.expand_playlist(PLAYLIST_URL, max_videos=70))
+    lines = text.splitlines()
+    assert lines[0] == f'Videos in {PLAYLIST_URL}: 70 of 120'
+    assert lines[-1] == '[Stopped at max_videos=70]'
+
+    full = json.loads(asyncio.run(server.expand_playlist(PLAYLIST_URL, output_format='json')))
+    assert (full['total'], full['complete'], len(full['video_ids'])) == (120, True, 120)
+    assert full['video_ids'][:70] == lines[1:71]
+
+    assert asyncio.run(server.expand_playlist('not a playlist')).startswith('Error:')
+
+def test_playlist_transcripts(monkeypatch, use_fakes):
+    """Expanded IDs feed straight into the concurrent batch fetch."""
+    api = use_fakes([StubTranscript('en')])
+    data_api = _use_fixture(monkeypatch)
+
+    result = json.loads(asyncio.run(server.get_playlist_transcripts(
+        PLAYLIST_URL, max_videos=60, output_format='json'
+    )))
+    assert (result['fetched'], result['total']) == (60, 60)
+    assert [r['input'] for r in result['results']] == [r['video_id'] for r in result['results']]
+    assert api.listings == 60
+    assert data_api.requests == 2
+
+def test_playlist_transcripts_without_api_key(monkeypatch):
+    """Without YOUTUBE_API_KEY the tool explains what is missing."""
+    _use_fixture(monkeypatch, DataApiClient(''))
+    result = asyncio.run(server.get_playlist_transcripts(PLAYLIST_URL))
+    assert result.startswith('Error: Playlist and channel expansion needs a YouTube Data API key')
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test the multi-worker HTTP serving mode.
+"""
+
+import os
+import tempfile
+
+from starlette.testclient import TestClient
+
+import serve
+import transcript_service
+from transcript_cache import CachedTranscript, TranscriptCache, TranscriptStore
+from upstream_stub import StubTranscript, make_segments
+
+HEADERS = {'Accept': 'application/json, text/event-stream'}
+
+def _call(client, video_id):
+    response = client.post('/mcp', headers=HEADERS, json={
+        'jsonrpc': '2.0', 'id': 1, 'method': 'tools/call',
+        'params': {'name': 'get_youtube_transcript', 'arguments': {'video_url': video_id}},
+    })
+    assert response.status_code == 200
+    return response.json()['result']
+
+def test_requests_need_no_session(monkeypatch, use_fakes):
+    """Any worker can answer any request: no initialize or session header is needed."""
+    use_fakes([StubTranscript('en')])
+    monkeypatch.setenv('MCP_HTTP_PATH', '/mcp')
+    with TestClient(serve.create_app()) as client:
+        tools = client.post('/mcp', headers=HEADERS, json={
+            'jsonrpc': '2.0', 'id': 1, 'method': 'tools/list'
+        }).json()['result']['tools']
+        assert 'get_youtube_transcript' in {tool['name'] for tool in tools}
+        result = _call(client, 'dQw4w9WgXcQ')
+    assert result['isError'] is False
+    assert result['content'][0]['text'].startswith('Video ID: dQw4w9WgXcQ')
+
+def test_worker_serves_what_another_stored(monkeypatch, use_fakes):
+    """A transcript another worker wrote to the shared store is served without YouTube."""
+    api = use_fakes([StubTranscript('en')])
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'transcripts.db')
+        other_worker = TranscriptStore(path)
+        other_worker.put(CachedTranscript('dQw4w9WgXcQ', 'English', 'en', False, make_segments(3)))
+        other_worker.close()
+
+        cache = TranscriptCache(store=TranscriptStore(path))
+        monkeypatch.setattr(transcript_service, 'transcript_cache', cache)
+        with TestClient(serve.create_app()) as client:
+            text = _call(client, 'dQw4w9WgXcQ')['content'][0]['text']
+            _call(client, 'dQw4w9WgXcQ')
+        cache.store.close()
+
+    assert 'segment 2 of the stub transcript' in text
+    assert api.listings == 0
+    assert (cache.stats()['disk_hits'], cache.stats()['hits']) == (1, 2)
+
+def test_config_from_env(monkeypatch):
+    """Workers default to one per core; an empty store path is warned about."""
+    monkeypatch.delenv('MCP_WORKERS', raising=False)
+    assert serve.ServeConfig.from_env().workers == (os.cpu_count() or 1)
+    monkeypatch.setenv('MCP_WORKERS', '3')
+    monkeypatch.setenv('MCP_PORT', '9000')
+    config = serve.ServeConfig.from_env()
+    assert (config.workers, config.port) == (3, 9000)
+
+    monkeypatch.setenv('TRANSCRIPT_CACHE_PATH', '/tmp/transcripts.db')
+    assert serve.shared_store_warning() is None
+    monkeypatch.setenv('TRANSCRIPT_CACHE_PATH', '')
+    assert 'in memory only' in serve.shared_store_warning()
+
+def test_rate_limit_is_split_between_workers(monkeypatch):
+    """UPSTREAM_RATE is a total for the server, not per worker."""
+    monkeypatch.setenv('UPSTREAM_RATE', '20')
+    monkeypatch.delenv('UPSTREAM_BURST', raising=False)
+    limits = serve.worker_rate_limit(4)
+    assert (float(limits['UPSTREAM_RATE']), float(limits['UPSTREAM_BURST'])) == (5.0, 10.0)
+    monkeypatch.setenv('UPSTREAM_BURST', '6')
+    assert float(serve.worker_rate_limit(3)['UPSTREAM_BURST']) == 2.0
+    monkeypatch.setenv('UPSTREAM_RATE', '0')
+    assert serve.worker_rate_limit(4) == {}
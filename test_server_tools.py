@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Test the MCP tool functions against a fake upstream.
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+import server
+import transcript_json
+import transcript_service
+from transcript_cache import TranscriptCache, TranscriptStore
+from upstream_stub import StubTranscript, make_segments
+
+def test_batch_dedupes_and_keeps_input_order(use_fakes):
+    """URL variants of one video are fetched once; invalid inputs keep their slot."""
+    api = use_fakes([StubTranscript('en')])
+    result = asyncio.run(server.get_youtube_transcripts([
+        'https://youtu.be/dQw4w9WgXcQ',
+        'not a url',
+        'dQw4w9WgXcQ',
+        'https://www.youtube.com/watch?v=9bZkp7q19f0',
+    ]))
+
+    assert result.startswith('Fetched 2 of 3 videos')
+    first = result.index('[1] https://youtu.be/dQw4w9WgXcQ')
+    second = result.index('[2] not a url')
+    third = result.index('[3] https://www.youtube.com/watch?v=9bZkp7q19f0')
+    assert first < second < third
+    assert 'Video ID: 9bZkp7q19f0' in result
+    assert api.listings == 2
+
+def test_batch_timeout_is_per_video(use_fakes):
+    """A slow video times out without failing the rest of the batch."""
+    use_fakes([StubTranscript('en', latency=0.5)])
+    result = asyncio.run(server.get_youtube_transcripts(
+        ['dQw4w9WgXcQ'], timeout_seconds=0.05
+    ))
+    assert 'Error: Timed out after 0.05 seconds.' in result
+
+def test_timed_out_fetch_keeps_its_slot(use_fakes):
+    """The next video waits for a timed-out fetch's thread, so max_concurrency bounds threads."""
+    use_fakes([StubTranscript('en', latency=0.3)])
+    started = time.perf_counter()
+    result = asyncio.run(server.get_youtube_transcripts(
+        ['aaaaaaaaaaa', 'bbbbbbbbbbb'], max_concurrency=1, timeout_seconds=0.05
+    ))
+    assert result.count('Error: Timed out after 0.05 seconds.') == 2
+    assert time.perf_counter() - started >= 0.3
+
+def test_tool_calls_overlap(use_fakes):
+    """Concurrent tool calls wait on upstream I/O together, not one after another."""
+    use_fakes([StubTranscript('en', latency=0.2)])
+
+    async def run():
+        video_ids = ['aaaaaaaaaaa', 'bbbbbbbbbbb', 'ccccccccccc', 'ddddddddddd']
+        return await asyncio.gather(*(server.get_youtube_transcript(v) for v in video_ids))
+
+    started = time.perf_counter()
+    results = asyncio.run(run())
+    assert all(r.startswith('Video ID:') for r in results)
+    assert time.perf_counter() - started < 0.6
+
+def test_transcript_pages(use_fakes):
+    """offset/limit return one page of segments and point at the next one."""
+    use_fakes([StubTranscript('en', segments=make_segments(5))])
+
+    full = asyncio.run(server.get_youtube_transcript('dQw4w9WgXcQ'))
+    assert full.endswith('[00:08] segment 4 of the stub transcript')
+    assert 'Segments' not in full
+
+    page = asyncio.run(server.get_youtube_transcript('dQw4w9WgXcQ', offset=1, limit=2))
+    body = page.split('=' * 50 + '\n\n')[1]
+    assert body.splitlines() == [
+        '[00:02] segment 1 of the stub transcript',
+        '[00:04] segment 2 of the stub transcript',
+        '',
+        '[Segments 2-3 of 5; next offset: 3]',
+    ]
+
+    last = asyncio.run(server.get_youtube_transcript('dQw4w9WgXcQ', offset=3, limit=10))
+    assert last.endswith('[Segments 4-5 of 5]')
+    assert asyncio.run(server.get_youtube_transcript('dQw4w9WgXcQ', offset=5)).startswith('Error:')
+    for limit in (0, -1):
+        assert asyncio.run(server.get_youtube_transcript('dQw4w9WgXcQ', limit=limit)) \
+            == f'Error: limit must be at least 1, got {limit}.'
+
+def test_time_window(use_fakes):
+    """start_seconds/end_seconds render only the overlapping segments."""
+    use_fakes([StubTranscript('en', segments=make_segments(100))])
+
+    result = asyncio.run(server.get_youtube_transcript(
+        'dQw4w9WgXcQ', start_seconds=61, end_seconds=66
+    ))
+    body = result.split('=' * 50 + '\n\n')[1]
+    assert body.splitlines() == [
+        '[01:00] segment 30 of the stub transcript',
+        '[01:02] segment 31 of the stub transcript',
+        '[01:04] segment 32 of the stub transcript',
+        '',
+        '[Segments 1-3 of 3 between 61s and 66s]',
+    ]
+
+    result = asyncio.run(server.get_youtube_transcript('dQw4w9WgXcQ', start_seconds=1000))
+    assert result.endswith('=' * 50 + '\n\nNo segments between 1000s and end.')
+
+def test_time_window_with_long_caption(use_fakes):
+    """A long caption from before the window is kept; the segments between are not."""
+    segments = [{'text': 'title card', 'start': 0.0, 'duration': 300.0}] + make_segments(100)[1:]
+    use_fakes([StubTranscript('en', segments=segments)])
+
+    result = asyncio.run(server.get_youtube_transcript(
+        'dQw4w9WgXcQ', start_seconds=61, end_seconds=64, output_format='json'
+    ))
+    response = json.loads(result)
+    assert response['total_segments'] == 3
+    assert response['ranges'] == [[0, 1], [30, 32]]
+    assert [segment['text'] for segment in response['segments']] == [
+        'title card',
+        'segment 30 of the stub transcript',
+        'segment 31 of the stub transcript',
+    ]
+
+    result = asyncio.run(server.get_youtube_transcript(
+        'dQw4w9WgXcQ', start_seconds=61, end_seconds=64, offset=1
+    ))
+    assert '[01:00] segment 30 of the stub transcript\n[01:02] segment 31' in result
+    assert 'title card' not in result and '[...]' not in result
+
+def test_time_window_read_from_store(monkeypatch, use_fakes):
+    """A track only on disk serves a window from its blocks, formatted as from memory."""
+    segments = [{'text': 'title card', 'start': 0.0, 'duration': 300.0}] + make_segments(3000)[1:]
+    api = use_fakes([StubTranscript('en', segments=segments)])
+    requests = [
+        {'start_seconds': 61, 'end_seconds': 64},
+        {'start_seconds': 61, 'end_seconds': 64, 'output_format': 'json'},
+        {'start_seconds': 1000, 'end_seconds': 1100, 'offset': 5, 'limit': 20},
+        {'start_seconds': 1000, 'max_tokens': 200, 'truncate': 'sample', 'output_format': 'json'},
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'transcripts.db')
+        monkeypatch.setattr(transcript_service, 'transcript_cache', TranscriptCache(store=TranscriptStore(path)))
+        from_memory = [
+            asyncio.run(server.get_youtube_transcript('dQw4w9WgXcQ', **request)) for request in requests
+        ]
+        transcript_service.transcript_cache.store.close()
+
+        # Another worker, with nothing in memory yet
+        cache = TranscriptCache(store=TranscriptStore(path))
+        monkeypatch.setattr(transcript_service, 'transcript_cache', cache)
+        from_disk = [
+            asyncio.run(server.get_youtube_transcript('dQw4w9WgXcQ', **request)) for request in requests
+        ]
+        cache.store.close()
+
+    assert from_disk == from_memory
+    assert '[0:01:00] segment 30 of the stub transcript' in from_disk[0]
+    assert json.loads(from_disk[1])['ranges'] == [[0, 1], [30, 32]]
+    assert api.listings == 1
+    assert (cache.stats()['disk_hits'], cache.stats()['entries']) == (4, 0)
+
+def test_search_tool_links_to_matching_moment(use_fakes):
+    """search_transcripts finds fetched videos and links to the hit's start time."""
+    use_fakes([StubTranscript('en', segments=make_segments(50))])
+    asyncio.run(server.get_youtube_transcript('dQw4w9WgXcQ'))
+
+    result = asyncio.run(server.search_transcripts('segment 42', limit=1))
+    assert result.startswith("Search results for 'segment 42' (1 hits):")
+    assert 'Video ID: dQw4w9WgXcQ (en)' in result
+    assert 'https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=' in result
+    assert "No fetched transcripts match" in asyncio.run(server.search_transcripts('zebra'))
+
+def test_token_budget_reports_truncation(use_fakes):
+    """max_tokens cuts at whole segments and points the head at the next offset."""
+    use_fakes([StubTranscript('en', segments=make_segments(500))])
+    result = asyncio.run(server.get_youtube_transcript('dQw4w9WgXcQ', max_tokens=120))
+    assert '[Truncated (head) to' in result
+    assert 'next offset: 10]' in result
+    assert 'segment 9 of' in result and 'segment 10 of' not in result
+
+    result = asyncio.run(server.get_youtube_transcript('dQw4w9WgXcQ', limit=2, max_chars=10000))
+    assert '[Not truncated:' in result
+    assert 'truncate must be one of' in asyncio.run(
+        server.get_youtube_transcript('dQw4w9WgXcQ', max_tokens=10, truncate='middle')
+    )
+
+def test_budget_too_small_for_a_segment(use_fakes):
+    """A budget that fits nothing is an error, not a page pointing back at itself."""
+    use_fakes([StubTranscript('en', segments=make_segments(10))])
+    result = asyncio.run(server.get_youtube_transcript('dQw4w9WgXcQ', max_tokens=0))
+    assert result == "Error: A budget of 0 estimated tokens is too small for a single segment."
+    assert 'next offset' not in result
+    response = json.loads(asyncio.run(server.get_youtube_transcript(
+        'dQw4w9WgXcQ', offset=5, max_chars=5, output_format='json'
+    )))
+    assert 'too small for a single segment' in response['error']
+    assert 'next_offset' not in response
+
+    # Fewer sample windows rather than none
+    result = asyncio.run(server.get_youtube_transcript('dQw4w9WgXcQ', max_tokens=40, truncate='sample'))
+    assert '[Truncated (sample)' in result and 'segment 0 of' in result
+
+def test_translated_transcript_header(use_fakes):
+    """A translated transcript's type names its source language instead of "Manual"."""
+    use_fakes([StubTranscript('en', translation_languages=['fr'])])
+    result = asyncio.run(server.get_youtube_transcript('dQw4w9WgXcQ', language='fr'))
+    assert '\nType: Translated from en (manual source)\n' in result
+    assert 'Type: Manual' not in result
+    assert '[fr] ' in result
+    original = asyncio.run(server.get_youtube_transcript('dQw4w9WgXcQ'))
+    assert '\nType: Manual\n' in original and 'Translated from' not in original
+
+def test_structured_output(use_fakes):
+    """json and segments return the same page as objects or compact rows."""
+    use_fakes([StubTranscript('en', segments=make_segments(5))])
+
+    as_json = json.loads(asyncio.run(server.get_youtube_transcript(
+        'dQw4w9WgXcQ', offset=1, limit=2, output_format='json'
+    )))
+    assert as_json['language_code'] == 'en' and as_json['translated_from'] is None
+    assert (as_json['total_segments'], as_json['next_offset']) == (5, 3)
+    assert as_json['segments'][0] == {
+        'start': 2.0, 'duration': 2.0, 'text': 'segment 1 of the stub transcript'
+    }
+
+    compact = asyncio.run(server.get_youtube_transcript(
+        'dQw4w9WgXcQ', offset=1, limit=2, output_format='segments'
+    ))
+    rows = json.loads(compact)
+    assert rows['fields'] == ['start', 'duration', 'text']
+    assert rows['segments'] == [[s['start'], s['duration'], s['text']] for s in as_json['segments']]
+    assert len(compact) < len(json.dumps(as_json, separators=(',', ':')))
+
+    error = json.loads(asyncio.run(server.get_youtube_transcript('nope', output_format='json')))
+    assert error == {'error': 'Invalid YouTube URL or video ID provided.', 'video_url': 'nope'}
+    assert asyncio.run(server.get_youtube_transcript('dQw4w9WgXcQ', output_format='xml')).startswith('Error:')
+
+def test_structured_batch_and_listing(use_fakes):
+    """The batch and listing tools return JSON objects in the structured formats."""
+    use_fakes([StubTranscript('en', translation_languages=['de'])])
+
+    batch = json.loads(asyncio.run(server.get_youtube_transcripts(
+        ['dQw4w9WgXcQ', 'not a url'], output_format='segments'
+    )))
+    assert (batch['fetched'], batch['total']) == (1, 2)
+    assert [r['input'] for r in batch['results']] == ['dQw4w9WgXcQ', 'not a url']
+    assert batch['results'][0]['video_id'] == 'dQw4w9WgXcQ'
+    assert 'error' in batch['results'][1]
+
+    listing = json.loads(asyncio.run(server.list_available_transcripts(
+        'dQw4w9WgXcQ', output_format='json'
+    )))
+    assert listing['tracks'] == [{
+        'language': 'EN', 'language_code': 'en', 'is_generated': False,
+        'translation_languages': ['de'],
+    }]
+
+def test_stdlib_encoder_fallback(monkeypatch):
+    """Without orjson the standard library produces the same compact JSON."""
+    value = {'text': 'caf\u00e9', 'rows': [[1.5, 2.0, 'a']]}
+    fast = transcript_json.dumps(value)
+    monkeypatch.setattr(transcript_json, 'orjson', None)
+    assert transcript_json.dumps(value) == fast == '{"text":"caf\u00e9","rows":[[1.5,2.0,"a"]]}'
+
+def test_auth_server_shares_the_tools(monkeypatch, use_fakes):
+    """server_with_auth serves tools.py's tools, with H:MM:SS timestamps past an hour."""
+    from starlette.testclient import TestClient
+
+    import server_with_auth
+    from tools import TOOLS
+
+    use_fakes([StubTranscript('en', segments=make_segments(2300))])
+    monkeypatch.setattr(server_with_auth, 'auth_enabled', False)
+    app = server_with_auth.create_server().http_app(path='/mcp', stateless_http=True, json_response=True)
+    headers = {'Accept': 'application/json, text/event-stream'}
+    with TestClient(app) as client:
+        tools = client.post('/mcp', headers=headers, json={
+            'jsonrpc': '2.0', 'id': 1, 'method': 'tools/list'
+        }).json()['result']['tools']
+        result = client.post('/mcp', headers=headers, json={
+            'jsonrpc': '2.0', 'id': 2, 'method': 'tools/call', 'params': {
+                'name': 'get_youtube_transcript',
+                'arguments': {'video_url': 'dQw4w9WgXcQ', 'start_seconds': 4512, 'end_seconds': 4514},
+            },
+        }).json()['result']
+    assert [tool['name'] for tool in tools] == list(TOOLS)
+    assert '[1:15:12] segment 2256 of the stub transcript' in result['content'][0]['text']
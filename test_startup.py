@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Test that the server entry points defer heavy imports until they are needed.
+"""
+
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+HEAVY = ('fastmcp', 'youtube_transcript_api', 'transcript_service', 'oauth_provider')
+
+def _loaded_after(code, **env):
+    """Run code in a fresh interpreter; return which HEAVY modules it loaded."""
+    script = f"import sys\n{code}\nprint(','.join(m for m in {HEAVY!r} if m in sys.modules))"
+    result = subprocess.run(
+        [sys.executable, '-c', script], cwd=ROOT, capture_output=True, text=True, check=True,
+        env=dict(os.environ, **env),
+    )
+    return set(filter(None, result.stdout.strip().split(',')))
+
+def test_auth_server_import_is_light():
+    """Importing server_with_auth loads none of the heavy dependencies."""
+    assert _loaded_after("import server_with_auth") == set()
+
+def test_auth_server_builds_without_oauth_stack():
+    """Without OAUTH_CLIENT_ID the server is built with the shared tools but no OAuth provider."""
+    loaded = _loaded_after(
+        "import server_with_auth\nserver_with_auth.mcp", OAUTH_CLIENT_ID=''
+    )
+    assert {'fastmcp', 'transcript_service'} <= loaded
+    assert 'oauth_provider' not in loaded
+
+def test_jsonrpc_endpoint_import_is_light():
+    """The serverless dispatcher loads the tools only on the first call that needs them."""
+    assert _loaded_after("import mcp_jsonrpc") == set()
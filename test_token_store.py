@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Test the OAuth token store and its in-memory validation cache.
+"""
+
+import base64
+import hashlib
+import secrets
+import urllib.parse
+
+from token_store import SQLiteTokenBackend, TokenCache, TokenInfo
+
+class CountingBackend(SQLiteTokenBackend):
+    """In-memory SQLite backend that counts token lookups."""
+
+    def __init__(self):
+        super().__init__(':memory:')
+        self.lookups = 0
+
+    def get_token(self, token):
+        self.lookups += 1
+        return super().get_token(token)
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+def test_valid_tokens_are_served_from_memory():
+    """After the first lookup a valid token never reaches the backend."""
+    backend = CountingBackend()
+    cache = TokenCache(backend, clock=FakeClock())
+    cache.save('tok', TokenInfo('client', ['transcript:read'], 5000))
+
+    for _ in range(3):
+        assert cache.get('tok') == TokenInfo('client', ['transcript:read'], 5000)
+    assert backend.lookups == 1
+    assert cache.stats()['hits'] == 2
+
+def test_expiry_and_ttl_are_respected():
+    """Tokens stop validating at expires_at, and are rechecked after ttl."""
+    backend = CountingBackend()
+    clock = FakeClock()
+    cache = TokenCache(backend, ttl=60, clock=clock)
+    cache.save('short', TokenInfo('client', [], 1010))
+    cache.save('long', TokenInfo('client', [], 9000))
+    assert cache.get('short') and cache.get('long')
+
+    clock.now = 1011
+    assert cache.get('short') is None
+    assert cache.get('long') is not None
+    assert backend.lookups == 2
+
+    clock.now = 1061
+    assert cache.get('long') is not None
+    assert backend.lookups == 3
+
+def test_unknown_tokens_are_negatively_cached():
+    """Repeated bad tokens cost one backend lookup per negative_ttl."""
+    backend = CountingBackend()
+    clock = FakeClock()
+    cache = TokenCache(backend, negative_ttl=30, clock=clock)
+    for _ in range(5):
+        assert cache.get('bogus') is None
+    assert backend.lookups == 1
+    assert cache.stats()['negative_hits'] == 4
+
+    # Issuing the token makes it valid at once
+    cache.save('bogus', TokenInfo('client', [], 9000))
+    assert cache.get('bogus') is not None
+
+def test_revoked_tokens_are_evicted():
+    """delete_token removes a cached token immediately."""
+    backend = CountingBackend()
+    cache = TokenCache(backend, clock=FakeClock())
+    cache.save('tok', TokenInfo('client', [], 9000))
+    assert cache.get('tok') is not None
+    cache.revoke('tok')
+    assert cache.get('tok') is None
+    assert backend.get_token('tok') is None
+
+def test_lru_bound():
+    """Least recently used tokens are evicted once the cache is full."""
+    cache = TokenCache(CountingBackend(), max_entries=2, clock=FakeClock())
+    for token in ('a', 'b', 'c'):
+        cache.save(token, TokenInfo('client', [], 9000))
+        cache.get(token)
+    stats = cache.stats()
+    assert stats['valid_entries'] == 2
+    assert stats['evictions'] == 1
+
+def test_store_persists_hashed_tokens(tmp_path):
+    """Tokens and authorizations survive a restart; raw tokens aren't written."""
+    path = str(tmp_path / 'oauth.db')
+    backend = SQLiteTokenBackend(path)
+    backend.save_token('secret-token', TokenInfo('client', ['a', 'b'], 9000))
+    backend.save_authorization('auth-1', {'client_id': 'client', 'scopes': ['a']})
+    backend.close()
+
+    reopened = SQLiteTokenBackend(path)
+    assert reopened.get_token('secret-token') == TokenInfo('client', ['a', 'b'], 9000)
+    assert reopened.get_authorization('auth-1') == {'client_id': 'client', 'scopes': ['a']}
+    assert reopened.purge_expired(now=9001) == 1
+    reopened.close()
+    with open(path, 'rb') as f:
+        assert b'secret-token' not in f.read()
+
+def test_provider_purges_expired_records():
+    """Authorizing deletes expired tokens and abandoned codes, at most once per interval."""
+    import asyncio
+
+    from mcp.server.auth.provider import AuthorizationParams
+    from oauth_provider import SimpleOAuthProvider
+
+    backend = SQLiteTokenBackend(':memory:')
+    provider = SimpleOAuthProvider(
+        'http://localhost:8000', 'client', 'secret', ['http://localhost:9000/callback'],
+        tokens=TokenCache(backend), purge_interval=3600,
+    )
+    params = AuthorizationParams(
+        state=None, scopes=None, code_challenge='x' * 43,
+        redirect_uri='http://localhost:9000/callback', redirect_uri_provided_explicitly=True,
+    )
+
+    def add_expired(name):
+        backend.save_token(name, TokenInfo('client', [], 1))
+        backend.save_authorization(name, {'client_id': 'client', 'expires_at': 1})
+
+    add_expired('old')
+    asyncio.run(provider.authorize(provider.client, params))
+    assert backend.get_token('old') is None and backend.get_authorization('old') is None
+
+    # Within the interval nothing is purged again
+    add_expired('older')
+    asyncio.run(provider.authorize(provider.client, params))
+    assert backend.get_authorization('older') is not None
+    assert backend.purge_expired() == 2
+    backend.close()
+
+def test_server_checks_tokens_through_the_provider(monkeypatch):
+    """With OAUTH_CLIENT_ID set, the server issues tokens and checks them on /mcp."""
+    from starlette.testclient import TestClient
+
+    import server_with_auth
+
+    redirect_uri = 'http://localhost:9000/callback'
+    monkeypatch.setenv('OAUTH_CLIENT_ID', 'client')
+    monkeypatch.setenv('OAUTH_CLIENT_SECRET', 'secret')
+    monkeypatch.setenv('OAUTH_ISSUER_URL', 'http://localhost:8000')
+    monkeypatch.setenv('OAUTH_REDIRECT_URIS', redirect_uri)
+    monkeypatch.setenv('OAUTH_TOKEN_DB', '')
+    monkeypatch.setattr(server_with_auth, 'auth_enabled', True)
+    mcp = server_with_auth.create_server()
+
+    verifier = secrets.token_urlsafe(48)
+    challenge = base64.urlsafe_b64encode(
+        hashlib.sha256(verifier.encode()).digest()
+    ).rstrip(b'=').decode()
+    initialize = {'jsonrpc': '2.0', 'id': 1, 'method': 'initialize', 'params': {
+        'protocolVersion': '2025-06-18', 'capabilities': {},
+        'clientInfo': {'name': 'test', 'version': '1'}}}
+    accept = {'Accept': 'application/json, text/event-stream'}
+
+    with TestClient(mcp.http_app(), base_url='http://localhost:8000') as client:
+        response = client.get('/authorize', follow_redirects=False, params={
+            'response_type': 'code', 'client_id': 'client', 'redirect_uri': redirect_uri,
+            'code_challenge': challenge, 'code_challenge_method': 'S256', 'state': 'xyz',
+        })
+        assert response.status_code == 302
+        query = urllib.parse.parse_qs(urllib.parse.urlparse(response.headers['location']).query)
+        assert query['state'] == ['xyz']
+
+        exchange = {
+            'grant_type': 'authorization_code', 'code': query['code'][0],
+            'redirect_uri': redirect_uri, 'client_id': 'client', 'client_secret': 'secret',
+            'code_verifier': verifier,
+        }
+        response = client.post('/token', data=exchange)
+        assert response.status_code == 200
+        token = response.json()['access_token']
+        assert response.json()['scope'] == 'transcript:read'
+        # Codes are single-use
+        assert client.post('/token', data=exchange).json()['error'] == 'invalid_grant'
+
+        def call(token=None):
+            headers = dict(accept, Authorization=f'Bearer {token}') if token else accept
+            return client.post('/mcp', json=initialize, headers=headers).status_code
+
+        assert call() == 401
+        assert call('bogus') == 401
+        assert call(token) == 200
+        assert call(token) == 200
+        # The second request was answered from the token cache
+        assert mcp.auth.tokens.stats()['hits'] >= 1
+
+        response = client.post('/revoke', data={
+            'token': token, 'client_id': 'client', 'client_secret': 'secret',
+        })
+        assert response.status_code == 200
+        assert call(token) == 401
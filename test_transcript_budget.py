@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Test fitting transcript output into token and character budgets.
+"""
+
+from transcript_budget import estimate_tokens, fit_budget
+from transcript_render import render_segments
+from transcript_segments import SegmentTable
+from upstream_stub import make_segments
+
+TABLE = SegmentTable.from_entries(make_segments(100))
+
+def test_token_prefix_matches_estimator():
+    """Prefix sums equal per-segment estimates of each text plus its newline."""
+    prefix = TABLE.token_prefix()
+    assert len(prefix) == len(TABLE) + 1
+    assert prefix[5] - prefix[4] == estimate_tokens(TABLE.text(4) + '\n')
+    assert TABLE.token_prefix() is prefix
+
+def test_char_budget_is_exact():
+    """A character budget never lets rendered output exceed it."""
+    for budget in (0, 50, 333, 1000):
+        fit = fit_budget(TABLE, [(0, len(TABLE))], budget, 'chars', True, 'head')
+        (start, stop), = fit.ranges or [(0, 0)]
+        assert len(render_segments(TABLE, True, start, stop)) <= budget
+        # One more segment would not have fit
+        assert len(render_segments(TABLE, True, start, stop + 1)) > budget
+
+def test_strategies_pick_whole_segments():
+    fit = fit_budget(TABLE, [(10, 90)], 100, 'tokens', False, 'tail')
+    assert fit.truncated and fit.ranges[0][1] == 90
+    assert fit.used <= 100 < fit.total
+
+    fit = fit_budget(TABLE, [(0, 100)], 200, 'tokens', True, 'sample')
+    assert [start for start, _ in fit.ranges] == [0, 25, 50, 75]
+    assert all(stop > start for start, stop in fit.ranges)
+    assert fit.used <= 200
+
+    # Too little for a segment in each of four windows: fewer windows, not none
+    fit = fit_budget(TABLE, [(0, 100)], 40, 'tokens', True, 'sample')
+    assert fit.ranges == [(0, 1), (33, 34), (66, 67)] and fit.used <= 40
+    assert fit_budget(TABLE, [(0, 100)], 14, 'tokens', True, 'sample').ranges == [(0, 1)]
+
+    fit = fit_budget(TABLE, [(0, 100)], 10 ** 6, 'tokens', True, 'head')
+    assert not fit.truncated and fit.ranges == [(0, 100)] and fit.used == fit.total
+
+def test_budget_spans_several_ranges():
+    """Split ranges are read as one sequence, and kept split in the result."""
+    fit = fit_budget(TABLE, [(3, 4), (40, 60)], 10 ** 6, 'tokens', True, 'head')
+    assert not fit.truncated and fit.ranges == [(3, 4), (40, 60)]
+    assert fit.windows == [[(3, 4), (40, 60)]]
+
+    whole = fit_budget(TABLE, [(3, 4), (40, 60)], 10 ** 6, 'chars', True, 'head').used
+    fit = fit_budget(TABLE, [(3, 4), (40, 60)], whole - 1, 'chars', True, 'head')
+    assert fit.truncated and fit.ranges == [(3, 4), (40, 59)]
+
+    fit = fit_budget(TABLE, [(3, 4), (40, 60)], 100, 'tokens', False, 'tail')
+    assert fit.ranges[-1][1] == 60 and fit.used <= 100
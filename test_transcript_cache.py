@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Test the transcript cache and cached fetching without touching YouTube.
+"""
+
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from youtube_transcript_api._errors import TranscriptsDisabled
+
+import transcript_service
+from transcript_cache import (
+    CachedTranscript,
+    TranscriptCache,
+    TranscriptStore
+)
+from upstream_stub import StubTranscript
+
+SEGMENTS = [
+    {'text': 'Hello', 'start': 0.0, 'duration': 1.5},
+    {'text': 'world', 'start': 1.5, 'duration': 2.0},
+]
+
+def test_lru_eviction_and_counters():
+    """Least recently used entries are evicted once the cache is full."""
+    cache = TranscriptCache(max_entries=2)
+    for video_id in ('aaaaaaaaaaa', 'bbbbbbbbbbb'):
+        cache.put(CachedTranscript(video_id, 'English', 'en', False, SEGMENTS))
+    assert cache.get('aaaaaaaaaaa', 'en', False) is not None
+    cache.put(CachedTranscript('ccccccccccc', 'English', 'en', False, SEGMENTS))
+
+    assert cache.get('bbbbbbbbbbb', 'en', False) is None
+    stats = cache.stats()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 1
+    assert stats['evictions'] == 1
+    assert stats['entries'] == 2
+
+def test_ttl_expiry():
+    """Entries older than the TTL are treated as misses."""
+    cache = TranscriptCache(ttl=60)
+    old = CachedTranscript('aaaaaaaaaaa', 'English', 'en', False, SEGMENTS,
+                           fetched_at=time.time() - 120)
+    cache.put(old)
+    assert cache.get('aaaaaaaaaaa', 'en', False) is None
+    assert cache.stats()['expirations'] == 1
+    # Looking the same expired entry up again doesn't count it again
+    assert cache.get('aaaaaaaaaaa', 'en', False) is None
+    assert cache.stats()['expirations'] == 1
+
+    # A replacement that expires in turn is a new expiration
+    cache.put(CachedTranscript('aaaaaaaaaaa', 'English', 'en', False, SEGMENTS,
+                               fetched_at=time.time() - 90))
+    assert cache.get('aaaaaaaaaaa', 'en', False) is None
+    assert cache.stats()['expirations'] == 2
+
+def test_disk_store_survives_restart():
+    """A new cache over the same SQLite file sees entries written by another."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'transcripts.db')
+        TranscriptCache(store=TranscriptStore(path)).put(
+            CachedTranscript('aaaaaaaaaaa', 'English', 'en', True, SEGMENTS)
+        )
+
+        cache = TranscriptCache(store=TranscriptStore(path))
+        entry = cache.get('aaaaaaaaaaa', 'en', True)
+        assert entry is not None
+        assert entry.segments.to_dicts() == SEGMENTS
+        assert entry.is_generated is True
+        assert cache.stats()['disk_hits'] == 1
+
+def test_cache_hit_skips_network(use_fakes):
+    """Repeat requests, with or without timestamps, are served without listing."""
+    track = StubTranscript('en')
+    api = use_fakes([track])
+
+    first = transcript_service.fetch_transcript('dQw4w9WgXcQ')
+    transcript_service.metadata_cache.clear()
+    second = transcript_service.fetch_transcript('dQw4w9WgXcQ', 'en')
+    assert first is second
+    assert api.listings == 1
+    assert track.fetches == 1
+
+def test_metadata_counts_one_lookup_per_request(use_fakes):
+    """A cold request counts one listing miss; a transcript hit counts no listing lookup."""
+    api = use_fakes([StubTranscript('en')])
+
+    transcript_service.fetch_transcript('dQw4w9WgXcQ')
+    stats = transcript_service.metadata_cache.stats()
+    assert (stats['hits'], stats['misses'], api.listings) == (0, 1, 1)
+
+    # Listing expired, transcript still cached: nothing is listed, so no miss
+    transcript_service.metadata_cache.clear()
+    transcript_service.fetch_transcript('dQw4w9WgXcQ')
+    stats = transcript_service.metadata_cache.stats()
+    assert (stats['hits'], stats['misses'], api.listings) == (0, 1, 1)
+
+def test_fallback_track_hits_after_listing(use_fakes):
+    """A non-English fallback needs a listing but not a second fetch."""
+    track = StubTranscript('de', is_generated=True)
+    api = use_fakes([track])
+
+    transcript_service.fetch_transcript('dQw4w9WgXcQ')
+    transcript_service.metadata_cache.clear()
+    entry = transcript_service.fetch_transcript('dQw4w9WgXcQ')
+    assert entry.language_code == 'de'
+    assert api.listings == 2
+    assert track.fetches == 1
+
+def test_listing_shared_with_fetch(use_fakes):
+    """Listing tracks and then fetching one costs a single upstream listing."""
+    manual, generated = StubTranscript('en'), StubTranscript('es', is_generated=True)
+    api = use_fakes([manual, generated])
+
+    tracks = transcript_service.get_listing('dQw4w9WgXcQ').tracks
+    assert [(t.language_code, t.is_generated) for t in tracks] == [('en', False), ('es', True)]
+    entry = transcript_service.fetch_transcript('dQw4w9WgXcQ', 'fr')
+    assert entry.language_code == 'en'
+    # The unavailable language resolves from the memo without probing again
+    assert transcript_service.fetch_transcript('dQw4w9WgXcQ', 'fr') is entry
+    assert api.listings == 1
+
+def test_translation_is_fetched_and_cached(use_fakes):
+    """A missing language is translated from English and cached under its own key."""
+    english = StubTranscript('en', translation_languages=['es', 'fr'])
+    api = use_fakes([english])
+
+    entry = transcript_service.fetch_transcript('dQw4w9WgXcQ', 'es')
+    assert (entry.language_code, entry.translated_from) == ('es', 'en')
+    assert entry.segments.to_dicts()[0]['text'].startswith('[es] ')
+    # The untranslated default is a separate entry
+    assert transcript_service.fetch_transcript('dQw4w9WgXcQ').translated_from == ''
+
+    # Even once the listing has expired, the translation is served from the cache
+    transcript_service.metadata_cache.clear()
+    assert transcript_service.fetch_transcript('dQw4w9WgXcQ', 'es') is entry
+    assert api.listings == 1
+    assert english.translations['es'].fetches == 1
+    assert transcript_service.transcript_index.stats()['documents'] == 1
+
+def test_native_track_beats_translation(use_fakes):
+    """A track in the requested language is preferred to translating another one."""
+    english = StubTranscript('en', translation_languages=['de'])
+    german = StubTranscript('de', is_generated=True)
+    use_fakes([english, german])
+
+    entry = transcript_service.fetch_transcript('dQw4w9WgXcQ', 'de')
+    assert (entry.language_code, entry.is_generated, entry.translated_from) == ('de', True, '')
+    assert english.translations == {}
+
+def test_store_keeps_translations_apart():
+    """A translation and an original in the same language don't overwrite each other."""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = TranscriptStore(os.path.join(tmp, 'cache.db'))
+        store.put(CachedTranscript('dQw4w9WgXcQ', 'Spanish', 'es', False, SEGMENTS))
+        store.put(CachedTranscript(
+            'dQw4w9WgXcQ', 'Spanish', 'es', False, SEGMENTS[:1], translated_from='en'
+        ))
+        original = store.get(('dQw4w9WgXcQ', 'es', False), max_age=60)
+        translated = store.get(('dQw4w9WgXcQ', 'es', False, 'en'), max_age=60)
+        assert (len(original.segments), original.translated_from) == (2, '')
+        assert (len(translated.segments), translated.translated_from) == (1, 'en')
+        store.close()
+
+def test_negative_results_are_cached(use_fakes):
+    """TranscriptsDisabled is re-raised from the cache instead of listing again."""
+    api = use_fakes(error=TranscriptsDisabled('dQw4w9WgXcQ'))
+
+    for _ in range(3):
+        with pytest.raises(TranscriptsDisabled):
+            transcript_service.fetch_transcript('dQw4w9WgXcQ')
+    assert api.listings == 1
+    assert transcript_service.metadata_cache.stats()['negative_hits'] == 2
+
+def test_concurrent_misses_are_coalesced(use_fakes):
+    """Simultaneous requests for one video share a single listing and fetch."""
+    track = StubTranscript('en', latency=0.1)
+    api = use_fakes([track])
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        entries = list(pool.map(
+            lambda _: transcript_service.fetch_transcript('dQw4w9WgXcQ'), range(8)
+        ))
+
+    assert all(entry is entries[0] for entry in entries)
+    assert api.listings == 1
+    assert track.fetches == 1
+    # One transcript fetch and one listing; every other caller waited on them
+    # or arrived late enough to hit the cache
+    stats = transcript_service.inflight.stats()
+    assert stats['upstream_calls'] == 2
+    assert stats['coalesced'] > 0
+
+def test_requests_resolving_to_one_track_share_a_fetch(use_fakes):
+    """Different requested languages that resolve to the same track fetch it once."""
+    track = StubTranscript('en', latency=0.1)
+    api = use_fakes([track])
+
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        entries = list(pool.map(
+            lambda language: transcript_service.fetch_transcript('dQw4w9WgXcQ', language),
+            [None, 'en', 'fr'] * 2,
+        ))
+
+    assert all(entry.key == ('dQw4w9WgXcQ', 'en', False, '') for entry in entries)
+    assert api.listings == 1
+    assert track.fetches == 1
+
+def test_time_window_lookup():
+    """window() returns the segments overlapping a time range, including long captions."""
+    segments = [
+        {'text': 'a', 'start': 0.0, 'duration': 2.0},
+        {'text': 'b', 'start': 2.0, 'duration': 10.0},
+        {'text': 'c', 'start': 4.0, 'duration': 2.0},
+        {'text': 'd', 'start': 6.0, 'duration': 2.0},
+        {'text': 'e', 'start': 8.0, 'duration': 2.0},
+    ]
+    entry = CachedTranscript('aaaaaaaaaaa', 'English', 'en', False, segments)
+
+    assert entry.window(5.0, 8.0) == [(1, 4)]
+    assert entry.window(0.0, 1.0) == [(0, 1)]
+    # c and d end before 9s; only the long caption b still runs into the window
+    assert entry.window(9.0) == [(1, 2), (4, 5)]
+    assert entry.window(20.0, 30.0) == []
+
+def test_window_skips_past_a_long_caption():
+    """One long caption doesn't make a lookup walk every segment after it."""
+    entries = [{'text': 'intro', 'start': 0.0, 'duration': 10000.0}]
+    entries += [{'text': str(i), 'start': 1.0 + i, 'duration': 1.0} for i in range(5000)]
+    table = CachedTranscript('aaaaaaaaaaa', 'English', 'en', False, entries).segments
+
+    assert table.window(4000.5, 4002.0) == [(0, 1), (4000, 4002)]
+    assert table.window(9999.0) == [(0, 1)]
+    assert table.window(10000.0) == []
+    # Brute force over the same table
+    for start, end in ((0.0, 3.0), (2500.2, 2503.0), (4999.0, None)):
+        expected = [
+            index for index, (begin, duration, _) in enumerate(table)
+            if begin + duration > start and (end is None or begin < end)
+        ]
+        found = [index for lo, hi in table.window(start, end) for index in range(lo, hi)]
+        assert found == expected
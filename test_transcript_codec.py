@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Test the block-compressed transcript segment encoding.
+"""
+
+import os
+import random
+import tempfile
+import time
+
+import pytest
+
+import transcript_cache
+from transcript_cache import CachedTranscript, TranscriptStore
+from transcript_codec import (
+    FORMAT_VERSION,
+    SegmentFormatError,
+    SegmentReader,
+    decode_segments,
+    encode_segments,
+    open_file,
+    write_file
+)
+from transcript_segments import SegmentTable
+
+def _table(count, seed=0):
+    """Millisecond times with overlapping durations and some multi-line texts."""
+    rng = random.Random(seed)
+    starts = [round(i * 2.5 + rng.random(), 3) for i in range(count)]
+    durations = [round(rng.uniform(0.5, 12.0), 3) for _ in range(count)]
+    texts = [f"line {i}\nsecond ünïcode line" if i % 50 == 0 else f"segment {i}" for i in range(count)]
+    return SegmentTable.from_columns(starts, durations, texts)
+
+def test_round_trip():
+    """Millisecond times and texts, newlines included, come back unchanged."""
+    table = _table(1000)
+    data = encode_segments(table, 'zlib', block_segments=64)
+    assert decode_segments(data).to_dicts() == table.to_dicts()
+
+    empty = SegmentTable.from_columns([], [], [])
+    assert decode_segments(encode_segments(empty)).to_dicts() == []
+
+def test_window_reads_only_needed_blocks():
+    """Windows match SegmentTable.window and decompress only the blocks they cover."""
+    table = _table(1000)
+    data = encode_segments(table, 'zlib', block_segments=64)
+    for start, end in ((0, 10), (100.5, 400), (2400, None), (-5, 0.5), (9999, None)):
+        reader = SegmentReader(data)
+        ranges, window = reader.window(start, end)
+        assert ranges == table.window(start, end)
+        assert window.to_dicts() == table.select(ranges).to_dicts()
+        # Overlapping durations can pull in one extra block on either side
+        selected = sum(hi - lo for lo, hi in ranges)
+        assert reader.blocks_read <= -(-selected // 64) + 2
+
+def test_window_skips_blocks_a_long_caption_spans():
+    """Blocks between a long caption and the window it reaches are not decompressed."""
+    table = SegmentTable.from_columns(
+        [0.0] + [1.0 + i for i in range(1000)],
+        [5000.0] + [1.0] * 1000,
+        ['intro'] + [f"segment {i}" for i in range(1000)],
+    )
+    reader = SegmentReader(encode_segments(table, 'zlib', block_segments=64))
+    ranges, window = reader.window(900.5, 902.0)
+    assert ranges == [(0, 1), (900, 902)] == table.window(900.5, 902.0)
+    assert [text for _, _, text in window] == ['intro', 'segment 899', 'segment 900']
+    assert reader.blocks_read == 2
+
+def test_rejects_other_data():
+    """Foreign data, newer versions and truncated indexes raise SegmentFormatError."""
+    data = encode_segments(_table(100), 'zlib')
+    with pytest.raises(SegmentFormatError):
+        SegmentReader(b'{"start": []}' + bytes(16))
+    with pytest.raises(SegmentFormatError):
+        SegmentReader(data[:4] + bytes([FORMAT_VERSION + 1]) + data[5:])
+    with pytest.raises(SegmentFormatError):
+        SegmentReader(data[:20])
+    with pytest.raises(SegmentFormatError):
+        encode_segments(_table(1), 'lz4')
+
+def test_mmap_file():
+    """Files are read through mmap, window by window."""
+    table = _table(1000)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'transcript.seg')
+        size = write_file(path, table, 'zlib')
+        assert size == os.path.getsize(path)
+        with open_file(path) as reader:
+            ranges, window = reader.window(1000, 1100)
+            assert window.to_dicts() == table.select(ranges).to_dicts()
+            assert len(reader) == 1000
+
+@pytest.mark.parametrize('blobopen', [
+    pytest.param(True, marks=pytest.mark.skipif(not transcript_cache._BLOBOPEN, reason="needs Python 3.11+")),
+    False,
+])
+def test_store_reads_windows_from_blob(monkeypatch, blobopen):
+    """The store keeps the encoding and reads windows from the blob, without blobopen too."""
+    monkeypatch.setattr(transcript_cache, '_BLOBOPEN', blobopen)
+    table = _table(2000)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = TranscriptStore(os.path.join(tmp, 'cache.db'))
+        store.put(CachedTranscript('dQw4w9WgXcQ', 'English', 'en', False, table, time.time()))
+        key = ('dQw4w9WgXcQ', 'en', False, '')
+        assert store.get(key, 60).segments.to_dicts() == table.to_dicts()
+
+        window = store.get_window(key, 60, 300, 360)
+        assert (window.language, window.language_code) == ('English', 'en')
+        assert window.ranges == table.window(300, 360)
+        assert window.segments.to_dicts() == table.select(window.ranges).to_dicts()
+        assert store.get_window(('aaaaaaaaaaa', 'en', False, ''), 60) is None
+        store.close()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Test transcript rendering and the rendered-variant cache.
+"""
+
+from array import array
+
+import transcript_render
+from transcript_cache import CachedTranscript
+from transcript_render import RenderCache, format_timestamp, render_transcript
+from upstream_stub import make_segments
+
+def test_hour_long_videos_use_hours():
+    """Timestamps switch to H:MM:SS once a video reaches an hour."""
+    assert format_timestamp(75) == '[01:15]'
+    assert format_timestamp(4512, hours=True) == '[1:15:12]'
+
+    entry = CachedTranscript('aaaaaaaaaaa', 'English', 'en', False,
+                             make_segments(3, seconds_per_segment=2256))
+    lines = render_transcript(entry).splitlines()
+    assert lines[0] == '[0:00:00] segment 0 of the stub transcript'
+    assert lines[2] == '[1:15:12] segment 2 of the stub transcript'
+
+def test_negative_starts_render_as_zero():
+    """A caption starting just before zero is stamped [00:00], not from the end of the hour."""
+    entry = CachedTranscript('aaaaaaaaaaa', 'English', 'en', False, [
+        {'text': 'early', 'start': -1.5, 'duration': 2.0},
+        {'text': 'late', 'start': 3.0, 'duration': 2.0},
+    ])
+    assert transcript_render.render_segments(entry.segments) == '[00:00] early\n[00:03] late'
+    rendered = transcript_render.RenderedTranscript.render(entry.segments)
+    assert rendered.lines(0, 2) == '[00:00] early\n[00:03] late'
+
+def test_rendered_size_counts_wide_characters():
+    """nbytes reflects the str's real size, which grows with the widest character."""
+    ascii_text = transcript_render.RenderedTranscript('a' * 1000, array('I', [0, 1001]))
+    wide_text = transcript_render.RenderedTranscript('\u4e2d' * 1000, array('I', [0, 1001]))
+    assert wide_text.nbytes() >= ascii_text.nbytes() + 1000
+
+def test_pages_slice_the_cached_variant(monkeypatch):
+    """Once fully rendered, every page is served from the cached variant."""
+    cache = RenderCache()
+    monkeypatch.setattr(transcript_render, 'render_cache', cache)
+    entry = CachedTranscript('aaaaaaaaaaa', 'English', 'en', False, make_segments(50))
+
+    page_before = render_transcript(entry, True, 10, 20)
+    full = render_transcript(entry)
+    page_after = render_transcript(entry, True, 10, 20)
+
+    assert page_before == page_after == '\n'.join(full.splitlines()[10:20])
+    assert render_transcript(entry, False, 0, 2) == (
+        'segment 0 of the stub transcript\nsegment 1 of the stub transcript'
+    )
+    stats = cache.stats()
+    assert stats['entries'] == 1
+    assert stats['hits'] == 1
+    assert stats['memory_bytes'] >= len(full)
+
+def test_render_cache_respects_byte_budget():
+    """Variants beyond the byte budget evict the least recently used ones."""
+    cache = RenderCache(max_bytes=3000)
+    for video_id in ('aaaaaaaaaaa', 'bbbbbbbbbbb'):
+        entry = CachedTranscript(video_id, 'English', 'en', False, make_segments(40))
+        cache.put(entry.key, transcript_render.RenderedTranscript.render(entry.segments))
+    assert cache.stats()['entries'] == 1
+    assert cache.stats()['evictions'] == 1
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test the full-text transcript index and its indexing on fetch.
+"""
+
+import os
+import tempfile
+
+import transcript_service
+from transcript_cache import CachedTranscript
+from transcript_search import TranscriptIndex, build_query
+from upstream_stub import StubTranscript, make_segments
+
+def _transcript(video_id, texts, seconds_per_segment=5.0):
+    return CachedTranscript(video_id, 'English', 'en', False, [
+        {'text': text, 'start': index * seconds_per_segment, 'duration': seconds_per_segment}
+        for index, text in enumerate(texts)
+    ])
+
+def test_ranked_hits_with_start_and_snippet():
+    """Hits carry the chunk's video and start time, best match first."""
+    index = TranscriptIndex(':memory:', chunk_seconds=10)
+    index.add(_transcript('aaaaaaaaaaa', ['intro', 'music', 'we talk about caching', 'outro']))
+    index.add(_transcript('bbbbbbbbbbb', ['caching caching', 'and more caching', 'done', 'bye']))
+
+    hits = index.search('caching')
+    assert [hit.video_id for hit in hits] == ['bbbbbbbbbbb', 'aaaaaaaaaaa']
+    assert hits[1].start == 10.0
+    assert '[caching]' in hits[1].snippet
+    assert index.search('intro caching') == []
+
+def test_reindexing_replaces_previous_chunks():
+    """Indexing the same track again leaves only the new text searchable."""
+    index = TranscriptIndex(':memory:')
+    index.add(_transcript('aaaaaaaaaaa', ['old wording']))
+    index.add(_transcript('aaaaaaaaaaa', ['new wording']))
+
+    assert index.search('old') == []
+    assert len(index.search('wording')) == 1
+    assert index.stats()['documents'] == 1
+
+def test_query_operators_are_treated_as_words():
+    """FTS5 syntax in user input neither errors nor changes the match."""
+    index = TranscriptIndex(':memory:')
+    index.add(_transcript('aaaaaaaaaaa', ['rock and roll']))
+
+    assert build_query('rock OR "roll') == '"rock" "OR" "roll"'
+    assert index.search('NEAR(') == []
+    assert index.search('"') == []
+
+def test_index_persists_across_instances():
+    """A file-backed index is shared by later processes."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'search.db')
+        first = TranscriptIndex(path)
+        first.add(_transcript('aaaaaaaaaaa', ['persistent words']))
+        first.close()
+
+        assert TranscriptIndex(path).search('persistent')[0].video_id == 'aaaaaaaaaaa'
+
+def test_fetch_indexes_transcript(use_fakes):
+    """Transcripts fetched from upstream become searchable."""
+    use_fakes([StubTranscript('en', segments=make_segments(50))])
+    transcript_service.fetch_transcript('aaaaaaaaaaa')
+
+    hits = transcript_service.search_index('segment 42')
+    assert hits[0].video_id == 'aaaaaaaaaaa'
+    assert hits[0].start <= 84.0
+
+def test_index_failures_dont_fail_fetches(use_fakes):
+    """A transcript the index can't store is still returned, and the failure counted."""
+    use_fakes([StubTranscript('en', segments=make_segments(5))])
+    transcript_service.transcript_index._conn.execute("DROP TABLE chunks")
+
+    entry = transcript_service.fetch_transcript('aaaaaaaaaaa')
+    assert len(entry.segments) == 5
+    stats = transcript_service.transcript_index.stats()
+    assert stats['failed_adds'] == 1
+    assert stats['documents'] == 0
+
+def test_common_queries_rank_newest_candidates():
+    """With more matches than max_candidates, only the newest matches are ranked."""
+    index = TranscriptIndex(':memory:', max_candidates=2)
+    for video_id in ('aaaaaaaaaaa', 'bbbbbbbbbbb', 'ccccccccccc'):
+        index.add(_transcript(video_id, ['common words here']))
+
+    hits = index.search('common')
+    assert {hit.video_id for hit in hits} == {'bbbbbbbbbbb', 'ccccccccccc'}
+    assert index.stats()['capped_queries'] == 1
+    assert len(index.search('common', limit=1)) == 1
+
+    # Exactly max_candidates matches are all ranked, so the query isn't capped
+    index = TranscriptIndex(':memory:', max_candidates=2)
+    for video_id in ('aaaaaaaaaaa', 'bbbbbbbbbbb'):
+        index.add(_transcript(video_id, ['common words here']))
+    assert len(index.search('common')) == 2
+    assert index.stats()['capped_queries'] == 0
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Test the columnar transcript segment table.
+"""
+
+from transcript_segments import SegmentTable
+
+def test_round_trips_texts_with_newlines():
+    """Texts containing newlines survive the shared buffer and serialization."""
+    entries = [
+        {'text': 'first line\nsecond line', 'start': 0.0, 'duration': 1.0},
+        {'text': '', 'start': 1.0, 'duration': 0.5},
+        {'text': 'last', 'start': 1.5, 'duration': 2.0},
+    ]
+    table = SegmentTable.from_entries(entries)
+    assert table.to_dicts() == entries
+    assert table.joined_text(0, 3) == 'first line\nsecond line\n\nlast'
+    assert table.joined_text(2) == 'last'
+
+    restored = SegmentTable.from_column_dict(table.to_columns())
+    assert restored.to_dicts() == entries
+
+def test_sorts_by_start_and_accepts_objects():
+    """Snippet objects are accepted and out-of-order segments are sorted."""
+    class Snippet:
+        def __init__(self, text, start, duration):
+            self.text, self.start, self.duration = text, start, duration
+
+    table = SegmentTable.from_entries([Snippet('b', 2.0, 1.0), Snippet('a', 1.0, 3.0)])
+    assert list(table) == [(1.0, 3.0, 'a'), (2.0, 1.0, 'b')]
+    assert table.max_duration == 3.0
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Test the upstream scheduler's retries, rate limit and circuit breaker against
+a fake upstream that injects HTTP 429s (IpBlocked).
+"""
+
+import asyncio
+import time
+
+import pytest
+from youtube_transcript_api._errors import IpBlocked, TranscriptsDisabled
+
+import server
+import transcript_service
+from transcript_cache import CachedTranscript
+from upstream import CircuitBreaker, UpstreamScheduler, UpstreamUnavailable
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+def test_retries_with_backoff_then_succeeds(use_fakes):
+    """Two 429s are retried with exponential backoff; the third attempt succeeds."""
+    delays = []
+    scheduler = UpstreamScheduler(sleep=delays.append, jitter=lambda: 1.0)
+    api = use_fakes(error=IpBlocked('aaaaaaaaaaa'), failures=2, upstream=scheduler)
+
+    assert transcript_service.fetch_transcript('aaaaaaaaaaa') is not None
+    assert api.listings == 3
+    assert delays == [0.5, 1.0]
+    stats = scheduler.stats()
+    assert stats['retries'] == 2
+    assert stats['breaker'] == 'closed'
+
+def test_non_retryable_errors_are_not_retried(use_fakes):
+    scheduler = UpstreamScheduler(sleep=lambda seconds: pytest.fail("slept"))
+    api = use_fakes(error=TranscriptsDisabled('aaaaaaaaaaa'), upstream=scheduler)
+
+    with pytest.raises(TranscriptsDisabled):
+        transcript_service.fetch_transcript('aaaaaaaaaaa')
+    assert api.listings == 1
+
+def test_breaker_opens_and_fails_fast(use_fakes):
+    """After repeated blocks, calls fail without reaching YouTube."""
+    clock = FakeClock()
+    scheduler = UpstreamScheduler(
+        breaker=CircuitBreaker(threshold=3, cooldown=30, clock=clock),
+        max_retries=5, sleep=clock.sleep,
+    )
+    api = use_fakes(error=IpBlocked('aaaaaaaaaaa'), upstream=scheduler)
+
+    with pytest.raises(UpstreamUnavailable):
+        transcript_service.fetch_transcript('aaaaaaaaaaa')
+    assert api.listings == 3
+
+    result = asyncio.run(server.get_youtube_transcript('bbbbbbbbbbb'))
+    assert result.startswith('Error: YouTube is blocking requests')
+    assert api.listings == 3
+    assert scheduler.stats()['rejected'] == 2
+
+def test_half_open_trial_closes_breaker(use_fakes):
+    clock = FakeClock()
+    breaker = CircuitBreaker(threshold=1, cooldown=30, clock=clock)
+    scheduler = UpstreamScheduler(breaker=breaker, max_retries=0, sleep=clock.sleep)
+    api = use_fakes(error=IpBlocked('aaaaaaaaaaa'), failures=1, upstream=scheduler)
+
+    with pytest.raises(IpBlocked):
+        transcript_service.fetch_transcript('aaaaaaaaaaa')
+    assert breaker.state == CircuitBreaker.OPEN
+
+    clock.now += 31
+    assert transcript_service.fetch_transcript('aaaaaaaaaaa') is not None
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert api.listings == 2
+
+def test_open_breaker_serves_expired_cache(use_fakes):
+    """An entry past its TTL is still served while YouTube is unreachable."""
+    use_fakes(error=IpBlocked('aaaaaaaaaaa'), upstream=UpstreamScheduler(
+        breaker=CircuitBreaker(threshold=1), max_retries=0,
+    ))
+    cache = transcript_service.transcript_cache
+    cache.ttl = 60
+    cache.put(CachedTranscript(
+        'aaaaaaaaaaa', 'English', 'en', False,
+        [{'text': 'old but useful', 'start': 0.0, 'duration': 1.0}],
+        fetched_at=time.time() - 3600,
+    ))
+
+    with pytest.raises(IpBlocked):
+        transcript_service.fetch_transcript('bbbbbbbbbbb')
+    transcript = transcript_service.fetch_transcript('aaaaaaaaaaa')
+    assert transcript.segments.text(0) == 'old but useful'
+    assert cache.stats()['stale_hits'] == 1
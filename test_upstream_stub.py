@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Test recording upstream responses and replaying them with injected faults.
+"""
+
+import os
+import tempfile
+
+import pytest
+from youtube_transcript_api._errors import (
+    IpBlocked,
+    TranscriptsDisabled,
+    VideoUnavailable,
+    YouTubeRequestFailed
+)
+
+import transcript_service
+from upstream_stub import (
+    Cassette,
+    RecordingApi,
+    ReplayApi,
+    StubApi,
+    StubTranscript,
+    UnrecordedTrack,
+    make_segments
+)
+
+def test_recorded_cassette_replays_the_same_transcript(monkeypatch, use_fakes):
+    """Transcripts recorded through the service come back identical from a replay."""
+    live = StubApi([StubTranscript('en', segments=make_segments(5)), StubTranscript('de', True)])
+    recorder = RecordingApi(live)
+    use_fakes()
+    monkeypatch.setattr(transcript_service, '_api', recorder)
+    recorded = transcript_service.fetch_transcript('dQw4w9WgXcQ')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'cassette.json')
+        recorder.cassette.save(path)
+        cassette = Cassette.load(path)
+
+    tracks = cassette.videos['dQw4w9WgXcQ']['tracks']
+    assert [(t['language_code'], t['segments'] is not None) for t in tracks] == [('en', True), ('de', False)]
+
+    replay = ReplayApi(cassette)
+    use_fakes()
+    monkeypatch.setattr(transcript_service, '_api', replay)
+    replayed = transcript_service.fetch_transcript('dQw4w9WgXcQ')
+    assert replayed.segments.to_dicts() == recorded.segments.to_dicts()
+    assert replay.stats()['round_trips'] == 2
+
+    # The German track was listed but never fetched, so there is nothing to replay
+    german = [track for track in replay.list('dQw4w9WgXcQ') if track.language_code == 'de'][0]
+    with pytest.raises(UnrecordedTrack):
+        german.fetch()
+
+def test_recorded_errors_and_unknown_videos():
+    """Recorded failures are raised again; videos not in the cassette are unavailable."""
+    recorder = RecordingApi(StubApi(error=TranscriptsDisabled('aaaaaaaaaaa')))
+    with pytest.raises(TranscriptsDisabled):
+        recorder.list('aaaaaaaaaaa')
+
+    replay = ReplayApi(recorder.cassette)
+    with pytest.raises(TranscriptsDisabled):
+        replay.list('aaaaaaaaaaa')
+    with pytest.raises(VideoUnavailable):
+        replay.list('bbbbbbbbbbb')
+
+def test_injected_errors_and_throttling():
+    """error_rate fails round trips transiently; throttle_rate answers 429 beyond the rate."""
+    cassette = Cassette.synthetic(3, segments=10)
+
+    failing = ReplayApi(cassette, error_rate=1.0)
+    with pytest.raises(YouTubeRequestFailed):
+        failing.list('00000000000')
+    assert failing.stats()['injected_errors'] == 1
+
+    # A listing and a fetch use up the two round trips allowed per second
+    throttled = ReplayApi(cassette, throttle_rate=2)
+    next(throttled.list('00000000000')).fetch()
+    with pytest.raises(IpBlocked):
+        throttled.list('00000000001')
+    assert throttled.stats()['throttled'] == 1
+
+def test_service_retries_injected_errors(monkeypatch, use_fakes):
+    """The upstream scheduler retries transient replay errors until one succeeds."""
+    use_fakes()
+    replay = ReplayApi(Cassette.synthetic(1, segments=10), error_rate=0.5, seed=3)
+    monkeypatch.setattr(transcript_service, '_api', replay)
+
+    entry = transcript_service.fetch_transcript('00000000000')
+    assert entry is not None
+    assert transcript_service.upstream.stats()['retries'] == replay.stats()['injected_errors'] > 0
+
+def test_synthetic_cassette_shape():
+    """Generated cassettes vary lengths, add second tracks and disable some videos."""
+    cassette = Cassette.synthetic(6, segments=100, disabled_every=3)
+    assert list(cassette.videos) == [f"{i:011d}" for i in range(6)]
+    assert cassette.videos['00000000002'] == {'error': 'TranscriptsDisabled'}
+    assert len(cassette.videos['00000000000']['tracks']) == 2
+    lengths = {len(video['tracks'][0]['segments']) for video in cassette.videos.values() if 'tracks' in video}
+    assert all(50 <= length <= 150 for length in lengths) and len(lengths) > 1
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Test video ID extraction for every supported URL form and the bulk API.
+"""
+
+import pytest
+
+from video_ids import extract_video_id, extract_video_ids
+
+VIDEO_ID = "dQw4w9WgXcQ"
+
+@pytest.mark.parametrize("url", [
+    "dQw4w9WgXcQ",
+    "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+    "https://m.youtube.com/watch?v=dQw4w9WgXcQ&t=42s",
+    "https://www.youtube.com/watch?feature=share&v=dQw4w9WgXcQ",
+    "youtube.com/watch?v=dQw4w9WgXcQ#t=10",
+    "https://youtu.be/dQw4w9WgXcQ?si=abc",
+    "https://www.youtube.com/embed/dQw4w9WgXcQ",
+    "https://www.youtube.com/v/dQw4w9WgXcQ",
+    "https://www.youtube.com/shorts/dQw4w9WgXcQ",
+    "https://youtube.com/live/dQw4w9WgXcQ?feature=share",
+    "https://music.youtube.com/watch?v=dQw4w9WgXcQ&list=RDAMVM",
+    "https://www.youtube-nocookie.com/embed/dQw4w9WgXcQ",
+    "HTTPS://WWW.YOUTUBE.COM/watch?v=dQw4w9WgXcQ",
+    "  https://youtu.be/dQw4w9WgXcQ\n",
+])
+def test_supported_forms(url):
+    assert extract_video_id(url) == VIDEO_ID
+
+@pytest.mark.parametrize("url", [
+    "",
+    "not a url",
+    "dQw4w9WgXc",
+    "https://vimeo.com/12345678901",
+    "https://www.youtube.com/watch?xv=dQw4w9WgXcQ",
+    "https://www.youtube.com/watch?v=dQw4w9WgXcQextra",
+    "https://www.youtube.com/channel/UCuAXFkgsw1L7xaCfnd5JJOw",
+    "https://evil.example/youtu.be/dQw4w9WgXcQ",
+])
+def test_rejected_forms(url):
+    assert extract_video_id(url) is None
+
+def test_bulk_deduplicates_and_skips_invalid():
+    urls = [
+        "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+        "https://youtu.be/dQw4w9WgXcQ",
+        "https://www.youtube.com/shorts/aaaaaaaaaaa",
+        "https://vimeo.com/1",
+        "bbbbbbbbbbb\n",
+    ]
+    assert extract_video_ids(urls) == {VIDEO_ID, "aaaaaaaaaaa", "bbbbbbbbbbb"}
+    assert extract_video_ids(iter(urls)) == extract_video_ids(urls)
@@ -0,0 +1,249 @@
+"""
+OAuth token store for the YouTube Transcript MCP Server.
+Issued tokens and pending authorizations live in a backend (SQLite by
+default); validated tokens are kept in a bounded in-process LRU that honours
+each token's expires_at, and unknown tokens are remembered for a short while,
+so checking a token on a warm request is a dict lookup rather than a query.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, List, Dict, Any, Callable, NamedTuple, Tuple
+
+DEFAULT_TOKEN_DB_PATH = os.path.join(
+    tempfile.gettempdir(), "youtube-transcript-mcp", "oauth.db"
+)
+
+class TokenInfo(NamedTuple):
+    """What a token grants and until when (Unix seconds)."""
+    client_id: str
+    scopes: List[str]
+    expires_at: int
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {'client_id': self.client_id, 'scopes': list(self.scopes), 'expires_at': self.expires_at}
+
+def _digest(token: str) -> str:
+    # Tokens are stored hashed, so the database file doesn't hold usable credentials
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+class SQLiteTokenBackend:
+    """Token and authorization records in a single SQLite file.
+
+    Any object with the same save/get/delete methods can stand in for it, e.g.
+    one backed by a shared database or an introspection endpoint.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            path, timeout=30, check_same_thread=False, isolation_level=None
+        )
+        if path != ':memory:':
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS tokens (
+                token_hash TEXT PRIMARY KEY,
+                client_id TEXT NOT NULL,
+                scopes TEXT NOT NULL,
+                expires_at INTEGER NOT NULL
+            )"""
+        )
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS authorizations (
+                authorization_id TEXT PRIMARY KEY,
+                data TEXT NOT NULL
+            )"""
+        )
+
+    def save_token(self, token: str, info: TokenInfo) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO tokens (token_hash, client_id, scopes, expires_at) "
+                "VALUES (?, ?, ?, ?)",
+                (_digest(token), info.client_id, json.dumps(list(info.scopes)), int(info.expires_at)),
+            )
+
+    def get_token(self, token: str) -> Optional[TokenInfo]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT client_id, scopes, expires_at FROM tokens WHERE token_hash = ?",
+                (_digest(token),),
+            ).fetchone()
+        if row is None:
+            return None
+        client_id, scopes, expires_at = row
+        return TokenInfo(client_id, json.loads(scopes), expires_at)
+
+    def delete_token(self, token: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM tokens WHERE token_hash = ?", (_digest(token),))
+
+    def save_authorization(self, authorization_id: str, data: Dict[str, Any]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO authorizations (authorization_id, data) VALUES (?, ?)",
+                (authorization_id, json.dumps(data)),
+            )
+
+    def get_authorization(self, authorization_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM authorizations WHERE authorization_id = ?",
+                (authorization_id,),
+            ).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def delete_authorization(self, authorization_id: str) -> bool:
+        """Delete a pending authorization; return whether it existed."""
+        with self._lock:
+            return self._conn.execute(
+                "DELETE FROM authorizations WHERE authorization_id = ?", (authorization_id,)
+            ).rowcount > 0
+
+    def purge_expired(self, now: Optional[float] = None) -> int:
+        """Delete tokens and pending authorizations past their expiry; return how many."""
+        now = time.time() if now is None else now
+        with self._lock:
+            removed = self._conn.execute(
+                "DELETE FROM tokens WHERE expires_at <= ?", (now,)
+            ).rowcount
+            expired = [
+                (authorization_id,)
+                for authorization_id, data in self._conn.execute(
+                    "SELECT authorization_id, data FROM authorizations"
+                )
+                if json.loads(data).get('expires_at', float('inf')) <= now
+            ]
+            self._conn.executemany(
+                "DELETE FROM authorizations WHERE authorization_id = ?", expired
+            )
+        return removed + len(expired)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+class TokenCache:
+    """In-process LRU of validated tokens in front of a token backend.
+
+    A cached token is trusted until its expires_at, but for no longer than
+    `ttl` seconds, which bounds how long a revocation made by another process
+    can go unnoticed. Unknown tokens are cached as invalid for `negative_ttl`.
+    """
+
+    def __init__(
+        self,
+        backend: Any,
+        max_entries: int = 1024,
+        ttl: float = 300.0,
+        negative_ttl: float = 30.0,
+        clock: Callable[[], float] = time.time
+    ):
+        self.backend = backend
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._clock = clock
+        # token -> (info, trusted until)
+        self._valid: "OrderedDict[str, Tuple[TokenInfo, float]]" = OrderedDict()
+        # token -> invalid until
+        self._invalid: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_env(cls) -> "TokenCache":
+        """Build a cache over SQLite configured from OAUTH_TOKEN_* environment variables.
+
+        Setting OAUTH_TOKEN_DB to an empty string keeps tokens in memory only.
+        """
+        path = os.getenv("OAUTH_TOKEN_DB", DEFAULT_TOKEN_DB_PATH) or ':memory:'
+        return cls(
+            SQLiteTokenBackend(path),
+            max_entries=int(os.getenv("OAUTH_TOKEN_CACHE_SIZE", "1024")),
+            ttl=float(os.getenv("OAUTH_TOKEN_CACHE_TTL", "300")),
+            negative_ttl=float(os.getenv("OAUTH_TOKEN_NEGATIVE_TTL", "30")),
+        )
+
+    def _trim(self, entries: "OrderedDict[str, Any]") -> None:
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, token: str) -> Optional[TokenInfo]:
+        """Return the token's grant if it is known and unexpired, else None."""
+        now = self._clock()
+        with self._lock:
+            cached = self._valid.get(token)
+            if cached is not None:
+                info, until = cached
+                if now < until:
+                    self._valid.move_to_end(token)
+                    self.hits += 1
+                    return info
+                del self._valid[token]
+                if now >= info.expires_at:
+                    # Expired for good; no need to ask the backend
+                    self._invalid[token] = now + self.negative_ttl
+                    self._trim(self._invalid)
+                    self.negative_hits += 1
+                    return None
+            invalid_until = self._invalid.get(token)
+            if invalid_until is not None:
+                if now < invalid_until:
+                    self.negative_hits += 1
+                    return None
+                del self._invalid[token]
+            self.misses += 1
+
+        info = self.backend.get_token(token)
+        with self._lock:
+            if info is None or info.expires_at <= now:
+                self._invalid[token] = now + self.negative_ttl
+                self._invalid.move_to_end(token)
+                self._trim(self._invalid)
+                return None
+            self._valid[token] = (info, min(info.expires_at, now + self.ttl))
+            self._valid.move_to_end(token)
+            self._trim(self._valid)
+        return info
+
+    def save(self, token: str, info: TokenInfo) -> None:
+        """Store a newly issued token; it is valid immediately, even if recently unknown."""
+        self.backend.save_token(token, info)
+        with self._lock:
+            self._invalid.pop(token, None)
+
+    def revoke(self, token: str) -> None:
+        """Delete a token from the backend and drop it from memory."""
+        self.backend.delete_token(token)
+        with self._lock:
+            self._valid.pop(token, None)
+            self._invalid[token] = self._clock() + self.negative_ttl
+            self._trim(self._invalid)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current sizes."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'negative_hits': self.negative_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'valid_entries': len(self._valid),
+                'invalid_entries': len(self._invalid),
+            }
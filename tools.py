@@ -0,0 +1,754 @@
+"""
+Tool and resource functions for the YouTube Transcript MCP Server.
+Kept free of fastmcp so the FastMCP server (server.py) and the serverless
+JSON-RPC endpoint (api/mcp.py) share one implementation, and the endpoint's
+cold start doesn't pay for importing the MCP framework.
+"""
+
+import asyncio
+import functools
+import inspect
+import itertools
+import os
+import typing
+from typing import Optional, List, Dict, Any, AsyncIterator, Tuple, Union
+from dotenv import load_dotenv
+from youtube_transcript_api._errors import (
+    TranscriptsDisabled,
+    NoTranscriptFound,
+    RequestBlocked,
+    VideoUnavailable
+)
+from http_pool import pool_stats
+from metrics import outcomes, registry, response_chars, stage_seconds
+from transcript_budget import SAMPLE_SEPARATOR, STRATEGIES, fit_budget
+from transcript_json import OUTPUT_FORMATS, dumps, encode_segments
+from transcript_render import format_timestamp, render_cache, render_segments, render_transcript
+from transcript_segments import SegmentTable, slice_ranges
+from transcript_service import (
+    TranscriptWindow,
+    fetch_transcript,
+    get_listing,
+    inflight,
+    metadata_cache,
+    playlist_cache_stats,
+    playlist_total,
+    playlist_video_ids,
+    run_blocking,
+    search_index,
+    transcript_cache,
+    transcript_index,
+    upstream
+)
+from upstream import UpstreamUnavailable
+from video_ids import extract_video_id
+
+# Load environment variables
+load_dotenv()
+
+# Batch tool defaults
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "8"))
+BATCH_TIMEOUT_SECONDS = float(os.getenv("BATCH_TIMEOUT_SECONDS", "60"))
+# Playlist tool defaults
+PLAYLIST_MAX_VIDEOS = int(os.getenv("PLAYLIST_MAX_VIDEOS", "500"))
+PLAYLIST_TRANSCRIPT_VIDEOS = int(os.getenv("PLAYLIST_TRANSCRIPT_VIDEOS", "25"))
+
+registry.register_stats('render_cache', render_cache.stats)
+registry.register_stats('http_pool', pool_stats)
+
+def format_transcript(transcript: Union[SegmentTable, List[Any]], include_timestamps: bool = True) -> str:
+    """Format transcript entries into readable text."""
+    if not transcript:
+        return "No transcript available."
+    
+    if not isinstance(transcript, SegmentTable):
+        transcript = SegmentTable.from_entries(transcript)
+    return render_segments(transcript, include_timestamps)
+
+def error_response(message: str, output_format: str = "text", **fields: Any) -> str:
+    """An error as "Error: ..." text, or as a JSON object with an 'error' key.
+    
+    The 'error' key comes first, so is_error_response needn't parse the JSON.
+    """
+    if output_format == "text":
+        return f"Error: {message}"
+    return dumps({'error': message, **fields})
+
+def is_error_response(result: str) -> bool:
+    """Whether a tool result, in any output format, reports an error."""
+    return result.startswith(("Error:", '{"error":'))
+
+def transcript_response(
+    video_id: str,
+    include_timestamps: bool = True,
+    language: Optional[str] = None,
+    offset: int = 0,
+    limit: Optional[int] = None,
+    start_seconds: Optional[float] = None,
+    end_seconds: Optional[float] = None,
+    max_tokens: Optional[int] = None,
+    max_chars: Optional[int] = None,
+    truncate: str = "head",
+    output_format: str = "text"
+) -> str:
+    """Fetch and format one video's transcript, turning failures into error text.
+    
+    Only the segments inside the time window, and then inside the
+    offset/limit page, are rendered; a page costs memory in proportion to its
+    own size rather than the whole video. A token or character budget then
+    picks whole segments from that page using precomputed costs. The json and
+    segments formats encode the chosen segments from the cached columns
+    instead of rendering them. A windowed request for a track that is only
+    in the disk store reads just the blocks holding the window.
+    """
+    if output_format not in OUTPUT_FORMATS:
+        outcomes.inc('bad_request')
+        return f"Error: output_format must be one of {', '.join(OUTPUT_FORMATS)}."
+    
+    def error(message: str) -> str:
+        return error_response(message, output_format, video_id=video_id)
+    
+    if max_tokens is not None and max_chars is not None:
+        outcomes.inc('bad_request')
+        return error("Pass either max_tokens or max_chars, not both.")
+    if truncate not in STRATEGIES:
+        outcomes.inc('bad_request')
+        return error(f"truncate must be one of {', '.join(STRATEGIES)}.")
+    if limit is not None and limit < 1:
+        # An empty page would point back at the same offset forever
+        outcomes.inc('bad_request')
+        return error(f"limit must be at least 1, got {limit}.")
+    
+    try:
+        windowed = start_seconds is not None or end_seconds is not None
+        # Served from the transcript cache when possible
+        transcript = fetch_transcript(
+            video_id, language, (start_seconds or 0.0, end_seconds) if windowed else None
+        )
+        
+        if not transcript:
+            outcomes.inc('no_transcripts')
+            return error("No transcripts available for this video.")
+        
+        table = transcript.segments
+        # Read from the disk store, the table holds only the window's segments
+        partial = isinstance(transcript, TranscriptWindow)
+        # Its timestamps still take the whole track's format (see uses_hours)
+        hours = transcript.last_start >= 3600 if partial else None
+        if windowed and not partial:
+            selected = transcript.window(start_seconds or 0.0, end_seconds)
+        else:
+            selected = [(0, len(table))]
+        total = sum(stop - start for start, stop in selected)
+        if offset < 0 or (offset and offset >= total):
+            outcomes.inc('bad_request')
+            return error(f"Offset {offset} is outside the transcript ({total} segments).")
+        count = total - offset if limit is None else min(total - offset, limit)
+        
+        # Offsets count through the window's segments, which a long caption
+        # from before it can split into more than one index range
+        ranges = slice_ranges(selected, offset, offset + count)
+        windows = [ranges] if ranges else []
+        fit = None
+        if max_tokens is not None or max_chars is not None:
+            unit = "tokens" if max_tokens is not None else "chars"
+            measure = "estimated tokens" if unit == "tokens" else "characters"
+            budget = max(0, max_tokens if max_tokens is not None else max_chars)
+            fit = fit_budget(table, ranges, budget, unit, include_timestamps, truncate, hours)
+            if ranges and not fit.ranges:
+                # Nothing shown would leave a continuation pointing back at this offset
+                outcomes.inc('bad_request')
+                return error(f"A budget of {budget} {measure} is too small for a single segment.")
+            ranges = fit.ranges
+            windows = fit.windows
+        
+        if output_format != "text":
+            shown = sum(stop - start for start, stop in ranges)
+            if fit is not None and fit.truncated:
+                next_offset = offset + shown if truncate == "head" else None
+            else:
+                next_offset = offset + count if offset + count < total else None
+            with stage_seconds.time('format'):
+                response = {
+                    'video_id': video_id,
+                    'language': transcript.language,
+                    'language_code': transcript.language_code,
+                    'is_generated': transcript.is_generated,
+                    'translated_from': transcript.translated_from or None,
+                    'total_segments': total,
+                    'offset': offset,
+                    'next_offset': next_offset,
+                    'truncated': fit is not None and fit.truncated,
+                    # Absolute indices of the returned runs: several for truncate="sample",
+                    # or when a long caption from before the time window runs into it
+                    'ranges': [
+                        list(pair)
+                        for start, stop in ranges
+                        for pair in (slice_ranges(transcript.ranges, start, stop) if partial else [(start, stop)])
+                    ],
+                }
+                if windowed:
+                    response['start_seconds'] = start_seconds or 0.0
+                    response['end_seconds'] = end_seconds
+                response.update(encode_segments(table, ranges, output_format))
+                result = dumps(response)
+            outcomes.inc('ok')
+            return result
+        
+        # Metadata header, then the requested segments
+        kind = 'Manual' if not transcript.is_generated else 'Auto-generated'
+        if transcript.translated_from:
+            # Machine-translated by YouTube; is_generated describes the source track
+            kind = f"Translated from {transcript.translated_from} ({kind.lower()} source)"
+        header = [
+            f"Video ID: {video_id}",
+            f"Language: {transcript.language} ({transcript.language_code})",
+            f"Type: {kind}",
+        ]
+        header += [
+            f"{'=' * 50}",
+            "",
+        ]
+        
+        if windowed:
+            end = "end" if end_seconds is None else f"{end_seconds:g}s"
+            between = f"between {start_seconds or 0:g}s and {end}"
+        with stage_seconds.time('format'):
+            if total:
+                # Repeat requests slice a cached render instead of formatting again
+                body = f"\n{SAMPLE_SEPARATOR}\n".join(
+                    '\n'.join(
+                        render_segments(table, include_timestamps, start, stop, hours) if partial
+                        else render_transcript(transcript, include_timestamps, start, stop)
+                        for start, stop in window
+                    )
+                    for window in windows
+                )
+            elif windowed:
+                body = f"No segments {between}."
+            else:
+                body = "No transcript available."
+        
+        notes = []
+        if fit is not None and fit.truncated:
+            shown = sum(stop - start for start, stop in ranges)
+            note = (
+                f"[Truncated ({truncate}) to {fit.used} of {fit.total} {measure}: "
+                f"{shown} of {count} segments"
+            )
+            if truncate == "head":
+                note += f"; next offset: {offset + shown}"
+            notes.append(note + "]")
+        else:
+            if fit is not None:
+                notes.append(f"[Not truncated: {fit.used} of {budget} {measure}]")
+            if total and (windowed or offset or offset + count < total):
+                page = f"[Segments {offset + 1}-{offset + count} of {total}"
+                if windowed:
+                    page += f" {between}"
+                if offset + count < total:
+                    page += f"; next offset: {offset + count}"
+                notes.append(page + "]")
+        footer = [""] + notes if notes else []
+        
+        outcomes.inc('ok')
+        # One join over all parts instead of building the body and concatenating
+        return '\n'.join(itertools.chain(header, [body], footer))
+        
+    except TranscriptsDisabled:
+        outcomes.inc('transcripts_disabled')
+        return error("Transcripts are disabled for this video.")
+    except VideoUnavailable:
+        outcomes.inc('video_unavailable')
+        return error("Video is unavailable or does not exist.")
+    except NoTranscriptFound:
+        outcomes.inc('no_transcript_found')
+        return error("No transcript found for this video.")
+    except UpstreamUnavailable as e:
+        outcomes.inc('upstream_unavailable')
+        return error(f"{e}. Try again later.")
+    except RequestBlocked:
+        outcomes.inc('request_blocked')
+        return error("YouTube is rate limiting requests; try again later.")
+    except Exception as e:
+        outcomes.inc('error')
+        return error(f"An unexpected error occurred - {str(e)}")
+
+async def get_youtube_transcript(
+    video_url: str,
+    include_timestamps: bool = True,
+    language: Optional[str] = None,
+    offset: int = 0,
+    limit: Optional[int] = None,
+    start_seconds: Optional[float] = None,
+    end_seconds: Optional[float] = None,
+    max_tokens: Optional[int] = None,
+    max_chars: Optional[int] = None,
+    truncate: str = "head",
+    output_format: str = "text"
+) -> str:
+    """
+    Fetch transcript from a YouTube video.
+    
+    Args:
+        video_url: YouTube video URL or video ID
+        include_timestamps: Whether to include timestamps in the transcript
+        language: Preferred language code (e.g., 'en', 'es'). If not specified, 
+                 prioritizes English then falls back to auto-generated.
+        offset: Index of the first segment to return, for paging through long videos
+        limit: Maximum number of segments to return (default: all remaining).
+               Paged responses end with the offset of the next page.
+        start_seconds: Only return segments overlapping this time onwards
+        end_seconds: Only return segments that start before this time
+        max_tokens: Return at most about this many tokens of transcript text
+        max_chars: Return at most this many characters of transcript text
+        truncate: What to keep when over budget: 'head' (default), 'tail', or
+                  'sample' (evenly spaced windows). Cuts are at whole segments and
+                  the response says whether it was truncated.
+        output_format: 'text' (default) for a readable transcript, 'json' for a
+                       JSON object with metadata and one {start, duration, text}
+                       object per segment, or 'segments' for the same object with
+                       compact [start, duration, text] rows.
+    
+    Returns:
+        Formatted transcript text, or a JSON object for 'json' and 'segments'
+    """
+    with stage_seconds.time('total'):
+        with stage_seconds.time('extract'):
+            video_id = extract_video_id(video_url)
+        if not video_id:
+            outcomes.inc('invalid_id')
+            result = error_response(
+                "Invalid YouTube URL or video ID provided.", output_format, video_url=video_url
+            )
+        else:
+            # Upstream I/O runs off the event loop so other clients aren't stalled
+            result = await run_blocking(
+                transcript_response, video_id, include_timestamps, language,
+                offset, limit, start_seconds, end_seconds, max_tokens, max_chars, truncate,
+                output_format
+            )
+    response_chars.observe(len(result), 'get_youtube_transcript')
+    return result
+
+async def _fetch_batch(
+    inputs: AsyncIterator[Tuple[str, Optional[str]]],
+    include_timestamps: bool,
+    language: Optional[str],
+    max_concurrency: int,
+    timeout_seconds: float,
+    output_format: str
+) -> Tuple[List[str], List[str], Optional[str]]:
+    """
+    Fetch transcripts for (input, video ID) pairs as they are produced.
+    
+    Each video starts fetching as soon as its pair arrives, so a lazily
+    expanded playlist overlaps paging with transcript fetches. Pairs are
+    deduplicated on the video ID so URL variants of one video are fetched once.
+    
+    Returns:
+        The inputs kept, their results in the same order, and the error that
+        stopped the input early, if any
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    render_one = functools.partial(transcript_response, output_format=output_format)
+    
+    async def fetch_one(video_id: Optional[str]) -> str:
+        if not video_id:
+            return error_response("Invalid YouTube URL or video ID provided.", output_format)
+        await semaphore.acquire()
+        # A timed-out fetch keeps running on its executor thread, so the slot is
+        # released when the thread finishes rather than when we stop waiting;
+        # otherwise abandoned fetches would pile up past max_concurrency
+        work = asyncio.ensure_future(run_blocking(render_one, video_id, include_timestamps, language))
+        work.add_done_callback(lambda _: semaphore.release())
+        try:
+            return await asyncio.wait_for(asyncio.shield(work), timeout_seconds)
+        except asyncio.TimeoutError:
+            return error_response(
+                f"Timed out after {timeout_seconds:g} seconds.", output_format, video_id=video_id
+            )
+    
+    labels: List[str] = []
+    tasks = []
+    seen = set()
+    stopped = None
+    try:
+        async for label, video_id in inputs:
+            key = video_id or label
+            if key not in seen:
+                seen.add(key)
+                labels.append(label)
+                tasks.append(asyncio.ensure_future(fetch_one(video_id)))
+    except Exception as e:
+        stopped = str(e)
+    results = await asyncio.gather(*tasks)
+    return labels, results, stopped
+
+def _batch_response(
+    labels: List[str],
+    results: List[str],
+    output_format: str,
+    stopped: Optional[str] = None
+) -> str:
+    """Combine per-video results into one response, in input order."""
+    fetched = sum(1 for result in results if not is_error_response(result))
+    if output_format != "text":
+        # Splice each video's JSON object in after its input URL rather than
+        # decoding and re-encoding every transcript
+        items = [
+            f'{{"input":{dumps(label)},{result[1:]}'
+            for label, result in zip(labels, results)
+        ]
+        extra = f',"stopped":{dumps(stopped)}' if stopped else ''
+        return f'{{"fetched":{fetched},"total":{len(labels)}{extra},"results":[{",".join(items)}]}}'
+    sections = [f"Fetched {fetched} of {len(labels)} videos"]
+    if stopped:
+        sections[0] += f" (stopped early: {stopped})"
+    for index, (label, result) in enumerate(zip(labels, results), 1):
+        sections.append(f"{'#' * 50}\n[{index}] {label}\n{result}")
+    return "\n\n".join(sections)
+
+async def get_youtube_transcripts(
+    video_urls: List[str],
+    include_timestamps: bool = True,
+    language: Optional[str] = None,
+    max_concurrency: int = BATCH_MAX_CONCURRENCY,
+    timeout_seconds: float = BATCH_TIMEOUT_SECONDS,
+    output_format: str = "text"
+) -> str:
+    """
+    Fetch transcripts from several YouTube videos concurrently.
+    
+    Args:
+        video_urls: YouTube video URLs or video IDs; duplicates are fetched once
+        include_timestamps: Whether to include timestamps in the transcripts
+        language: Preferred language code applied to every video
+        max_concurrency: Maximum number of videos fetched at the same time
+        timeout_seconds: Per-video time limit
+        output_format: 'text' (default), or 'json' / 'segments' for a JSON object
+                       whose results hold one get_youtube_transcript object per video
+    
+    Returns:
+        One section per unique video, in input order, each holding the formatted
+        transcript or an error message
+    """
+    if output_format not in OUTPUT_FORMATS:
+        return f"Error: output_format must be one of {', '.join(OUTPUT_FORMATS)}."
+    
+    async def inputs():
+        for video_url in video_urls:
+            yield video_url, extract_video_id(video_url)
+    
+    labels, results, _ = await _fetch_batch(
+        inputs(), include_timestamps, language, max_concurrency, timeout_seconds, output_format
+    )
+    result = _batch_response(labels, results, output_format)
+    response_chars.observe(len(result), 'get_youtube_transcripts')
+    return result
+
+def playlist_response(
+    playlist_url: str,
+    max_videos: int = PLAYLIST_MAX_VIDEOS,
+    output_format: str = "text"
+) -> str:
+    """List a playlist's or channel's video IDs, reading only the pages needed."""
+    if output_format not in OUTPUT_FORMATS:
+        return f"Error: output_format must be one of {', '.join(OUTPUT_FORMATS)}."
+    try:
+        video_ids = list(playlist_video_ids(playlist_url, max_videos))
+        # Fewer IDs than asked for means the last page was read; otherwise the
+        # first page, already cached, says how many there are
+        total = len(video_ids) if len(video_ids) < max_videos else playlist_total(playlist_url)
+    except Exception as e:
+        return error_response(str(e), output_format, playlist_url=playlist_url)
+    
+    if output_format != "text":
+        return dumps({
+            'playlist_url': playlist_url,
+            'total': total,
+            'complete': total == len(video_ids),
+            'video_ids': video_ids,
+        })
+    lines = [f"Videos in {playlist_url}: {len(video_ids)} of {total if total is not None else 'unknown'}"]
+    lines += video_ids
+    if total != len(video_ids):
+        lines += ["", f"[Stopped at max_videos={max_videos}]"]
+    return "\n".join(lines)
+
+async def expand_playlist(
+    playlist_url: str,
+    max_videos: int = PLAYLIST_MAX_VIDEOS,
+    output_format: str = "text"
+) -> str:
+    """
+    List the video IDs in a YouTube playlist or channel.
+    
+    Args:
+        playlist_url: Playlist URL or ID, channel URL or ID, or @handle
+        max_videos: Stop after this many videos; pages beyond them aren't requested
+        output_format: 'text' (default, one ID per line), or 'json' / 'segments'
+                       for a JSON object
+    
+    Returns:
+        The video IDs in playlist order, with how many the playlist holds
+    """
+    result = await run_blocking(playlist_response, playlist_url, max_videos, output_format)
+    response_chars.observe(len(result), 'expand_playlist')
+    return result
+
+async def get_playlist_transcripts(
+    playlist_url: str,
+    max_videos: int = PLAYLIST_TRANSCRIPT_VIDEOS,
+    include_timestamps: bool = True,
+    language: Optional[str] = None,
+    max_concurrency: int = BATCH_MAX_CONCURRENCY,
+    timeout_seconds: float = BATCH_TIMEOUT_SECONDS,
+    output_format: str = "text"
+) -> str:
+    """
+    Fetch transcripts for the videos in a YouTube playlist or channel.
+    
+    Args:
+        playlist_url: Playlist URL or ID, channel URL or ID, or @handle
+        max_videos: Fetch at most this many videos, in playlist order
+        include_timestamps: Whether to include timestamps in the transcripts
+        language: Preferred language code applied to every video
+        max_concurrency: Maximum number of videos fetched at the same time
+        timeout_seconds: Per-video time limit
+        output_format: 'text' (default), or 'json' / 'segments' as for
+                       get_youtube_transcripts
+    
+    Returns:
+        One section per video, as get_youtube_transcripts returns
+    """
+    if output_format not in OUTPUT_FORMATS:
+        return f"Error: output_format must be one of {', '.join(OUTPUT_FORMATS)}."
+    try:
+        video_ids = playlist_video_ids(playlist_url, max_videos)
+    except Exception as e:
+        return error_response(str(e), output_format, playlist_url=playlist_url)
+    
+    async def inputs():
+        # Pages are requested off the event loop, when the IDs of the previous
+        # one run out, while the videos of earlier pages are already being fetched
+        while True:
+            video_id = await run_blocking(next, video_ids, None)
+            if video_id is None:
+                return
+            yield video_id, video_id
+    
+    labels, results, stopped = await _fetch_batch(
+        inputs(), include_timestamps, language, max_concurrency, timeout_seconds, output_format
+    )
+    if stopped and not labels:
+        result = error_response(stopped, output_format, playlist_url=playlist_url)
+    else:
+        result = _batch_response(labels, results, output_format, stopped)
+    response_chars.observe(len(result), 'get_playlist_transcripts')
+    return result
+
+def listing_response(video_id: str, output_format: str = "text") -> str:
+    """List one video's transcript tracks, turning failures into error text."""
+    if output_format not in OUTPUT_FORMATS:
+        return f"Error: output_format must be one of {', '.join(OUTPUT_FORMATS)}."
+    try:
+        # Shares the cached listing with get_youtube_transcript
+        listing = get_listing(video_id)
+        
+        if output_format != "text":
+            return dumps({
+                'video_id': video_id,
+                'tracks': [
+                    {
+                        'language': track.language,
+                        'language_code': track.language_code,
+                        'is_generated': track.is_generated,
+                        'translation_languages': [code for code, _ in track.translation_languages],
+                    }
+                    for track in listing.tracks
+                ],
+            })
+        
+        available = []
+        for track in listing.tracks:
+            type_str = "Manual" if not track.is_generated else "Auto-generated"
+            available.append(
+                f"- {track.language} ({track.language_code}) - {type_str}"
+            )
+        
+        if available:
+            return f"Available transcripts for video {video_id}:\n" + "\n".join(available)
+        else:
+            return "No transcripts available for this video."
+            
+    except Exception as e:
+        return error_response(str(e), output_format, video_id=video_id)
+
+async def list_available_transcripts(video_url: str, output_format: str = "text") -> str:
+    """
+    List all available transcripts for a YouTube video.
+    
+    Args:
+        video_url: YouTube video URL or video ID
+        output_format: 'text' (default), or 'json' / 'segments' for a JSON object
+                       with one entry per track
+    
+    Returns:
+        List of available transcripts with language codes
+    """
+    video_id = extract_video_id(video_url)
+    if not video_id:
+        return error_response(
+            "Invalid YouTube URL or video ID provided.", output_format, video_url=video_url
+        )
+    
+    result = await run_blocking(listing_response, video_id, output_format)
+    response_chars.observe(len(result), 'list_available_transcripts')
+    return result
+
+def search_response(query: str, limit: int = 10) -> str:
+    """Search indexed transcripts and format ranked hits with links to the moment."""
+    try:
+        hits = search_index(query, limit)
+    except Exception as e:
+        return f"Error: {str(e)}"
+    if not hits:
+        return f"No fetched transcripts match '{query}'."
+
+    lines = [f"Search results for '{query}' ({len(hits)} hits):"]
+    for rank, hit in enumerate(hits, 1):
+        seconds = max(0, int(hit.start))
+        lines.append("")
+        lines.append(
+            f"{rank}. Video ID: {hit.video_id} ({hit.language_code}) "
+            f"{format_timestamp(seconds, seconds >= 3600)}"
+        )
+        lines.append(f"   {hit.snippet}")
+        lines.append(f"   https://www.youtube.com/watch?v={hit.video_id}&t={seconds}s")
+    return "\n".join(lines)
+
+async def search_transcripts(query: str, limit: int = 10) -> str:
+    """
+    Search the transcripts of every video fetched so far.
+    
+    Args:
+        query: Words to look for; a segment range matches when it contains all of them
+        limit: Maximum number of results (default: 10)
+    
+    Returns:
+        Ranked matches with video ID, start time, a snippet and a link to that moment
+    """
+    result = await run_blocking(search_response, query, limit)
+    response_chars.observe(len(result), 'search_transcripts')
+    return result
+
+def get_server_info() -> str:
+    """Get information about this MCP server."""
+    return """YouTube Transcript MCP Server
+
+This server provides tools to fetch transcripts from YouTube videos.
+
+Available tools:
+1. get_youtube_transcript - Fetch and format video transcripts
+2. get_youtube_transcripts - Fetch transcripts for many videos concurrently
+3. list_available_transcripts - List all available transcript languages
+4. search_transcripts - Full-text search over every transcript fetched so far
+5. expand_playlist - List the videos in a playlist or channel
+6. get_playlist_transcripts - Fetch transcripts for a playlist or channel
+
+Resources:
+- youtube://server/cache - Cache, search index and coalescing counters
+- youtube://server/pool - Connection pool, rate limit and circuit breaker state
+- youtube://server/metrics - Stage latencies, outcomes and sizes (Prometheus text format)
+
+Features:
+- Automatic video ID extraction from various YouTube URL formats
+- Prioritizes manual English transcripts over auto-generated
+- Falls back to other languages if English unavailable
+- Optional timestamp inclusion
+- Detailed error messages
+- Transcript caching (in-memory LRU plus on-disk store)
+"""
+
+def get_cache_stats() -> str:
+    """Get cache hit/miss/eviction and request coalescing counters."""
+    lines = ["Transcripts:"]
+    lines += [f"  {name}: {value}" for name, value in transcript_cache.stats().items()]
+    lines.append("Listings:")
+    lines += [f"  {name}: {value}" for name, value in metadata_cache.stats().items()]
+    lines.append("Rendered:")
+    lines += [f"  {name}: {value}" for name, value in render_cache.stats().items()]
+    lines.append("Search index:")
+    lines += [f"  {name}: {value}" for name, value in transcript_index.stats().items()]
+    lines.append("Coalescing:")
+    lines += [f"  {name}: {value}" for name, value in inflight.stats().items()]
+    lines.append("Playlist pages:")
+    lines += [f"  {name}: {value}" for name, value in playlist_cache_stats().items()]
+    return "\n".join(lines)
+
+def get_pool_stats() -> str:
+    """Get upstream HTTP connection pool, rate limit and circuit breaker statistics."""
+    lines = ["Connections:"]
+    lines += [f"  {name}: {value}" for name, value in pool_stats().items()]
+    lines.append("Scheduler:")
+    lines += [f"  {name}: {value}" for name, value in upstream.stats().items()]
+    return "\n".join(lines)
+
+def get_metrics() -> str:
+    """Get stage latency histograms, outcome counters and component stats in Prometheus text format."""
+    return registry.render()
+
+# Exposed over MCP by server.py and api/mcp.py, in listing order
+TOOLS = {
+    func.__name__: func for func in (
+        get_youtube_transcript,
+        get_youtube_transcripts,
+        list_available_transcripts,
+        search_transcripts,
+        expand_playlist,
+        get_playlist_transcripts,
+    )
+}
+RESOURCES = {
+    "youtube://server/info": get_server_info,
+    "youtube://server/cache": get_cache_stats,
+    "youtube://server/pool": get_pool_stats,
+    "youtube://server/metrics": get_metrics,
+}
+
+_JSON_TYPES = {str: 'string', bool: 'boolean', int: 'integer', float: 'number'}
+
+def _json_schema(annotation: Any) -> Dict[str, Any]:
+    """JSON Schema for the parameter annotations the tools use."""
+    args = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+    if typing.get_origin(annotation) is Union and len(args) == 1:
+        # Optional[X]: X or null
+        schema = _json_schema(args[0])
+        if 'type' in schema:
+            schema['type'] = [schema['type'], 'null']
+        return schema
+    if typing.get_origin(annotation) in (list, List):
+        return {'type': 'array', 'items': _json_schema(args[0]) if args else {}}
+    if annotation in _JSON_TYPES:
+        return {'type': _JSON_TYPES[annotation]}
+    return {}
+
+def tool_definition(name: str) -> Dict[str, Any]:
+    """Describe a tool as an MCP tools/list entry: name, docstring and input schema."""
+    func = TOOLS[name]
+    hints = typing.get_type_hints(func)
+    properties = {}
+    required = []
+    for param in inspect.signature(func).parameters.values():
+        schema = _json_schema(hints.get(param.name))
+        if param.default is inspect.Parameter.empty:
+            required.append(param.name)
+        else:
+            schema['default'] = param.default
+        properties[param.name] = schema
+    return {
+        'name': name,
+        'description': inspect.getdoc(func),
+        'inputSchema': {'type': 'object', 'properties': properties, 'required': required},
+    }
@@ -0,0 +1,157 @@
+"""
+Token and character budgets for transcript output.
+Per-segment costs are prefix sums kept with each SegmentTable, so deciding
+which segments fit a budget is a binary search rather than re-tokenizing the
+transcript on every call. Output is always cut at whole segments.
+"""
+
+from typing import Optional, List, Sequence, Tuple, NamedTuple
+from transcript_render import format_timestamp, uses_hours
+from transcript_segments import SegmentTable, slice_ranges
+
+STRATEGIES = ('head', 'tail', 'sample')
+UNITS = ('tokens', 'chars')
+
+# Evenly spaced windows returned by the "sample" strategy, and the line between them
+SAMPLE_WINDOWS = 4
+SAMPLE_SEPARATOR = "[...]"
+
+def estimate_tokens(text: str) -> int:
+    """Estimate tokens at one per four characters, as SegmentTable.token_prefix does."""
+    return (len(text) + 3) // 4
+
+class BudgetFit(NamedTuple):
+    """The segment ranges chosen for a budget and what they cost.
+
+    windows groups ranges into the runs that read on from one another: one
+    window except for the "sample" strategy.
+    """
+    ranges: List[Tuple[int, int]]
+    used: int
+    total: int
+    truncated: bool
+    windows: List[List[Tuple[int, int]]]
+
+class _Costs:
+    """
+    Cost of positions [a, b) of the selected segments.
+
+    Positions count through the selected index ranges in order; each range
+    costs a prefix difference plus a fixed per-line prefix.
+    """
+
+    __slots__ = ('ranges', 'prefix', 'per_segment')
+
+    def __init__(
+        self,
+        table: SegmentTable,
+        ranges: Sequence[Tuple[int, int]],
+        unit: str,
+        include_timestamps: bool,
+        hours: Optional[bool] = None
+    ):
+        self.ranges = ranges
+        stamp = ''
+        if include_timestamps and len(table):
+            if hours is None:
+                hours = uses_hours(table)
+            # The widest timestamp in the table, plus its trailing space
+            stamp = format_timestamp(max(0, int(table.starts[-1])), hours) + ' '
+        if unit == 'chars':
+            # Offsets already count each text plus its newline
+            self.prefix = table.offsets
+            self.per_segment = len(stamp)
+        else:
+            self.prefix = table.token_prefix()
+            self.per_segment = estimate_tokens(stamp)
+
+    def cost(self, start: int, stop: int) -> int:
+        prefix = self.prefix
+        return sum(
+            prefix[b] - prefix[a] + self.per_segment * (b - a)
+            for a, b in slice_ranges(self.ranges, start, stop)
+        )
+
+    def last_fitting(self, start: int, stop: int, budget: int) -> int:
+        """Largest b in [start, stop] with cost(start, b) <= budget."""
+        lo, hi = start, stop
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if self.cost(start, mid) <= budget:
+                lo = mid
+            else:
+                hi = mid - 1
+        return lo
+
+    def first_fitting(self, start: int, stop: int, budget: int) -> int:
+        """Smallest a in [start, stop] with cost(a, stop) <= budget."""
+        lo, hi = start, stop
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.cost(mid, stop) <= budget:
+                hi = mid
+            else:
+                lo = mid + 1
+        return lo
+
+def fit_budget(
+    table: SegmentTable,
+    ranges: Sequence[Tuple[int, int]],
+    budget: int,
+    unit: str = 'tokens',
+    include_timestamps: bool = True,
+    strategy: str = 'head',
+    hours: Optional[bool] = None
+) -> BudgetFit:
+    """
+    Choose which of the segments in ranges to render within a budget.
+
+    Args:
+        table: The transcript's segments
+        ranges: Ascending segment index ranges to draw from, read as one
+                sequence (a time window can select more than one)
+        budget: Maximum estimated tokens (or characters) of rendered lines
+        unit: 'tokens' or 'chars'
+        include_timestamps: Whether lines carry a timestamp prefix
+        strategy: 'head' keeps the opening, 'tail' the ending and 'sample'
+                  SAMPLE_WINDOWS evenly spaced windows across the segments
+                  (fewer when the budget can't fit a segment in each)
+        hours: Whether timestamps are [H:MM:SS] (default: decided from table)
+
+    Returns:
+        A BudgetFit whose ranges are in transcript order
+    """
+    costs = _Costs(table, ranges, unit, include_timestamps, hours)
+    stop = sum(b - a for a, b in ranges)
+    total = costs.cost(0, stop)
+    if total <= budget:
+        ranges = slice_ranges(ranges, 0, stop)
+        return BudgetFit(ranges, total, total, False, [ranges] if ranges else [])
+
+    if strategy == 'tail':
+        spans = [(costs.first_fitting(0, stop, budget), stop)]
+    elif strategy == 'sample':
+        separator = (
+            len(SAMPLE_SEPARATOR) + 1 if unit == 'chars'
+            else estimate_tokens(SAMPLE_SEPARATOR + '\n')
+        )
+        # Fewer windows when a share is too small for a segment in each of them;
+        # a single window is the same as 'head'
+        for windows in range(min(SAMPLE_WINDOWS, stop), 0, -1):
+            share = max(0, budget - separator * (windows - 1)) // windows
+            spans = []
+            for window in range(windows):
+                lo = stop * window // windows
+                hi = stop * (window + 1) // windows
+                spans.append((lo, costs.last_fitting(lo, hi, share)))
+            if all(b > a for a, b in spans):
+                break
+    else:
+        spans = [(0, costs.last_fitting(0, stop, budget))]
+
+    spans = [(a, b) for a, b in spans if b > a]
+    used = sum(costs.cost(a, b) for a, b in spans)
+    if strategy == 'sample' and spans:
+        used += separator * (len(spans) - 1)
+    windows = [slice_ranges(ranges, a, b) for a, b in spans]
+    return BudgetFit([pair for window in windows for pair in window], used, total, True, windows)
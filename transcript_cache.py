@@ -0,0 +1,596 @@
+"""
+Transcript cache for the YouTube Transcript MCP Server.
+Keeps raw transcript segments in a bounded in-process LRU with a TTL, in front of
+a SQLite store on disk so restarts and multiple workers share warm entries.
+Track listings and language resolution are cached separately, in memory only.
+"""
+
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from contextlib import nullcontext
+from typing import Optional, List, Dict, Any, Set, Tuple, Iterable, NamedTuple, Union
+from transcript_codec import SegmentFormatError, SegmentReader, decode_segments, encode_segments
+from transcript_segments import SegmentTable
+
+# (video_id, language_code, is_generated, translated_from); translated_from is the
+# source track's language code for a machine translation and '' otherwise
+CacheKey = Tuple[str, str, bool, str]
+# What callers probe for: (language_code, is_generated[, translated_from])
+TrackKey = Tuple[Any, ...]
+
+def _cache_key(video_id: str, track: TrackKey) -> CacheKey:
+    return (video_id, track[0], bool(track[1]), track[2] if len(track) > 2 else '')
+
+# Incremental blob I/O (Connection.blobopen) is new in Python 3.11
+_BLOBOPEN = hasattr(sqlite3.Connection, 'blobopen')
+
+DEFAULT_CACHE_PATH = os.path.join(
+    tempfile.gettempdir(), "youtube-transcript-mcp", "transcripts.db"
+)
+
+class CachedTranscript:
+    """A fetched transcript track together with its raw segments."""
+
+    __slots__ = (
+        'video_id', 'language', 'language_code', 'is_generated',
+        'segments', 'fetched_at', 'translated_from',
+    )
+
+    def __init__(
+        self,
+        video_id: str,
+        language: str,
+        language_code: str,
+        is_generated: bool,
+        segments: Union[SegmentTable, Iterable[Any]],
+        fetched_at: Optional[float] = None,
+        translated_from: str = ''
+    ):
+        self.video_id = video_id
+        self.language = language
+        self.language_code = language_code
+        self.is_generated = bool(is_generated)
+        if not isinstance(segments, SegmentTable):
+            segments = SegmentTable.from_entries(segments)
+        self.segments = segments
+        self.fetched_at = time.time() if fetched_at is None else fetched_at
+        # Source language code when YouTube machine-translated this track
+        self.translated_from = translated_from
+
+    @property
+    def key(self) -> CacheKey:
+        return (self.video_id, self.language_code, self.is_generated, self.translated_from)
+
+    def window(
+        self,
+        start_seconds: float = 0.0,
+        end_seconds: Optional[float] = None
+    ) -> List[Tuple[int, int]]:
+        """Return the index ranges of the segments overlapping [start_seconds, end_seconds).
+
+        See SegmentTable.window.
+        """
+        return self.segments.window(start_seconds, end_seconds)
+
+class TranscriptWindow(NamedTuple):
+    """The segments of a stored transcript inside a time window, read without the rest."""
+    video_id: str
+    language: str
+    language_code: str
+    is_generated: bool
+    translated_from: str
+    fetched_at: float
+    # Index ranges of the window's segments in the whole transcript
+    ranges: List[Tuple[int, int]]
+    # Just those segments, in order
+    segments: SegmentTable
+    # Start of the whole transcript's last segment, which sets its timestamp format
+    last_start: float
+
+class TranscriptStore:
+    """Persistent transcript store backed by a single SQLite file.
+
+    Segments are stored in the block-compressed encoding of transcript_codec, so a
+    time window can be read without decompressing the whole transcript. The database
+    runs in WAL mode so several server processes can read and write the same file
+    concurrently.
+    """
+
+    SCHEMA_VERSION = 4
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            path, timeout=30, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._migrate()
+
+    def _migrate(self) -> None:
+        """Create the schema, discarding entries written by an older layout."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+                if version != self.SCHEMA_VERSION:
+                    # It's a cache, so an incompatible layout is simply dropped
+                    self._conn.execute("DROP TABLE IF EXISTS transcripts")
+                self._conn.execute(
+                    """CREATE TABLE IF NOT EXISTS transcripts (
+                        video_id TEXT NOT NULL,
+                        language_code TEXT NOT NULL,
+                        is_generated INTEGER NOT NULL,
+                        translated_from TEXT NOT NULL,
+                        language TEXT NOT NULL,
+                        segments BLOB NOT NULL,
+                        fetched_at REAL NOT NULL,
+                        PRIMARY KEY (video_id, language_code, is_generated, translated_from)
+                    )"""
+                )
+                self._conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def get(self, key: CacheKey, max_age: float) -> Optional[CachedTranscript]:
+        """Return the stored transcript for a key if it is younger than max_age."""
+        video_id, language_code, is_generated, translated_from = _cache_key(key[0], key[1:])
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT language, segments, fetched_at FROM transcripts "
+                "WHERE video_id = ? AND language_code = ? AND is_generated = ? "
+                "AND translated_from = ? AND fetched_at > ?",
+                (video_id, language_code, int(is_generated), translated_from,
+                 time.time() - max_age),
+            ).fetchone()
+        if row is None:
+            return None
+        language, blob, fetched_at = row
+        try:
+            segments = decode_segments(blob)
+        except SegmentFormatError:
+            # e.g. written with zstd by a worker that has zstandard installed
+            return None
+        return CachedTranscript(
+            video_id, language, language_code, is_generated, segments, fetched_at,
+            translated_from
+        )
+
+    def get_window(
+        self,
+        key: CacheKey,
+        max_age: float,
+        start_seconds: float = 0.0,
+        end_seconds: Optional[float] = None
+    ) -> Optional[TranscriptWindow]:
+        """
+        Read only the segments overlapping [start_seconds, end_seconds) of a stored transcript.
+
+        The blob is opened for incremental I/O where sqlite3 supports it
+        (Python 3.11+), so just its index and the blocks covering the window are
+        read and decompressed.
+
+        Returns:
+            The window, with its index ranges in the whole transcript as
+            SegmentTable.window returns them, or None if the key isn't stored
+            or is too old
+        """
+        video_id, language_code, is_generated, translated_from = _cache_key(key[0], key[1:])
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT rowid, language, fetched_at FROM transcripts "
+                "WHERE video_id = ? AND language_code = ? AND is_generated = ? "
+                "AND translated_from = ? AND fetched_at > ?",
+                (video_id, language_code, int(is_generated), translated_from,
+                 time.time() - max_age),
+            ).fetchone()
+            if row is None:
+                return None
+            if _BLOBOPEN:
+                source = self._conn.blobopen("transcripts", "segments", row[0], readonly=True)
+            else:
+                # Before Python 3.11 the whole blob is read, though still only
+                # the window's blocks are decompressed
+                source = nullcontext(self._conn.execute(
+                    "SELECT segments FROM transcripts WHERE rowid = ?", (row[0],)
+                ).fetchone()[0])
+            with source as blob:
+                try:
+                    reader = SegmentReader(blob)
+                    ranges, segments = reader.window(start_seconds, end_seconds)
+                    last_start = reader.last_start()
+                except SegmentFormatError:
+                    return None
+        return TranscriptWindow(
+            video_id, row[1], language_code, is_generated, translated_from, row[2],
+            ranges, segments, last_start
+        )
+
+    def put(self, entry: CachedTranscript) -> None:
+        """Insert or replace a transcript."""
+        blob = encode_segments(entry.segments)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO transcripts "
+                "(video_id, language_code, is_generated, translated_from, language, "
+                "segments, fetched_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (entry.video_id, entry.language_code, int(entry.is_generated),
+                 entry.translated_from, entry.language, blob, entry.fetched_at),
+            )
+
+    def clear(self) -> None:
+        """Delete every stored transcript."""
+        with self._lock:
+            self._conn.execute("DELETE FROM transcripts")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+class TranscriptCache:
+    """Two-tier transcript cache: in-process LRU with TTL over an optional store.
+
+    Lookups check memory first, then the persistent store; entries found on disk
+    are promoted into memory. Counters are kept per lookup.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        ttl: float = 86400.0,
+        store: Optional[TranscriptStore] = None
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.store = store
+        self._entries: "OrderedDict[CacheKey, CachedTranscript]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._memory_bytes = 0
+        # Keys of in-memory entries already counted as expired
+        self._expired: Set[CacheKey] = set()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.stale_hits = 0
+
+    @classmethod
+    def from_env(cls) -> "TranscriptCache":
+        """Build a cache configured from TRANSCRIPT_CACHE_* environment variables.
+
+        Setting TRANSCRIPT_CACHE_PATH to an empty string disables the disk tier.
+        """
+        path = os.getenv("TRANSCRIPT_CACHE_PATH", DEFAULT_CACHE_PATH)
+        store = None
+        if path:
+            try:
+                store = TranscriptStore(path)
+            except (OSError, sqlite3.Error):
+                # Read-only or missing filesystem: fall back to memory only
+                store = None
+        return cls(
+            max_entries=int(os.getenv("TRANSCRIPT_CACHE_SIZE", "256")),
+            ttl=float(os.getenv("TRANSCRIPT_CACHE_TTL", "86400")),
+            store=store,
+        )
+
+    def _lookup(self, key: CacheKey) -> Optional[CachedTranscript]:
+        """Find an entry in either tier without touching the hit/miss counters."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if now - entry.fetched_at < self.ttl:
+                    self._entries.move_to_end(key)
+                    return entry
+                # Expired entries stay until replaced or evicted, so find_stale
+                # can still serve them while YouTube is unreachable; count each once
+                if key not in self._expired:
+                    self._expired.add(key)
+                    self.expirations += 1
+
+        if self.store is None:
+            return None
+        entry = self.store.get(key, self.ttl)
+        if entry is not None:
+            with self._lock:
+                self.disk_hits += 1
+            self._remember(entry)
+        return entry
+
+    def _remember(self, entry: CachedTranscript) -> None:
+        with self._lock:
+            previous = self._entries.get(entry.key)
+            if previous is not None:
+                self._memory_bytes -= previous.segments.nbytes()
+                self._expired.discard(entry.key)
+            self._entries[entry.key] = entry
+            self._entries.move_to_end(entry.key)
+            self._memory_bytes += entry.segments.nbytes()
+            while len(self._entries) > self.max_entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._memory_bytes -= evicted.segments.nbytes()
+                self._expired.discard(evicted.key)
+                self.evictions += 1
+
+    def find(
+        self,
+        video_id: str,
+        tracks: Iterable[TrackKey]
+    ) -> Optional[CachedTranscript]:
+        """Return the first cached track among (language_code, is_generated[, translated_from]).
+
+        Counts as a single hit or miss regardless of how many tracks are probed.
+        """
+        for track in tracks:
+            entry = self._lookup(_cache_key(video_id, track))
+            if entry is not None:
+                with self._lock:
+                    self.hits += 1
+                return entry
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def find_window(
+        self,
+        video_id: str,
+        tracks: Iterable[TrackKey],
+        start_seconds: float = 0.0,
+        end_seconds: Optional[float] = None
+    ) -> Optional[TranscriptWindow]:
+        """Read a time window of the first track among tracks from the disk store.
+
+        Probes in the same order as find, but returns None as soon as a track is
+        held in memory, where a window is cheaper to take from the full table,
+        and when no track is stored. Only a returned window counts, as a hit;
+        the window isn't kept in memory, since that would need the whole track.
+        """
+        if self.store is None:
+            return None
+        now = time.time()
+        for track in tracks:
+            key = _cache_key(video_id, track)
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and now - entry.fetched_at < self.ttl:
+                    return None
+            window = self.store.get_window(key, self.ttl, start_seconds, end_seconds)
+            if window is not None:
+                with self._lock:
+                    self.hits += 1
+                    self.disk_hits += 1
+                return window
+        return None
+
+    def get(
+        self,
+        video_id: str,
+        language_code: str,
+        is_generated: bool,
+        translated_from: str = ''
+    ) -> Optional[CachedTranscript]:
+        """Return a cached transcript track, or None on a miss."""
+        return self.find(video_id, [(language_code, is_generated, translated_from)])
+
+    def peek(
+        self,
+        video_id: str,
+        language_code: str,
+        is_generated: bool,
+        translated_from: str = ''
+    ) -> Optional[CachedTranscript]:
+        """Like get, but without counting a hit or miss."""
+        return self._lookup(_cache_key(video_id, (language_code, is_generated, translated_from)))
+
+    def find_stale(
+        self,
+        video_id: str,
+        tracks: Iterable[TrackKey]
+    ) -> Optional[CachedTranscript]:
+        """Like find, but ignoring the TTL; for when YouTube can't be reached."""
+        for track in tracks:
+            key = _cache_key(video_id, track)
+            with self._lock:
+                entry = self._entries.get(key)
+            if entry is None and self.store is not None:
+                entry = self.store.get(key, float('inf'))
+            if entry is not None:
+                with self._lock:
+                    self.stale_hits += 1
+                return entry
+        return None
+
+    def put(self, entry: CachedTranscript) -> None:
+        """Add a transcript to memory and write it through to the store."""
+        self._remember(entry)
+        if self.store is not None:
+            self.store.put(entry)
+
+    def clear(self) -> None:
+        """Drop all entries from both tiers."""
+        with self._lock:
+            self._entries.clear()
+            self._expired.clear()
+            self._memory_bytes = 0
+        if self.store is not None:
+            self.store.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss/eviction counters and the current memory size."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'stale_hits': self.stale_hits,
+                'entries': len(self._entries),
+                'memory_bytes': self._memory_bytes,
+            }
+
+class TrackInfo(NamedTuple):
+    """One transcript track listed for a video, or a translation of one."""
+    language: str
+    language_code: str
+    is_generated: bool
+    is_translatable: bool
+    # (language_code, language) pairs YouTube can translate this track into
+    translation_languages: Tuple[Tuple[str, str], ...] = ()
+    # For a translation: the source track's language code
+    translated_from: str = ''
+
+    @classmethod
+    def from_transcript(cls, transcript: Any) -> "TrackInfo":
+        is_translatable = bool(getattr(transcript, 'is_translatable', False))
+        return cls(
+            transcript.language,
+            transcript.language_code,
+            bool(transcript.is_generated),
+            is_translatable,
+            tuple(
+                (target.language_code, target.language)
+                for target in getattr(transcript, 'translation_languages', None) or ()
+            ) if is_translatable else (),
+        )
+
+    @property
+    def key(self) -> TrackKey:
+        return (self.language_code, self.is_generated, self.translated_from)
+
+    def translation(self, language_code: str) -> Optional["TrackInfo"]:
+        """The track YouTube would produce translating this one, or None if it can't."""
+        for code, language in self.translation_languages:
+            if code == language_code:
+                # Keyed by the source's type so translations of different tracks don't collide
+                return TrackInfo(
+                    language, code, self.is_generated, False, (), self.language_code
+                )
+        return None
+
+class VideoListing:
+    """The tracks available for a video plus memoized language resolutions.
+
+    Keeps the upstream Transcript objects so a track can be fetched without
+    listing the video again.
+    """
+
+    __slots__ = ('video_id', 'tracks', 'transcripts', 'resolved', 'expires_at')
+
+    def __init__(self, video_id: str, transcript_list: Iterable[Any], expires_at: float):
+        self.video_id = video_id
+        self.tracks: List[TrackInfo] = []
+        self.transcripts: Dict[Tuple[str, bool], Any] = {}
+        for transcript in transcript_list:
+            track = TrackInfo.from_transcript(transcript)
+            self.tracks.append(track)
+            self.transcripts[(track.language_code, track.is_generated)] = transcript
+        # requested language (None for the default) -> resolved track or None
+        self.resolved: Dict[Optional[str], Optional[TrackInfo]] = {}
+        self.expires_at = expires_at
+
+class TranscriptMetadataCache:
+    """In-memory LRU of per-video track listings and cached upstream failures.
+
+    Failures such as TranscriptsDisabled are kept for a shorter TTL than listings
+    and re-raised on lookup, so a broken video doesn't hit YouTube on every call.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: float = 3600.0,
+        negative_ttl: float = 300.0
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        # video_id -> VideoListing or (exception, expires_at)
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_env(cls) -> "TranscriptMetadataCache":
+        """Build a cache configured from METADATA_CACHE_* environment variables."""
+        return cls(
+            max_entries=int(os.getenv("METADATA_CACHE_SIZE", "1024")),
+            ttl=float(os.getenv("METADATA_CACHE_TTL", "3600")),
+            negative_ttl=float(os.getenv("NEGATIVE_CACHE_TTL", "300")),
+        )
+
+    def get(self, video_id: str) -> Optional[VideoListing]:
+        """Return the cached listing, re-raise a cached failure, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(video_id)
+            if entry is None:
+                self.misses += 1
+                return None
+            listing = entry if isinstance(entry, VideoListing) else None
+            expires_at = listing.expires_at if listing else entry[1]
+            if time.time() >= expires_at:
+                del self._entries[video_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(video_id)
+            if listing:
+                self.hits += 1
+                return listing
+            self.negative_hits += 1
+        raise entry[0].with_traceback(None)
+
+    def peek(self, video_id: str) -> Optional[VideoListing]:
+        """Like get, but without counting, and None for a cached failure too."""
+        with self._lock:
+            entry = self._entries.get(video_id)
+        if isinstance(entry, VideoListing) and time.time() < entry.expires_at:
+            return entry
+        return None
+
+    def put(self, video_id: str, transcript_list: Iterable[Any]) -> VideoListing:
+        """Cache the tracks of a freshly listed video."""
+        listing = VideoListing(video_id, transcript_list, time.time() + self.ttl)
+        self._store(video_id, listing)
+        return listing
+
+    def put_error(self, video_id: str, error: Exception) -> None:
+        """Cache an upstream failure for the negative TTL."""
+        self._store(video_id, (error, time.time() + self.negative_ttl))
+
+    def _store(self, video_id: str, entry: Any) -> None:
+        with self._lock:
+            self._entries[video_id] = entry
+            self._entries.move_to_end(video_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss/eviction counters and the current size."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'negative_hits': self.negative_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+            }
@@ -0,0 +1,293 @@
+"""
+Versioned binary encoding of transcript segments for the persistent store.
+Start times are delta-encoded and durations quantized to milliseconds, and
+segments are grouped into independently compressed blocks (zstd when the
+zstandard package is installed, zlib otherwise) behind a small index, so a
+time window can be read from a blob or an mmap'ed file without decompressing
+the whole transcript.
+
+Layout, little-endian:
+    header   magic "YTSG", version, codec, segments per block, segments, blocks
+    index    per block: first start (ms), latest end (ms), first segment,
+             byte offset and length of the compressed block
+    blocks   per segment start delta (ms), duration (ms) and text length
+             (characters) as uint32 columns, then the texts as UTF-8
+"""
+
+import mmap
+import struct
+import sys
+import zlib
+from array import array
+from contextlib import contextmanager
+from itertools import accumulate, repeat
+from operator import add, truediv
+from typing import Optional, List, Any, Iterable, Iterator, NamedTuple, Tuple
+from transcript_segments import SegmentTable
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+MAGIC = b'YTSG'
+FORMAT_VERSION = 1
+
+CODEC_ZLIB = 1
+CODEC_ZSTD = 2
+CODECS = {'zlib': CODEC_ZLIB, 'zstd': CODEC_ZSTD}
+DEFAULT_CODEC = 'zstd' if zstandard is not None else 'zlib'
+
+# Segments per compressed block: a window read decompresses whole blocks
+BLOCK_SEGMENTS = 256
+
+_HEADER = struct.Struct('<4sBBHII')
+_INDEX = struct.Struct('<QQIII')
+_BIG_ENDIAN = sys.byteorder == 'big'
+
+class SegmentFormatError(ValueError):
+    """Raised for data that isn't a segment encoding this module can read."""
+
+class BlockInfo(NamedTuple):
+    """Index entry of one compressed block."""
+    first_start_ms: int
+    max_end_ms: int
+    first_segment: int
+    offset: int
+    length: int
+
+def _ms(seconds: float) -> int:
+    return max(0, round(seconds * 1000))
+
+def _uint32(values: Any) -> bytes:
+    column = array('I', values)
+    if _BIG_ENDIAN:
+        column.byteswap()
+    return column.tobytes()
+
+def _compress(codec: int, payload: bytes) -> bytes:
+    if codec == CODEC_ZSTD:
+        return zstandard.ZstdCompressor(level=9).compress(payload)
+    return zlib.compress(payload, 6)
+
+def _decompress(codec: int, block: Any) -> bytes:
+    if codec == CODEC_ZLIB:
+        return zlib.decompress(block)
+    if zstandard is None:
+        raise SegmentFormatError("zstd-compressed segments need the zstandard package")
+    return zstandard.ZstdDecompressor().decompress(block)
+
+def encode_segments(
+    table: SegmentTable,
+    codec: Optional[str] = None,
+    block_segments: int = BLOCK_SEGMENTS
+) -> bytes:
+    """
+    Encode a SegmentTable, with times rounded to the millisecond.
+
+    Args:
+        table: Segments to encode
+        codec: 'zlib' or 'zstd' (default: zstd when available)
+        block_segments: Segments per compressed block
+
+    Returns:
+        The encoded bytes
+    """
+    codec = codec or DEFAULT_CODEC
+    if codec not in CODECS or (codec == 'zstd' and zstandard is None):
+        raise SegmentFormatError(f"unsupported codec: {codec}")
+    codec_id = CODECS[codec]
+    starts = [_ms(start) for start in table.starts]
+    durations = [_ms(duration) for duration in table.durations]
+    offsets = table.offsets
+
+    index = []
+    blocks = []
+    position = _HEADER.size + _INDEX.size * -(-len(starts) // block_segments)
+    for first in range(0, len(starts), block_segments):
+        stop = min(first + block_segments, len(starts))
+        block_starts = starts[first:stop]
+        payload = b''.join((
+            # The first delta is from the block's own start, kept in the index
+            _uint32([0] + [b - a for a, b in zip(block_starts, block_starts[1:])]),
+            _uint32(durations[first:stop]),
+            _uint32(offsets[i + 1] - offsets[i] - 1 for i in range(first, stop)),
+            table.joined_text(first, stop).encode('utf-8'),
+        ))
+        block = _compress(codec_id, payload)
+        max_end = max(s + d for s, d in zip(block_starts, durations[first:stop]))
+        index.append(_INDEX.pack(block_starts[0], max_end, first, position, len(block)))
+        blocks.append(block)
+        position += len(block)
+
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, codec_id, block_segments, len(starts), len(blocks))
+    return b''.join([header, *index, *blocks])
+
+class SegmentReader:
+    """
+    Reads segments from an encoding without loading more of it than needed.
+
+    data can be bytes, a memoryview, an mmap or an sqlite3.Blob: anything
+    that supports len() and slicing. Buffers are read through a memoryview,
+    so slices of an mmap are not copied before decompression.
+    """
+
+    def __init__(self, data: Any):
+        try:
+            self._data = memoryview(data)
+        except TypeError:
+            # e.g. sqlite3.Blob, where each slice is read on demand
+            self._data = data
+        if len(self._data) < _HEADER.size:
+            raise SegmentFormatError("truncated segment header")
+        magic, version, codec, block_segments, segments, blocks = _HEADER.unpack(
+            bytes(self._data[:_HEADER.size])
+        )
+        if magic != MAGIC:
+            raise SegmentFormatError("not a segment encoding")
+        if version != FORMAT_VERSION:
+            raise SegmentFormatError(f"unsupported segment format version {version}")
+        if codec not in CODECS.values():
+            raise SegmentFormatError(f"unknown codec {codec}")
+        self.codec = codec
+        self.block_segments = block_segments
+        self.segments = segments
+        raw = bytes(self._data[_HEADER.size:_HEADER.size + _INDEX.size * blocks])
+        if len(raw) != _INDEX.size * blocks:
+            raise SegmentFormatError("truncated segment index")
+        self.blocks: List[BlockInfo] = [BlockInfo(*entry) for entry in _INDEX.iter_unpack(raw)]
+        # Blocks decompressed so far, for tests and benchmarks
+        self.blocks_read = 0
+
+    def __len__(self) -> int:
+        return self.segments
+
+    def _block(self, number: int) -> Tuple[array, array, array, str]:
+        """Decode one block into start/duration seconds, text lengths and text."""
+        info = self.blocks[number]
+        stop = self.blocks[number + 1].first_segment if number + 1 < len(self.blocks) else self.segments
+        count = stop - info.first_segment
+        try:
+            payload = _decompress(self.codec, self._data[info.offset:info.offset + info.length])
+        except zlib.error as e:
+            raise SegmentFormatError(f"corrupt block {number}: {e}") from None
+        self.blocks_read += 1
+
+        columns = array('I')
+        columns.frombytes(payload[:12 * count])
+        if _BIG_ENDIAN:
+            columns.byteswap()
+        starts = array('d', map(truediv, accumulate(columns[:count], initial=info.first_start_ms), repeat(1000.0)))
+        del starts[0]
+        durations = array('d', map(truediv, columns[count:2 * count], repeat(1000.0)))
+        return starts, durations, columns[2 * count:], payload[12 * count:].decode('utf-8')
+
+    def _read_blocks(self, numbers: Iterable[int]) -> Tuple[List[Tuple[int, int, int]], SegmentTable]:
+        """
+        Decode the given blocks, in ascending order, into one table.
+
+        Also returns (table index, transcript index, count) per run of
+        consecutive blocks, to map indices in the table back to the transcript.
+        """
+        starts, durations, lengths, texts = array('d'), array('d'), array('I'), []
+        chunks: List[Tuple[int, int, int]] = []
+        for number in numbers:
+            block_starts, block_durations, block_lengths, text = self._block(number)
+            first = self.blocks[number].first_segment
+            if chunks and chunks[-1][1] + chunks[-1][2] == first:
+                chunks[-1] = (chunks[-1][0], chunks[-1][1], chunks[-1][2] + len(block_starts))
+            else:
+                chunks.append((len(starts), first, len(block_starts)))
+            starts.extend(block_starts)
+            durations.extend(block_durations)
+            lengths.extend(block_lengths)
+            texts.append(text)
+        offsets = array('I', accumulate(map(add, lengths, repeat(1)), initial=0))
+        return chunks, SegmentTable(starts, durations, '\n'.join(texts), offsets)
+
+    def read_all(self) -> SegmentTable:
+        """Decode every segment."""
+        return self._read_blocks(range(len(self.blocks)))[1]
+
+    def window(
+        self,
+        start_seconds: float = 0.0,
+        end_seconds: Optional[float] = None
+    ) -> Tuple[List[Tuple[int, int]], SegmentTable]:
+        """
+        Decode only the segments overlapping [start_seconds, end_seconds).
+
+        Selects the same segments as SegmentTable.window over the whole
+        transcript, but only decompresses the blocks holding one: blocks that
+        end before the window are skipped even when a long caption in an
+        earlier block reaches into it.
+
+        Returns:
+            The selected segments' index ranges in the whole transcript, and a
+            table holding just those segments
+        """
+        start_ms = start_seconds * 1000
+        end_ms = float('inf') if end_seconds is None else end_seconds * 1000
+        blocks = self.blocks
+        # One millisecond of slack either side, so rounding never drops a block;
+        # the exact cut is made on the decoded times below
+        stop = 0
+        while stop < len(blocks) and blocks[stop].first_start_ms - 1 < end_ms:
+            stop += 1
+        chunks, part = self._read_blocks(
+            number for number in range(stop) if blocks[number].max_end_ms + 1 >= start_ms
+        )
+
+        selected = part.window(start_seconds, end_seconds)
+        ranges: List[Tuple[int, int]] = []
+        for lo, hi in selected:
+            for position, first, count in chunks:
+                a, b = max(lo, position), min(hi, position + count)
+                if b <= a:
+                    continue
+                a, b = a - position + first, b - position + first
+                if ranges and ranges[-1][1] == a:
+                    ranges[-1] = (ranges[-1][0], b)
+                else:
+                    ranges.append((a, b))
+        return ranges, part.select(selected)
+
+    def last_start(self) -> float:
+        """Start time of the last segment in seconds (0.0 if none); decodes only the last block."""
+        if not self.blocks:
+            return 0.0
+        return self._block(len(self.blocks) - 1)[0][-1]
+
+    def close(self) -> None:
+        """Release the buffer view, so an mmap under it can be closed."""
+        if isinstance(self._data, memoryview):
+            self._data.release()
+
+def decode_segments(data: Any) -> SegmentTable:
+    """Decode a whole encoding back into a SegmentTable."""
+    reader = SegmentReader(data)
+    try:
+        return reader.read_all()
+    finally:
+        reader.close()
+
+def write_file(path: str, table: SegmentTable, codec: Optional[str] = None) -> int:
+    """Write an encoded transcript to path; return its size in bytes."""
+    data = encode_segments(table, codec)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return len(data)
+
+@contextmanager
+def open_file(path: str) -> Iterator[SegmentReader]:
+    """Map an encoded transcript file read-only and yield a reader over it."""
+    with open(path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        reader = SegmentReader(mapped)
+        try:
+            yield reader
+        finally:
+            reader.close()
+    finally:
+        mapped.close()
@@ -0,0 +1,66 @@
+"""
+Structured (JSON) output for the transcript tools.
+Segments are encoded straight from a SegmentTable's columns, either as one
+object per segment or, more compactly, as [start, duration, text] rows under a
+single field list. Serialization uses orjson when it is installed and falls
+back to the standard library encoder.
+"""
+
+import json
+from typing import Any, Dict, List, Sequence, Tuple
+from transcript_segments import SegmentTable
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+OUTPUT_FORMATS = ('text', 'json', 'segments')
+
+# Column order of a row in the compact "segments" encoding
+SEGMENT_FIELDS = ('start', 'duration', 'text')
+
+JSON_ENCODER = 'orjson' if orjson is not None else 'json'
+
+def dumps(value: Any) -> str:
+    """Encode value as compact JSON text, keeping non-ASCII characters as is."""
+    if orjson is not None:
+        return orjson.dumps(value).decode('utf-8')
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+def _columns(table: SegmentTable, first: int, stop: int) -> Tuple[Any, Any, List[str]]:
+    """Starts, durations and texts of segments[first:stop] as column slices."""
+    chunk = table.joined_text(first, stop)
+    if chunk.count('\n') == stop - first - 1:
+        # No segment text holds a newline, so one split recovers them all
+        texts = chunk.split('\n') if stop > first else []
+    else:
+        texts = [table.text(index) for index in range(first, stop)]
+    return table.starts[first:stop].tolist(), table.durations[first:stop].tolist(), texts
+
+def segment_rows(table: SegmentTable, ranges: Sequence[Tuple[int, int]]) -> List[Tuple[float, float, str]]:
+    """(start, duration, text) for every segment in the given index ranges; encoded as arrays."""
+    rows: List[Tuple[float, float, str]] = []
+    for first, stop in ranges:
+        rows.extend(zip(*_columns(table, first, stop)))
+    return rows
+
+def segment_objects(table: SegmentTable, ranges: Sequence[Tuple[int, int]]) -> List[Dict[str, Any]]:
+    """{'start', 'duration', 'text'} for every segment in the given index ranges."""
+    objects: List[Dict[str, Any]] = []
+    for first, stop in ranges:
+        objects.extend(
+            {'start': start, 'duration': duration, 'text': text}
+            for start, duration, text in zip(*_columns(table, first, stop))
+        )
+    return objects
+
+def encode_segments(
+    table: SegmentTable,
+    ranges: Sequence[Tuple[int, int]],
+    output_format: str
+) -> Dict[str, Any]:
+    """The segments part of a structured response in the requested encoding."""
+    if output_format == 'segments':
+        return {'fields': list(SEGMENT_FIELDS), 'segments': segment_rows(table, ranges)}
+    return {'segments': segment_objects(table, ranges)}
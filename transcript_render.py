@@ -0,0 +1,175 @@
+"""
+Transcript rendering for the YouTube Transcript MCP Server.
+Turns a SegmentTable into "[MM:SS] text" lines (or "[H:MM:SS]" for videos an
+hour or longer). Fully rendered variants are cached per transcript under a
+byte budget, and any page of a cached variant is a single string slice.
+"""
+
+import os
+import sys
+import threading
+from array import array
+from collections import OrderedDict
+from itertools import accumulate
+from typing import Optional, Dict, Any, Hashable, Tuple
+from transcript_segments import SegmentTable
+
+# "MM:SS" for every second of an hour, so most formatting is a list lookup
+_MINUTES_SECONDS = [f"{m:02d}:{s:02d}" for m in range(60) for s in range(60)]
+_SHORT_STAMPS = [f"[{stamp}]" for stamp in _MINUTES_SECONDS]
+
+def format_timestamp(seconds: int, hours: bool = False) -> str:
+    """Format whole seconds as [MM:SS], or [H:MM:SS] when hours is set."""
+    if hours:
+        return f"[{seconds // 3600}:{_MINUTES_SECONDS[seconds % 3600]}]"
+    if seconds < 3600:
+        return _SHORT_STAMPS[seconds]
+    minutes, seconds = divmod(seconds, 60)
+    return f"[{minutes:02d}:{seconds:02d}]"
+
+def uses_hours(table: SegmentTable) -> bool:
+    """Whether a transcript runs long enough to need H:MM:SS timestamps."""
+    return bool(table.starts) and table.starts[-1] >= 3600
+
+def render_segments(
+    table: SegmentTable,
+    include_timestamps: bool = True,
+    start: int = 0,
+    stop: Optional[int] = None,
+    hours: Optional[bool] = None
+) -> str:
+    """Render table[start:stop] as newline-separated lines, without caching.
+
+    hours overrides uses_hours(table), for a table holding part of a transcript.
+    """
+    stop = len(table) if stop is None else min(stop, len(table))
+    if not include_timestamps:
+        # Texts are stored newline-joined, so the whole range is one slice
+        return table.joined_text(start, stop)
+
+    if hours is None:
+        hours = uses_hours(table)
+    starts = table.starts
+    text = table.text
+    # Upstream occasionally reports a slightly negative start for the first caption
+    return '\n'.join(
+        f"{format_timestamp(max(0, int(starts[i])), hours)} {text(i)}" for i in range(start, stop)
+    )
+
+class RenderedTranscript:
+    """A fully rendered variant plus the offset of each line, for slicing pages."""
+
+    __slots__ = ('text', 'offsets')
+
+    def __init__(self, text: str, offsets: array):
+        self.text = text
+        self.offsets = offsets
+
+    @classmethod
+    def render(cls, table: SegmentTable) -> "RenderedTranscript":
+        hours = uses_hours(table)
+        starts = table.starts
+        lines = [
+            f"{format_timestamp(max(0, int(starts[i])), hours)} {table.text(i)}"
+            for i in range(len(table))
+        ]
+        offsets = array('I', [0])
+        offsets.extend(accumulate(len(line) + 1 for line in lines))
+        return cls('\n'.join(lines), offsets)
+
+    def lines(self, start: int, stop: int) -> str:
+        if start >= stop:
+            return ''
+        return self.text[self.offsets[start]:self.offsets[stop] - 1]
+
+    def nbytes(self) -> int:
+        # str sizes follow the widest character, so non-Latin text costs 2-4 bytes per char
+        return sys.getsizeof(self.text) + sys.getsizeof(self.offsets)
+
+class RenderCache:
+    """LRU of rendered transcript variants, bounded by total size in bytes."""
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, RenderedTranscript]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_env(cls) -> "RenderCache":
+        """Build a cache sized by RENDER_CACHE_BYTES (0 disables it)."""
+        return cls(max_bytes=int(os.getenv("RENDER_CACHE_BYTES", str(64 * 1024 * 1024))))
+
+    def get(self, key: Hashable) -> Optional[RenderedTranscript]:
+        with self._lock:
+            rendered = self._entries.get(key)
+            if rendered is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return rendered
+
+    def put(self, key: Hashable, rendered: RenderedTranscript) -> None:
+        size = rendered.nbytes()
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.nbytes()
+            self._entries[key] = rendered
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes()
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss/eviction counters and the bytes held by rendered text."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'memory_bytes': self._bytes,
+            }
+
+render_cache = RenderCache.from_env()
+
+def render_transcript(
+    transcript: Any,
+    include_timestamps: bool = True,
+    start: int = 0,
+    stop: Optional[int] = None
+) -> str:
+    """
+    Render a CachedTranscript's segments[start:stop], reusing cached variants.
+
+    A full render with timestamps is cached; afterwards it and every page of it
+    are slices. Pages requested before that are rendered on their own, so a
+    page never costs more than its own size. Without timestamps the segment
+    table's text buffer already is the rendered text.
+    """
+    table = transcript.segments
+    stop = len(table) if stop is None else min(stop, len(table))
+    if not include_timestamps:
+        return table.joined_text(start, stop)
+
+    key: Tuple[Any, ...] = (transcript.key, transcript.fetched_at, 'timestamps')
+    rendered = render_cache.get(key)
+    if rendered is None:
+        if start > 0 or stop < len(table):
+            return render_segments(table, True, start, stop)
+        rendered = RenderedTranscript.render(table)
+        render_cache.put(key, rendered)
+    return rendered.lines(start, stop)
@@ -0,0 +1,220 @@
+"""
+Full-text search over fetched transcripts.
+Each transcript is split into chunks of consecutive segments and indexed with
+SQLite FTS5 as it is fetched, so "which videos mention X" is answered locally,
+ranked by bm25, without going back to YouTube.
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import List, Dict, NamedTuple
+from transcript_cache import DEFAULT_CACHE_PATH, CachedTranscript
+
+DEFAULT_INDEX_PATH = os.path.join(os.path.dirname(DEFAULT_CACHE_PATH), "search.db")
+
+# Chunk rowids are (document id << CHUNK_BITS) | chunk number, so a document's
+# chunks form one rowid range that can be replaced without scanning the index
+CHUNK_BITS = 20
+
+_WORD_RE = re.compile(r'\w+')
+
+class SearchHit(NamedTuple):
+    """One ranked match: the chunk's video, track and start time plus a snippet."""
+    video_id: str
+    language_code: str
+    start: float
+    snippet: str
+    score: float
+
+def build_query(query: str) -> str:
+    """Turn free text into an FTS5 query matching every word, with no operators."""
+    return ' '.join(f'"{word}"' for word in _WORD_RE.findall(query))
+
+class TranscriptIndex:
+    """FTS5 index of transcript chunks, one document per transcript track.
+
+    Like the transcript store it uses one SQLite file in WAL mode, so several
+    server processes can share it. Use ':memory:' for a process-local index.
+    """
+
+    SCHEMA_VERSION = 1
+
+    def __init__(self, path: str, chunk_seconds: float = 30.0, max_candidates: int = 5000):
+        self.path = path
+        self.chunk_seconds = chunk_seconds
+        # bm25 is scored for every matching chunk, so queries made only of very
+        # common words rank just the newest max_candidates matches (0: no limit)
+        self.max_candidates = max_candidates
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            path, timeout=30, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._migrate()
+        self.queries = 0
+        self.capped = 0
+        self.failed_adds = 0
+
+    @classmethod
+    def from_env(cls) -> "TranscriptIndex":
+        """Build an index at TRANSCRIPT_INDEX_PATH; an empty value keeps it in memory."""
+        path = os.getenv("TRANSCRIPT_INDEX_PATH", DEFAULT_INDEX_PATH) or ":memory:"
+        chunk_seconds = float(os.getenv("TRANSCRIPT_INDEX_CHUNK_SECONDS", "30"))
+        max_candidates = int(os.getenv("TRANSCRIPT_SEARCH_MAX_CANDIDATES", "5000"))
+        try:
+            return cls(path, chunk_seconds, max_candidates)
+        except (OSError, sqlite3.Error):
+            # Read-only or missing filesystem: search only what this process fetches
+            return cls(":memory:", chunk_seconds, max_candidates)
+
+    def _migrate(self) -> None:
+        """Create the schema, discarding an index written by an older layout."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+                if version != self.SCHEMA_VERSION:
+                    # Rebuilt as transcripts are fetched again
+                    self._conn.execute("DROP TABLE IF EXISTS documents")
+                    self._conn.execute("DROP TABLE IF EXISTS chunks")
+                self._conn.execute(
+                    """CREATE TABLE IF NOT EXISTS documents (
+                        id INTEGER PRIMARY KEY,
+                        video_id TEXT NOT NULL,
+                        language_code TEXT NOT NULL,
+                        is_generated INTEGER NOT NULL,
+                        indexed_at REAL NOT NULL,
+                        UNIQUE (video_id, language_code, is_generated)
+                    )"""
+                )
+                self._conn.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS chunks USING fts5("
+                    "text, start UNINDEXED, tokenize='unicode61 remove_diacritics 2')"
+                )
+                self._conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _chunks(self, entry: CachedTranscript) -> List[tuple]:
+        """Group consecutive segments into (start, text) chunks of about chunk_seconds."""
+        table = entry.segments
+        starts = table.starts
+        chunks = []
+        first = 0
+        for index in range(1, len(table) + 1):
+            if index == len(table) or starts[index] - starts[first] >= self.chunk_seconds:
+                chunks.append((starts[first], table.joined_text(first, index).replace('\n', ' ')))
+                first = index
+        return chunks
+
+    def add(self, entry: CachedTranscript) -> None:
+        """Index a transcript track, replacing any earlier version of it."""
+        chunks = self._chunks(entry)
+        with self._lock:
+            try:
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    row = self._conn.execute(
+                        "SELECT id FROM documents "
+                        "WHERE video_id = ? AND language_code = ? AND is_generated = ?",
+                        (entry.video_id, entry.language_code, int(entry.is_generated)),
+                    ).fetchone()
+                    if row is None:
+                        document_id = self._conn.execute(
+                            "INSERT INTO documents "
+                            "(video_id, language_code, is_generated, indexed_at) VALUES (?, ?, ?, ?)",
+                            (entry.video_id, entry.language_code, int(entry.is_generated), time.time()),
+                        ).lastrowid
+                    else:
+                        document_id = row[0]
+                        self._conn.execute(
+                            "DELETE FROM chunks WHERE rowid BETWEEN ? AND ?",
+                            (document_id << CHUNK_BITS, ((document_id + 1) << CHUNK_BITS) - 1),
+                        )
+                        self._conn.execute(
+                            "UPDATE documents SET indexed_at = ? WHERE id = ?",
+                            (time.time(), document_id),
+                        )
+                    self._conn.executemany(
+                        "INSERT INTO chunks (rowid, start, text) VALUES (?, ?, ?)",
+                        [
+                            ((document_id << CHUNK_BITS) | number, start, text)
+                            for number, (start, text) in enumerate(chunks[:1 << CHUNK_BITS])
+                        ],
+                    )
+                    self._conn.execute("COMMIT")
+                except Exception:
+                    self._conn.execute("ROLLBACK")
+                    raise
+            except sqlite3.Error:
+                # Counted here; the caller decides whether a missed index entry matters
+                self.failed_adds += 1
+                raise
+
+    def search(self, query: str, limit: int = 10) -> List[SearchHit]:
+        """
+        Return the best-matching chunks for a free-text query.
+
+        Args:
+            query: Words that must all appear in a chunk (FTS5 operators are ignored)
+            limit: Maximum number of hits
+
+        Returns:
+            Hits ordered by bm25 relevance, best first
+        """
+        match = build_query(query)
+        if not match or limit <= 0:
+            return []
+        with self._lock:
+            self.queries += 1
+            floor = 0
+            if self.max_candidates > 0:
+                # Walking rowids is much cheaper than scoring; when there are more
+                # matches than candidates, only rank those at or above the cutoff.
+                # The row after the cutoff tells "more" apart from "exactly as many"
+                rows = self._conn.execute(
+                    "SELECT rowid FROM chunks WHERE chunks MATCH ? "
+                    "ORDER BY rowid DESC LIMIT 2 OFFSET ?",
+                    (match, self.max_candidates - 1),
+                ).fetchall()
+                if len(rows) > 1:
+                    floor = rows[0][0]
+                    self.capped += 1
+            rows = self._conn.execute(
+                "SELECT documents.video_id, documents.language_code, chunks.start, "
+                "snippet(chunks, 0, '[', ']', '...', 16), chunks.rank "
+                "FROM chunks JOIN documents ON documents.id = (chunks.rowid >> ?) "
+                "WHERE chunks MATCH ? AND chunks.rowid >= ? ORDER BY chunks.rank LIMIT ?",
+                (CHUNK_BITS, match, floor, limit),
+            ).fetchall()
+        return [SearchHit(*row) for row in rows]
+
+    def clear(self) -> None:
+        """Delete every indexed transcript."""
+        with self._lock:
+            self._conn.execute("DELETE FROM chunks")
+            self._conn.execute("DELETE FROM documents")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def stats(self) -> Dict[str, int]:
+        """Return how many transcripts are indexed and how many queries were served."""
+        with self._lock:
+            documents = self._conn.execute("SELECT count(*) FROM documents").fetchone()[0]
+            return {
+                'documents': documents,
+                'queries': self.queries,
+                'capped_queries': self.capped,
+                'failed_adds': self.failed_adds,
+            }
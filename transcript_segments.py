@@ -0,0 +1,277 @@
+"""
+Compact column-oriented storage for transcript segments.
+Start times and durations live in parallel array('d') columns and all segment
+texts share one string buffer addressed by offsets, instead of one Python
+object (and dict) per segment.
+"""
+
+import sys
+from array import array
+from bisect import bisect_left
+from itertools import accumulate
+from typing import Optional, List, Dict, Any, Iterable, Iterator, Sequence, Tuple
+
+# Segments a window lookup walks back through linearly before it switches to
+# the end-time tree (a long caption can make the walk span the whole table)
+_LINEAR_SCAN = 64
+
+def slice_ranges(ranges: Sequence[Tuple[int, int]], start: int, stop: int) -> List[Tuple[int, int]]:
+    """
+    Return positions [start, stop) of the segments ranges select, as index ranges.
+
+    Positions count through the ranges in order, so slice_ranges([(0, 2), (5, 9)], 1, 4)
+    is [(1, 2), (5, 7)].
+    """
+    result = []
+    position = 0
+    for lo, hi in ranges:
+        if position >= stop:
+            break
+        a = max(start - position, 0)
+        b = min(stop - position, hi - lo)
+        if b > a:
+            result.append((lo + a, lo + b))
+        position += hi - lo
+    return result
+
+class SegmentTable:
+    """
+    Immutable, start-time ordered transcript segments.
+
+    The text buffer is every segment's text joined with newlines and offsets[i]
+    is where segment i begins, so texts[a:b] joined by newlines is a single
+    slice of the buffer.
+    """
+
+    __slots__ = (
+        'starts', 'durations', 'offsets', 'buffer', 'max_duration', '_token_prefix', '_end_tree'
+    )
+
+    def __init__(
+        self,
+        starts: array,
+        durations: array,
+        buffer: str,
+        offsets: array
+    ):
+        self.starts = starts
+        self.durations = durations
+        self.buffer = buffer
+        # One entry per segment plus a sentinel at len(buffer) + 1
+        self.offsets = offsets
+        self.max_duration = max(durations) if durations else 0.0
+        self._token_prefix: Optional[array] = None
+        self._end_tree: Optional[array] = None
+
+    @classmethod
+    def from_columns(
+        cls,
+        starts: Iterable[float],
+        durations: Iterable[float],
+        texts: Iterable[str]
+    ) -> "SegmentTable":
+        """Build a table from parallel columns, sorting by start time if needed."""
+        starts = array('d', starts)
+        durations = array('d', durations)
+        texts = list(texts)
+        if any(a > b for a, b in zip(starts, starts[1:])):
+            order = sorted(range(len(starts)), key=starts.__getitem__)
+            starts = array('d', (starts[i] for i in order))
+            durations = array('d', (durations[i] for i in order))
+            texts = [texts[i] for i in order]
+
+        offsets = array('I', [0]) * (len(texts) + 1)
+        position = 0
+        for index, text in enumerate(texts):
+            offsets[index] = position
+            position += len(text) + 1
+        offsets[len(texts)] = position
+        return cls(starts, durations, '\n'.join(texts), offsets)
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[Any]) -> "SegmentTable":
+        """Build a table from fetched snippets or {'text', 'start', 'duration'} dicts.
+
+        This is the only place the two upstream entry shapes are told apart.
+        """
+        starts, durations, texts = [], [], []
+        for entry in entries:
+            # Handle both dict and object formats
+            if isinstance(entry, dict):
+                starts.append(entry.get('start', 0.0))
+                durations.append(entry.get('duration', 0.0))
+                texts.append(entry.get('text', ''))
+            else:
+                starts.append(entry.start)
+                durations.append(getattr(entry, 'duration', 0.0))
+                texts.append(entry.text)
+        return cls.from_columns(starts, durations, texts)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __iter__(self) -> Iterator[Tuple[float, float, str]]:
+        """Yield (start, duration, text) per segment."""
+        for index in range(len(self.starts)):
+            yield self.starts[index], self.durations[index], self.text(index)
+
+    def text(self, index: int) -> str:
+        return self.buffer[self.offsets[index]:self.offsets[index + 1] - 1]
+
+    def joined_text(self, start: int = 0, stop: Optional[int] = None) -> str:
+        """Texts of segments[start:stop] joined by newlines, as one buffer slice."""
+        stop = len(self) if stop is None else min(stop, len(self))
+        if start >= stop:
+            return ''
+        return self.buffer[self.offsets[start]:self.offsets[stop] - 1]
+
+    def window(
+        self,
+        start_seconds: float = 0.0,
+        end_seconds: Optional[float] = None
+    ) -> List[Tuple[int, int]]:
+        """
+        Return the index ranges of the segments overlapping [start_seconds, end_seconds).
+
+        A segment overlaps when it starts inside the window, or starts before it
+        and is still running at start_seconds. The latter are usually the few
+        segments just before the window, but a long caption can overlap a window
+        many segments after it while the ones in between do not, so the result
+        is a list of ascending, disjoint (start, stop) ranges rather than one.
+
+        Segments starting inside the window are found by binary search over the
+        start-time column. Earlier ones are found by walking back at most
+        _LINEAR_SCAN segments, or else through a max-end-time tree built on
+        first use, so a lookup costs O(log n + k) for k overlapping segments
+        however long the longest caption is.
+        """
+        if end_seconds is not None and end_seconds <= start_seconds:
+            return []
+        starts = self.starts
+        durations = self.durations
+        first = bisect_left(starts, start_seconds)
+        stop = len(starts) if end_seconds is None else bisect_left(starts, end_seconds)
+        # A segment that starts before the window can still run into it, but no
+        # earlier than the longest duration allows
+        earliest = bisect_left(starts, start_seconds - self.max_duration)
+        if first - earliest <= _LINEAR_SCAN:
+            running = [
+                index for index in range(earliest, first)
+                if starts[index] + durations[index] > start_seconds
+            ]
+        else:
+            running = self._running_at(start_seconds, first)
+
+        ranges: List[Tuple[int, int]] = []
+        for index in running:
+            if ranges and ranges[-1][1] == index:
+                ranges[-1] = (ranges[-1][0], index + 1)
+            else:
+                ranges.append((index, index + 1))
+        if stop > first:
+            if ranges and ranges[-1][1] == first:
+                ranges[-1] = (ranges[-1][0], stop)
+            else:
+                ranges.append((first, stop))
+        return ranges
+
+    def _running_at(self, seconds: float, stop: int) -> List[int]:
+        """Ascending indices below stop of segments still running at seconds."""
+        tree = self._end_tree
+        if tree is None:
+            # Implicit binary tree: leaves hold end times, inner nodes the max below them
+            size = 1
+            while size < len(self.starts):
+                size *= 2
+            tree = array('d', [float('-inf')]) * (2 * size)
+            for index, (start, duration) in enumerate(zip(self.starts, self.durations)):
+                tree[size + index] = start + duration
+            for node in range(size - 1, 0, -1):
+                tree[node] = max(tree[2 * node], tree[2 * node + 1])
+            self._end_tree = tree
+
+        size = len(tree) // 2
+        found = []
+        nodes = [1]
+        while nodes:
+            node = nodes.pop()
+            if tree[node] <= seconds:
+                continue
+            level = node.bit_length() - 1
+            if (node - (1 << level)) * (size >> level) >= stop:
+                continue
+            if node >= size:
+                found.append(node - size)
+            else:
+                # Right child first, so the left one is popped (and found) first
+                nodes.append(2 * node + 1)
+                nodes.append(2 * node)
+        return found
+
+    def select(self, ranges: Iterable[Tuple[int, int]]) -> "SegmentTable":
+        """A new table holding the segments of the given index ranges, in order."""
+        starts, durations, texts = array('d'), array('d'), []
+        offsets = array('I', [0])
+        for start, stop in ranges:
+            if stop <= start:
+                continue
+            starts.extend(self.starts[start:stop])
+            durations.extend(self.durations[start:stop])
+            texts.append(self.joined_text(start, stop))
+            shift = offsets[-1] - self.offsets[start]
+            offsets.extend(offset + shift for offset in self.offsets[start + 1:stop + 1])
+        return SegmentTable(starts, durations, '\n'.join(texts), offsets)
+
+    def token_prefix(self) -> array:
+        """
+        Cumulative estimated tokens: segments[a:b] cost prefix[b] - prefix[a].
+
+        Each segment's text plus its newline is estimated at one token per four
+        characters, which needs only the offsets, never the text. Computed on
+        first use and kept with the table; not counted by nbytes() so cache
+        accounting stays stable (nor is the end-time tree window() may build).
+        """
+        if self._token_prefix is None:
+            offsets = self.offsets
+            prefix = array('I', [0])
+            prefix.extend(accumulate(
+                (offsets[i + 1] - offsets[i] + 3) // 4 for i in range(len(self.starts))
+            ))
+            self._token_prefix = prefix
+        return self._token_prefix
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Expand into the per-segment dicts youtube_transcript_api returns."""
+        return [
+            {'text': text, 'start': start, 'duration': duration}
+            for start, duration, text in self
+        ]
+
+    def to_columns(self) -> Dict[str, Any]:
+        """Plain JSON-serializable columns, the inverse of from_column_dict."""
+        return {
+            'start': self.starts.tolist(),
+            'duration': self.durations.tolist(),
+            'offsets': self.offsets.tolist(),
+            'text': self.buffer,
+        }
+
+    @classmethod
+    def from_column_dict(cls, columns: Dict[str, Any]) -> "SegmentTable":
+        """Rebuild a table from to_columns() output."""
+        return cls(
+            array('d', columns['start']),
+            array('d', columns['duration']),
+            columns['text'],
+            array('I', columns['offsets']),
+        )
+
+    def nbytes(self) -> int:
+        """Approximate memory held by this table, in bytes."""
+        return (
+            sys.getsizeof(self)
+            + sys.getsizeof(self.starts)
+            + sys.getsizeof(self.durations)
+            + sys.getsizeof(self.offsets)
+            + sys.getsizeof(self.buffer)
+        )
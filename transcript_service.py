@@ -0,0 +1,278 @@
+"""
+Transcript fetching for the YouTube Transcript MCP Server.
+Resolves the preferred transcript track for a video and serves its segments from
+the transcript cache, only going to YouTube on a miss.
+"""
+
+import asyncio
+import functools
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Dict, Tuple, Any, Callable, Iterator, Union
+from youtube_transcript_api import YouTubeTranscriptApi
+from youtube_transcript_api._errors import (
+    TranscriptsDisabled,
+    VideoUnavailable
+)
+from http_pool import get_session
+from metrics import registry, stage_seconds
+from playlists import DataApiClient, ExpansionCache, PlaylistExpander, PlaylistPage
+from singleflight import SingleFlight
+from transcript_cache import (
+    CachedTranscript,
+    TrackInfo,
+    TrackKey,
+    TranscriptCache,
+    TranscriptMetadataCache,
+    TranscriptWindow,
+    VideoListing
+)
+from transcript_search import SearchHit, TranscriptIndex
+from transcript_segments import SegmentTable
+from upstream import UpstreamScheduler, UpstreamUnavailable
+
+# Upstream failures that won't change between calls and are worth caching
+NEGATIVE_ERRORS = (TranscriptsDisabled, VideoUnavailable)
+
+# Shared by every tool call in this process
+transcript_cache = TranscriptCache.from_env()
+metadata_cache = TranscriptMetadataCache.from_env()
+# Every transcript fetched from YouTube is indexed for search_transcripts
+transcript_index = TranscriptIndex.from_env()
+# Concurrent misses for the same video share one upstream call
+inflight = SingleFlight()
+# Every upstream request goes through the shared keep-alive connection pool
+_api = YouTubeTranscriptApi(http_client=get_session())
+# ...and the shared rate limit, retry policy and circuit breaker
+upstream = UpstreamScheduler.from_env()
+# Playlist and channel pages come from the YouTube Data API on the same session
+# and under the same scheduler (looked up per call so tests can swap it)
+playlist_expander = PlaylistExpander(
+    DataApiClient.from_env(get_session()),
+    ExpansionCache.from_env(),
+    lambda func, *args: upstream.call(func, *args),
+)
+
+# Exported through /metrics and youtube://server/metrics; looked up on each scrape
+registry.register_stats('transcript_cache', lambda: transcript_cache.stats())
+registry.register_stats('metadata_cache', lambda: metadata_cache.stats())
+registry.register_stats('coalescing', lambda: inflight.stats())
+registry.register_stats('search_index', lambda: transcript_index.stats())
+registry.register_stats('upstream', lambda: upstream.stats())
+registry.register_stats('playlist_cache', lambda: playlist_cache_stats())
+
+# Blocking upstream calls run here so they never stall the event loop; the bound
+# also caps how many requests this process has in flight to YouTube
+_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("UPSTREAM_WORKERS", "32")),
+    thread_name_prefix="transcript-upstream",
+)
+
+async def run_blocking(func: Callable[..., Any], *args: Any) -> Any:
+    """Run a blocking call on the upstream executor and await its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(func, *args))
+
+def _list_transcripts(video_id: str) -> Any:
+    """List a video's transcripts from YouTube (one upstream round trip)."""
+    return upstream.call(_api.list, video_id)
+
+def get_listing(video_id: str) -> VideoListing:
+    """
+    Return the tracks available for a video, listing it upstream only on a miss.
+
+    Raises:
+        TranscriptsDisabled, VideoUnavailable: also when cached from an earlier call
+    """
+    with stage_seconds.time('listing'):
+        listing = metadata_cache.get(video_id)
+        if listing is not None:
+            return listing
+        return inflight.do(('listing', video_id), _load_listing, video_id)
+
+def _load_listing(video_id: str) -> VideoListing:
+    try:
+        transcript_list = _list_transcripts(video_id)
+    except NEGATIVE_ERRORS as e:
+        metadata_cache.put_error(video_id, e)
+        raise
+    return metadata_cache.put(video_id, transcript_list)
+
+def _preferred_tracks(language: Optional[str] = None) -> List[TrackKey]:
+    """Track keys in preference order, before "any track".
+
+    A requested language is looked for natively, then as a translation of an
+    English track, before falling back to English itself.
+    """
+    preferences: List[TrackKey] = []
+    if language:
+        preferences += [(language, False, ''), (language, True, '')]
+        if language != 'en':
+            preferences += [(language, False, 'en'), (language, True, 'en')]
+    preferences += [('en', False, ''), ('en', True, '')]
+    return preferences
+
+def _translation(tracks: List[TrackInfo], language: str) -> Optional[TrackInfo]:
+    """Translate the best translatable track into language: English first, manual first."""
+    sources = sorted(
+        (track for track in tracks if track.is_translatable),
+        key=lambda track: (track.language_code != 'en', track.is_generated),
+    )
+    for source in sources:
+        translated = source.translation(language)
+        if translated is not None:
+            return translated
+    return None
+
+def select_track(tracks: List[TrackInfo], language: Optional[str] = None) -> Optional[TrackInfo]:
+    """
+    Pick the requested language, else a translation into it, then manual English,
+    generated English, then any track.
+    """
+    by_key = {(track.language_code, track.is_generated): track for track in tracks}
+    if language:
+        for key in ((language, False), (language, True)):
+            if key in by_key:
+                return by_key[key]
+        translated = _translation(tracks, language)
+        if translated is not None:
+            return translated
+    for key in (('en', False), ('en', True)):
+        if key in by_key:
+            return by_key[key]
+    # Get first available transcript
+    return tracks[0] if tracks else None
+
+def resolve_track(video_id: str, language: Optional[str] = None) -> Tuple[VideoListing, Optional[TrackInfo]]:
+    """Resolve the preferred track for a video, memoized per requested language."""
+    listing = get_listing(video_id)
+    if language not in listing.resolved:
+        with stage_seconds.time('resolve'):
+            listing.resolved[language] = select_track(listing.tracks, language)
+    return listing, listing.resolved[language]
+
+def fetch_transcript(
+    video_id: str,
+    language: Optional[str] = None,
+    window: Optional[Tuple[float, Optional[float]]] = None
+) -> Union[CachedTranscript, TranscriptWindow, None]:
+    """
+    Return the preferred transcript track for a video, using the caches when possible.
+
+    Args:
+        video_id: YouTube video ID
+        language: Preferred language code, or None for the English-first default
+        window: (start_seconds, end_seconds) when only that time window is needed
+
+    Returns:
+        The cached or freshly fetched transcript, or None if the video has no tracks.
+        With a window, a track found only in the disk store is returned as a
+        TranscriptWindow holding just the window's segments.
+        Upstream errors such as TranscriptsDisabled propagate to the caller.
+        While the circuit breaker is open an expired cached copy is returned if
+        there is one; otherwise UpstreamUnavailable is raised without calling YouTube.
+    """
+    # Only a probe: get_listing counts the hit or miss if a listing is needed
+    listing = metadata_cache.peek(video_id)
+    if listing is not None and language in listing.resolved:
+        track = listing.resolved[language]
+        if track is None:
+            return None
+        probe = [track.key]
+    else:
+        # Without a resolution only the first choices can be probed (the requested
+        # language or its translation from English, or English by default);
+        # falling back any further needs a listing to know which tracks exist
+        probe = _preferred_tracks(language)
+        if language:
+            probe = probe[:-2]
+    with stage_seconds.time('cache'):
+        if window is not None:
+            stored = transcript_cache.find_window(video_id, probe, *window)
+            if stored is not None:
+                return stored
+        cached = transcript_cache.find(video_id, probe)
+    if cached:
+        return cached
+
+    try:
+        return _fetch_upstream(video_id, language, probe)
+    except UpstreamUnavailable:
+        stale = transcript_cache.find_stale(video_id, probe)
+        if stale is None:
+            raise
+        return stale
+
+def _fetch_upstream(
+    video_id: str,
+    language: Optional[str],
+    probe: List[TrackKey]
+) -> Optional[CachedTranscript]:
+    """Resolve and fetch a track after a cache miss.
+
+    The listing and the track fetch are each coalesced, the fetch on the resolved
+    track, so concurrent requests that resolve to the same track (e.g. no language
+    and 'en', or a language that falls back to English) share one round trip.
+    """
+    listing, track = resolve_track(video_id, language)
+    if track is None:
+        return None
+    key = track.key
+
+    if key not in probe:
+        # The listing may resolve to a track we already hold (e.g. a non-English fallback)
+        cached = transcript_cache.get(video_id, *key)
+        if cached:
+            return cached
+    return inflight.do(('transcript', video_id) + key, _fetch_track, video_id, listing, track)
+
+def _fetch_track(video_id: str, listing: VideoListing, track: TrackInfo) -> CachedTranscript:
+    """Fetch one resolved track and cache it; run once per in-flight track."""
+    # A fetch that finished just after our probe missed may have stored it
+    cached = transcript_cache.peek(video_id, *track.key)
+    if cached:
+        return cached
+
+    if track.translated_from:
+        source = listing.transcripts[(track.translated_from, track.is_generated)]
+        # translate() only builds the translated track's URL; fetch() is the round trip
+        upstream_track = source.translate(track.language_code)
+    else:
+        upstream_track = listing.transcripts[track.key[:2]]
+    with stage_seconds.time('fetch'):
+        segments = SegmentTable.from_entries(upstream.call(upstream_track.fetch))
+    entry = CachedTranscript(
+        video_id, track.language, track.language_code, track.is_generated, segments,
+        translated_from=track.translated_from
+    )
+    transcript_cache.put(entry)
+    if not track.translated_from:
+        # Search covers the original tracks; translations would only duplicate them.
+        # Indexing is best-effort: a locked or full index database (counted in
+        # its failed_adds) mustn't fail a transcript that was already fetched
+        try:
+            transcript_index.add(entry)
+        except sqlite3.Error:
+            pass
+    return entry
+
+def search_index(query: str, limit: int = 10) -> List[SearchHit]:
+    """Search every transcript this server (or one sharing its index) has fetched."""
+    return transcript_index.search(query, limit)
+
+def playlist_pages(url: str) -> Iterator[PlaylistPage]:
+    """Lazily page through a playlist or channel URL (see PlaylistExpander.iter_pages)."""
+    return playlist_expander.iter_pages(url)
+
+def playlist_video_ids(url: str, max_videos: Optional[int] = None) -> Iterator[str]:
+    """Lazily yield up to max_videos video IDs (see PlaylistExpander.iter_video_ids)."""
+    return playlist_expander.iter_video_ids(url, max_videos)
+
+def playlist_total(url: str) -> Optional[int]:
+    """How many videos a playlist or channel holds; its first page is usually cached."""
+    return playlist_expander.total(url)
+
+def playlist_cache_stats() -> Dict[str, int]:
+    """Counters of the playlist page cache."""
+    return playlist_expander.cache.stats()
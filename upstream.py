@@ -0,0 +1,193 @@
+"""
+Shared scheduler for calls to YouTube.
+Every upstream call in the process goes through one token bucket, is retried
+with exponential backoff and full jitter when the failure is transient, and is
+refused outright while a circuit breaker is open after repeated blocks, so a
+throttled server backs off together instead of every request retrying alone.
+"""
+
+import os
+import random
+import threading
+import time
+from typing import Optional, Dict, Any, Callable
+from requests.exceptions import ConnectionError as RequestsConnectionError, Timeout
+from youtube_transcript_api._errors import RequestBlocked, YouTubeRequestFailed
+from rate_limit import TokenBucket
+
+# YouTube refusing us: HTTP 429 surfaces as IpBlocked, a RequestBlocked subclass
+BLOCK_ERRORS = (RequestBlocked,)
+# Worth another attempt after a pause
+RETRYABLE_ERRORS = (RequestBlocked, YouTubeRequestFailed, RequestsConnectionError, Timeout)
+
+class UpstreamUnavailable(Exception):
+    """Raised without calling YouTube while the circuit breaker is open."""
+
+    def __init__(self, retry_after: float):
+        self.retry_after = retry_after
+        super().__init__(
+            f"YouTube is blocking requests from this server; "
+            f"upstream calls are paused for another {retry_after:.0f}s"
+        )
+
+class CircuitBreaker:
+    """
+    Opens after `threshold` consecutive blocks and stays open for `cooldown`.
+
+    Once the cooldown has passed a single trial call is let through (half-open):
+    success closes the breaker, another block opens it again.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(
+        self,
+        threshold: int = 5,
+        cooldown: float = 60.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.state = self.CLOSED
+        self.consecutive_blocks = 0
+        self._opened_at = 0.0
+        self._trial_running = False
+        self.opens = 0
+
+    def allow(self) -> Optional[float]:
+        """Return None if a call may proceed, else the seconds until one may."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return None
+            remaining = self._opened_at + self.cooldown - self._clock()
+            if self.state == self.OPEN and remaining <= 0:
+                self.state = self.HALF_OPEN
+            if self.state == self.HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return None
+            return max(remaining, 0.0)
+
+    def record_success(self) -> None:
+        """YouTube answered (even with a regular error such as TranscriptsDisabled)."""
+        with self._lock:
+            self.state = self.CLOSED
+            self.consecutive_blocks = 0
+            self._trial_running = False
+
+    def record_block(self) -> None:
+        with self._lock:
+            self.consecutive_blocks += 1
+            self._trial_running = False
+            if self.state == self.HALF_OPEN or (
+                self.state == self.CLOSED and self.consecutive_blocks >= self.threshold
+            ):
+                self.state = self.OPEN
+                self._opened_at = self._clock()
+                self.opens += 1
+
+    def record_failure(self) -> None:
+        """A transient failure that says nothing about blocking (e.g. a timeout)."""
+        with self._lock:
+            self._trial_running = False
+
+class UpstreamScheduler:
+    """Rate-limits, retries and circuit-breaks calls to YouTube."""
+
+    def __init__(
+        self,
+        bucket: Optional[TokenBucket] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+        sleep: Callable[[float], None] = time.sleep,
+        jitter: Callable[[], float] = random.random
+    ):
+        self.bucket = bucket or TokenBucket(0)
+        self.breaker = breaker or CircuitBreaker()
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._sleep = sleep
+        self._jitter = jitter
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.retries = 0
+        self.rejected = 0
+        self.failures = 0
+
+    @classmethod
+    def from_env(cls) -> "UpstreamScheduler":
+        """Build a scheduler configured from UPSTREAM_* environment variables."""
+        rate = float(os.getenv("UPSTREAM_RATE", "20"))
+        return cls(
+            bucket=TokenBucket(rate, float(os.getenv("UPSTREAM_BURST", str(rate * 2)))),
+            breaker=CircuitBreaker(
+                threshold=int(os.getenv("UPSTREAM_BREAKER_THRESHOLD", "5")),
+                cooldown=float(os.getenv("UPSTREAM_BREAKER_COOLDOWN", "60")),
+            ),
+            max_retries=int(os.getenv("UPSTREAM_MAX_RETRIES", "3")),
+            backoff_base=float(os.getenv("UPSTREAM_BACKOFF_BASE", "0.5")),
+            backoff_max=float(os.getenv("UPSTREAM_BACKOFF_MAX", "8")),
+        )
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def call(self, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run func(*args) against YouTube under the shared limits.
+
+        Raises:
+            UpstreamUnavailable: the breaker is open (also between retries)
+            The last error once retries are exhausted, or any non-retryable error
+        """
+        attempt = 0
+        error: Optional[Exception] = None
+        while True:
+            retry_after = self.breaker.allow()
+            if retry_after is not None:
+                self._count('rejected')
+                raise UpstreamUnavailable(retry_after) from error
+            self.bucket.acquire()
+            self._count('calls')
+            try:
+                result = func(*args)
+            except BLOCK_ERRORS as e:
+                self.breaker.record_block()
+                error = e
+            except RETRYABLE_ERRORS as e:
+                self.breaker.record_failure()
+                error = e
+            except Exception:
+                self.breaker.record_success()
+                raise
+            else:
+                self.breaker.record_success()
+                return result
+
+            if attempt >= self.max_retries:
+                self._count('failures')
+                raise error
+            # Full jitter: anywhere between no wait and the exponential ceiling
+            self._sleep(self._jitter() * min(self.backoff_max, self.backoff_base * 2 ** attempt))
+            attempt += 1
+            self._count('retries')
+
+    def stats(self) -> Dict[str, Any]:
+        """Return call, retry and rejection counters and the breaker state."""
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'retries': self.retries,
+                'rejected': self.rejected,
+                'failures': self.failures,
+                'breaker': self.breaker.state,
+                'breaker_opens': self.breaker.opens,
+                'rate_limit_waits': self.bucket.waits,
+            }
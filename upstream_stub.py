@@ -0,0 +1,388 @@
+"""
+Local stand-in for the YouTube transcript upstream.
+Serves canned tracks and segments with configurable latency so tests and
+benchmarks can exercise the fetch path without touching the network.
+RecordingApi captures what the real API returns into a Cassette, and
+ReplayApi serves a cassette back with injected latency, errors and
+throttling. StubDataApi does the same for the YouTube Data API pages playlist
+expansion reads, from the recorded responses in fixtures/ or generated ones.
+"""
+
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from typing import Optional, List, Dict, Any, Iterator, NamedTuple
+from requests.exceptions import HTTPError
+from youtube_transcript_api._errors import (
+    IpBlocked,
+    TranscriptsDisabled,
+    VideoUnavailable,
+    YouTubeRequestFailed
+)
+from playlists import PlaylistError
+from transcript_segments import SegmentTable
+
+FIXTURE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'data_api.json')
+
+def make_segments(count: int, seconds_per_segment: float = 2.0) -> List[Dict[str, Any]]:
+    """Build a synthetic transcript of evenly spaced segments."""
+    return [
+        {
+            'text': f"segment {i} of the stub transcript",
+            'start': i * seconds_per_segment,
+            'duration': seconds_per_segment,
+        }
+        for i in range(count)
+    ]
+
+class StubTranslationLanguage(NamedTuple):
+    language: str
+    language_code: str
+
+class StubTranscript:
+    """Mimics youtube_transcript_api's Transcript."""
+
+    def __init__(
+        self,
+        language_code: str = 'en',
+        is_generated: bool = False,
+        segments: Optional[List[Dict[str, Any]]] = None,
+        latency: float = 0.0,
+        is_translatable: bool = False,
+        translation_languages: Optional[List[str]] = None
+    ):
+        self.language = language_code.upper()
+        self.language_code = language_code
+        self.is_generated = is_generated
+        self.is_translatable = is_translatable or bool(translation_languages)
+        self.translation_languages = [
+            StubTranslationLanguage(code.upper(), code) for code in translation_languages or ()
+        ]
+        self.segments = segments if segments is not None else make_segments(2)
+        self.latency = latency
+        self.fetches = 0
+        # target language code -> translated track, kept so tests can count its fetches
+        self.translations: Dict[str, "StubTranscript"] = {}
+
+    def fetch(self) -> List[Dict[str, Any]]:
+        self.fetches += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return list(self.segments)
+
+    def translate(self, language_code: str) -> "StubTranscript":
+        """Like Transcript.translate: no round trip until the result is fetched."""
+        if language_code not in [target.language_code for target in self.translation_languages]:
+            raise ValueError(f"Can't translate {self.language_code} into {language_code}")
+        if language_code not in self.translations:
+            self.translations[language_code] = StubTranscript(
+                language_code,
+                True,
+                [dict(segment, text=f"[{language_code}] {segment['text']}") for segment in self.segments],
+                self.latency,
+            )
+        return self.translations[language_code]
+
+class StubApi:
+    """Mimics YouTubeTranscriptApi: every video lists the same tracks.
+
+    Set error to make listings raise it instead: every listing, or only the
+    first `failures` of them (e.g. IpBlocked, which is how a 429 surfaces).
+    """
+
+    def __init__(
+        self,
+        tracks: Optional[List[StubTranscript]] = None,
+        latency: float = 0.0,
+        error: Optional[Exception] = None,
+        failures: Optional[int] = None
+    ):
+        self.tracks = tracks if tracks is not None else [StubTranscript(latency=latency)]
+        self.latency = latency
+        self.error = error
+        self.failures = failures
+        self.listings = 0
+
+    def list(self, video_id: str) -> Iterator[StubTranscript]:
+        self.listings += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if self.error and (self.failures is None or self.listings <= self.failures):
+            raise self.error
+        return iter(self.tracks)
+
+# Listing failures a cassette can record, by class name
+RECORDED_ERRORS = {cls.__name__: cls for cls in (TranscriptsDisabled, VideoUnavailable)}
+
+class UnrecordedTrack(LookupError):
+    """Raised on fetching a replayed track that was listed but never fetched while recording."""
+
+class Cassette:
+    """
+    Recorded upstream responses, saved as JSON.
+
+    videos maps a video ID to {'tracks': [...]}, one dict per listed track with
+    its language, language_code, is_generated, translation_languages and the
+    fetched segments (None if the track was never fetched), or to
+    {'error': name} when listing it raised one of RECORDED_ERRORS.
+    """
+
+    def __init__(self, videos: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.videos = videos if videos is not None else {}
+
+    @classmethod
+    def load(cls, path: str) -> "Cassette":
+        with open(path, encoding='utf-8') as f:
+            return cls(json.load(f)['videos'])
+
+    def save(self, path: str) -> None:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'videos': self.videos}, f, ensure_ascii=False)
+
+    @classmethod
+    def synthetic(
+        cls,
+        videos: int,
+        segments: int = 500,
+        disabled_every: int = 0,
+        seed: int = 0
+    ) -> "Cassette":
+        """
+        Generate `videos` videos with IDs 00000000000, 00000000001, ...
+
+        Transcript lengths vary between half and one and a half times
+        `segments`, every third video also lists an auto-generated Spanish
+        track, and every `disabled_every`-th video has transcripts disabled.
+        """
+        rng = random.Random(seed)
+        recorded: Dict[str, Dict[str, Any]] = {}
+        for index in range(videos):
+            video_id = f"{index:011d}"
+            if disabled_every and index % disabled_every == disabled_every - 1:
+                recorded[video_id] = {'error': 'TranscriptsDisabled'}
+                continue
+            count = rng.randint(segments // 2, segments * 3 // 2)
+            tracks = [{
+                'language': 'English', 'language_code': 'en', 'is_generated': False,
+                'translation_languages': [], 'segments': make_segments(count),
+            }]
+            if index % 3 == 0:
+                tracks.append({
+                    'language': 'Spanish', 'language_code': 'es', 'is_generated': True,
+                    'translation_languages': [], 'segments': make_segments(count),
+                })
+            recorded[video_id] = {'tracks': tracks}
+        return cls(recorded)
+
+class _RecordingTranscript:
+    """Passes a live Transcript through, recording its segments when fetched."""
+
+    def __init__(self, transcript: Any, record: Dict[str, Any]):
+        self._transcript = transcript
+        self._record = record
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._transcript, name)
+
+    def fetch(self, *args: Any, **kwargs: Any) -> Any:
+        fetched = self._transcript.fetch(*args, **kwargs)
+        self._record['segments'] = SegmentTable.from_entries(fetched).to_dicts()
+        return fetched
+
+class RecordingApi:
+    """Wraps a live YouTubeTranscriptApi and records its listings and fetches.
+
+    Translations pass through unrecorded.
+    """
+
+    def __init__(self, api: Any, cassette: Optional[Cassette] = None):
+        self.api = api
+        self.cassette = cassette if cassette is not None else Cassette()
+
+    def list(self, video_id: str) -> List[Any]:
+        try:
+            transcripts = list(self.api.list(video_id))
+        except tuple(RECORDED_ERRORS.values()) as e:
+            self.cassette.videos[video_id] = {'error': type(e).__name__}
+            raise
+        tracks = []
+        wrapped = []
+        for transcript in transcripts:
+            record = {
+                'language': transcript.language,
+                'language_code': transcript.language_code,
+                'is_generated': bool(transcript.is_generated),
+                'translation_languages': [
+                    target.language_code
+                    for target in getattr(transcript, 'translation_languages', None) or ()
+                ],
+                'segments': None,
+            }
+            tracks.append(record)
+            wrapped.append(_RecordingTranscript(transcript, record))
+        self.cassette.videos[video_id] = {'tracks': tracks}
+        return wrapped
+
+class _ReplayTranscript(StubTranscript):
+    """A recorded track whose fetch is a round trip to the ReplayApi."""
+
+    def __init__(self, api: "ReplayApi", video_id: str, record: Dict[str, Any]):
+        super().__init__(
+            record['language_code'],
+            record['is_generated'],
+            record['segments'] or [],
+            translation_languages=record.get('translation_languages'),
+        )
+        self.language = record['language']
+        self._api = api
+        self._video_id = video_id
+        self._recorded = record['segments'] is not None
+
+    def fetch(self) -> List[Dict[str, Any]]:
+        if not self._recorded:
+            # An empty transcript would pass for a real one and skew the replay
+            raise UnrecordedTrack(
+                f"{self._video_id} ({self.language_code}) was never fetched while recording"
+            )
+        self._api.round_trip(self._video_id)
+        self.fetches += 1
+        return list(self.segments)
+
+class ReplayApi:
+    """
+    Mimics YouTubeTranscriptApi by replaying a Cassette.
+
+    Every listing and fetch is a round trip that takes `latency` seconds plus
+    up to `jitter` more, fails with a transient YouTubeRequestFailed with
+    probability `error_rate`, and raises IpBlocked (how a 429 surfaces) once
+    more than `throttle_rate` round trips have been made in the last second
+    (0 disables throttling). Videos missing from the cassette are unavailable.
+    """
+
+    def __init__(
+        self,
+        cassette: Cassette,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        seed: Optional[int] = None
+    ):
+        self.cassette = cassette
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self._rng = random.Random(seed)
+        self._recent: "deque[float]" = deque()
+        self._lock = threading.Lock()
+        self.listings = 0
+        self.round_trips = 0
+        self.injected_errors = 0
+        self.throttled = 0
+
+    def round_trip(self, video_id: str) -> None:
+        """Spend one upstream round trip, raising any injected failure."""
+        with self._lock:
+            self.round_trips += 1
+            delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+            fail = self.error_rate and self._rng.random() < self.error_rate
+            throttled = False
+            if self.throttle_rate:
+                now = time.monotonic()
+                while self._recent and now - self._recent[0] >= 1.0:
+                    self._recent.popleft()
+                throttled = len(self._recent) >= self.throttle_rate
+                if not throttled:
+                    self._recent.append(now)
+            if throttled:
+                self.throttled += 1
+            elif fail:
+                self.injected_errors += 1
+        if delay:
+            time.sleep(delay)
+        if throttled:
+            raise IpBlocked(video_id)
+        if fail:
+            raise YouTubeRequestFailed(video_id, HTTPError("503 Server Error: injected by ReplayApi"))
+
+    def list(self, video_id: str) -> Iterator[StubTranscript]:
+        with self._lock:
+            self.listings += 1
+        self.round_trip(video_id)
+        recorded = self.cassette.videos.get(video_id)
+        if recorded is None:
+            raise VideoUnavailable(video_id)
+        if 'error' in recorded:
+            raise RECORDED_ERRORS[recorded['error']](video_id)
+        return iter([_ReplayTranscript(self, video_id, track) for track in recorded['tracks']])
+
+    def stats(self) -> Dict[str, int]:
+        """Return round trip and injected failure counters."""
+        with self._lock:
+            return {
+                'listings': self.listings,
+                'round_trips': self.round_trips,
+                'injected_errors': self.injected_errors,
+                'throttled': self.throttled,
+            }
+
+class StubDataApi:
+    """Mimics DataApiClient.get_json from canned responses.
+
+    playlistItems responses are keyed by "playlistId:pageToken" (empty for the
+    first page) and channels responses by handle or username; anything else
+    raises PlaylistError the way a 404 does.
+    """
+
+    def __init__(
+        self,
+        playlist_items: Dict[str, Dict[str, Any]],
+        channels: Optional[Dict[str, Dict[str, Any]]] = None,
+        latency: float = 0.0
+    ):
+        self.playlist_items = playlist_items
+        self.channels = channels or {}
+        self.latency = latency
+        self.requests = 0
+
+    @classmethod
+    def from_fixture(cls, path: str = FIXTURE_PATH, latency: float = 0.0) -> "StubDataApi":
+        """Serve the recorded pages in a fixture file."""
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(data['playlistItems'], data.get('channels'), latency)
+
+    @classmethod
+    def generated(cls, playlist_id: str, count: int, latency: float = 0.0) -> "StubDataApi":
+        """Serve a synthetic playlist of `count` videos in pages of 50."""
+        items = {}
+        token = ''
+        for first in range(0, count, 50):
+            stop = min(first + 50, count)
+            page: Dict[str, Any] = {
+                'items': [{'contentDetails': {'videoId': f"v{i:010d}"}} for i in range(first, stop)],
+                'pageInfo': {'totalResults': count},
+            }
+            if stop < count:
+                page['nextPageToken'] = f"page{stop}"
+            items[f"{playlist_id}:{token}"] = page
+            token = page.get('nextPageToken', '')
+        return cls(items, latency=latency)
+
+    def get_json(self, resource: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        self.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if resource == 'channels':
+            key = params.get('forHandle') or params.get('forUsername')
+            responses = self.channels
+        else:
+            key = f"{params['playlistId']}:{params.get('pageToken', '')}"
+            responses = self.playlist_items
+        if key not in responses:
+            raise PlaylistError(f"Playlist {params.get('playlistId', key)} not found")
+        return responses[key]
@@ -0,0 +1,62 @@
+"""
+YouTube video ID extraction shared by both servers.
+A bare 11-character ID is recognised by a length check and one precompiled
+match; URLs are matched by a single anchored pattern instead of urlparse and
+parse_qs, so extracting from large batches of log or playlist URLs stays cheap.
+"""
+
+import re
+from typing import Optional, Iterable, Set
+
+_ID_RE = re.compile(r'[A-Za-z0-9_-]{11}')
+
+# Accepted forms, with or without scheme and www./m./music. prefixes:
+#   youtu.be/ID
+#   youtube.com/watch?v=ID (v may follow other query parameters)
+#   youtube.com/{embed,v,e,shorts,live}/ID
+#   youtube-nocookie.com/embed/ID
+_URL_RE = re.compile(
+    r'(?i:(?:https?:)?(?://)?(?:www\.|m\.|music\.)?'
+    r'(?:youtu\.be/'
+    r'|youtube(?:-nocookie)?\.com/(?:embed|v|e|shorts|live)/'
+    r'|youtube\.com/watch/?\?(?:[^#]*?&)??v='
+    r'))'
+    r'([A-Za-z0-9_-]{11})'
+    r'(?![A-Za-z0-9_-])'
+)
+
+def extract_video_id(url_or_id: str) -> Optional[str]:
+    """Extract video ID from YouTube URL or return the ID if already provided."""
+    url_or_id = url_or_id.strip()
+    # If it's already just an ID (11 characters)
+    if len(url_or_id) == 11:
+        return url_or_id if _ID_RE.fullmatch(url_or_id) else None
+
+    match = _URL_RE.match(url_or_id)
+    return match.group(1) if match else None
+
+def extract_video_ids(urls: Iterable[str]) -> Set[str]:
+    """
+    Extract the distinct video IDs from many URLs or IDs at once.
+
+    Args:
+        urls: URLs or bare IDs, e.g. lines read from a log or playlist export
+
+    Returns:
+        The set of IDs found; inputs that are not YouTube videos are skipped
+    """
+    # Locals avoid a global lookup per input on large batches
+    id_fullmatch = _ID_RE.fullmatch
+    url_match = _URL_RE.match
+    found: Set[str] = set()
+    add = found.add
+    for url in urls:
+        url = url.strip()
+        if len(url) == 11:
+            if id_fullmatch(url):
+                add(url)
+            continue
+        match = url_match(url)
+        if match:
+            add(match.group(1))
+    return found